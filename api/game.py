@@ -8,10 +8,11 @@ from fastapi import APIRouter, Depends, status, Path
 from fastapi.exceptions import HTTPException
 from fastapi.security import HTTPBearer
 from models.games import Games
+from process.game import GameManager
 from schemas.game import GameBase, GameBaseCreate, GameBaseCreateResponse, GameBaseJoin, GameBaseList, GameBaseResponse
 from schemas.message import Message
 from schemas.user import UserBaseSession
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 token_auth_scheme = HTTPBearer()
 
@@ -29,12 +30,12 @@ router = APIRouter()
 )
 async def list(
     game_params: GameBaseList,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: UserBaseSession = Depends(JWTBearer())
 ) -> List[Games]:
     """List games"""
-    TokenValidator.check_token(session, user.id)
-    game_list = ControllerGame.list(session, game_params)
+    await TokenValidator.check_token(session, user.id, user.token)
+    game_list = await ControllerGame.list(session, game_params)
     for game in game_list:
         if game.password is None:
             game.with_password = False
@@ -48,26 +49,32 @@ async def list(
     response_model=GameBaseCreateResponse,
     responses={
         status.HTTP_200_OK: {"model": GameBaseCreateResponse},
+        status.HTTP_400_BAD_REQUEST: {"model": Message},
         status.HTTP_401_UNAUTHORIZED: {"model": Message},
         status.HTTP_403_FORBIDDEN: {"model": Message}
     }
 )
 async def create(
     game: GameBaseCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: UserBaseSession = Depends(JWTBearer())
 ) -> GameBaseCreateResponse:
     """Create game request"""
-    TokenValidator.check_token(session, user.id)
+    await TokenValidator.check_token(session, user.id, user.token)
     # Check if user is in another game
-    db_game = ControllerGame.get_by_username(session, user.username)
-    if db_game is not None:
+    db_game = await ControllerGame.get_by_username(session, user.username)
+    if db_game is not None and not GameManager.is_finished(db_game):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is in another game.")
+    # Check if fleet can be placed on the board
+    try:
+        GameManager.return_board_type(game.board_dim, game.fleet)
+    except ValueError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
     if game.name is None:
         game.name = f"{user.username}'s Game"
     if game.password is not None:
         game.password = Security.get_pwd_hash(game.password)
-    db_game = ControllerGame.create(session, game, user.id)
+    db_game = await ControllerGame.create(session, game, user.id)
     return GameBaseCreateResponse(id=db_game.id)
 
 
@@ -83,28 +90,28 @@ async def create(
 )
 async def join(
     game: GameBaseJoin,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: UserBaseSession = Depends(JWTBearer())
 ) -> Message:
     """Join game request"""
-    TokenValidator.check_token(session, user.id)
+    await TokenValidator.check_token(session, user.id, user.token)
     # Check if user is in another game
-    db_game = ControllerGame.get_by_username(session, user.username)
-    if db_game is not None:
+    db_game = await ControllerGame.get_by_username(session, user.username)
+    if db_game is not None and not GameManager.is_finished(db_game):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is in another game.")
     # Fetch game object
-    db_game = ControllerGame.get_by_id(session, game.id)
+    db_game = await ControllerGame.get_by_id(session, game.id)
     # Check if given game id is valid
     if db_game is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid game id.")
     # Check if game has open place for joining
-    if db_game.second_user_id is not None:
+    if db_game.second_user_id is not None or db_game.bot is True:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Game is full.")
     # Check if game has password -> Verify password
     if db_game.password is not None:
         if game.password is None or Security.verify_pwd(game.password, db_game.password) is False:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password.")
-    ControllerGame.join(session, game.id, user.id)
+    await ControllerGame.join(session, game.id, user.id)
     return Message(detail="Joining is successful.")
 
 
@@ -119,9 +126,9 @@ async def join(
 )
 async def get(
     game_id: int = Path(..., ge=0),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: UserBaseSession = Depends(JWTBearer())
 ) -> Any:
     """Get info on given game"""
-    TokenValidator.check_token(session, user.id)
-    return ControllerGame.get(session, game_id)
+    await TokenValidator.check_token(session, user.id, user.token)
+    return await ControllerGame.get(session, game_id)
@@ -9,7 +9,7 @@ from fastapi import APIRouter, Depends, status, Path
 from fastapi.exceptions import HTTPException
 from schemas.message import Message
 from schemas.user import UserBaseCreate, UserBaseLogin, UserBaseLoginResponse, UserBaseResponse, UserBaseSession
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
@@ -23,24 +23,24 @@ router = APIRouter()
         status.HTTP_403_FORBIDDEN: {"model": Message}
     }
 )
-async def login(user: UserBaseLogin, session: Session = Depends(get_session)) -> UserBaseLoginResponse:
+async def login(user: UserBaseLogin, session: AsyncSession = Depends(get_session)) -> UserBaseLoginResponse:
     """Login request"""
-    db_user = ControllerUser.authenticate(session, user.username, user.password)
+    db_user = await ControllerUser.authenticate(session, user.username, user.password)
     if db_user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials.")
     # Check token
-    db_token = ControllerToken.get_by_user_id(session, db_user.id)
+    db_token = await ControllerToken.get_by_user_id(session, db_user.id)
     if db_token is None:
         # User is not logged in before
         access_token = Security.create_token(db_user)
-        ControllerToken.save_token(session, access_token, db_user.id)
-    elif db_token.valid is True:
+        await ControllerToken.save_token(session, access_token, db_user.id)
+    elif db_token.valid is True and Security.is_token_valid(db_token.token):
         # User is already logged in
         access_token = db_token.token
     else:
-        # User is logged out -> Give new token
+        # User is logged out, or the token expired or was signed with the key of a previous process -> Give new token
         access_token = Security.create_token(db_user)
-        ControllerToken.update_token(session, db_token.id, access_token)
+        await ControllerToken.update_token(session, db_token.id, db_user.id, access_token)
     return UserBaseLoginResponse(token=access_token)
 
 
@@ -53,10 +53,10 @@ async def login(user: UserBaseLogin, session: Session = Depends(get_session)) ->
         status.HTTP_403_FORBIDDEN: {"model": Message}
     }
 )
-async def logout(session: Session = Depends(get_session), user: UserBaseSession = Depends(JWTBearer())) -> Message:
+async def logout(session: AsyncSession = Depends(get_session), user: UserBaseSession = Depends(JWTBearer())) -> Message:
     """Logout request"""
-    db_token = TokenValidator.check_token(session, user.id)
-    ControllerToken.invalidate_token(session, db_token.id)
+    token_id = await TokenValidator.check_token(session, user.id, user.token)
+    await ControllerToken.invalidate_token(session, token_id, user.id)
     return Message(detail="Logout is successful.")
 
 
@@ -68,15 +68,15 @@ async def logout(session: Session = Depends(get_session), user: UserBaseSession
         status.HTTP_406_NOT_ACCEPTABLE: {"model": Message},
     }
 )
-async def create(user: UserBaseCreate, session: Session = Depends(get_session)) -> Any:
+async def create(user: UserBaseCreate, session: AsyncSession = Depends(get_session)) -> Any:
     """Create user request"""
-    db_user = ControllerUser.get_by_username(session, user.username)
+    db_user = await ControllerUser.get_by_username(session, user.username)
     if db_user is not None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Username is taken.")
-    db_user = ControllerUser.get_by_email(session, user.email)
+    db_user = await ControllerUser.get_by_email(session, user.email)
     if db_user is not None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email is taken.")
-    ControllerUser.create(session, user=user)
+    await ControllerUser.create(session, user=user)
     return Message(detail="User is created.")
 
 
@@ -91,9 +91,9 @@ async def create(user: UserBaseCreate, session: Session = Depends(get_session))
 )
 async def get(
     user_id: int = Path(..., ge=0),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: UserBaseSession = Depends(JWTBearer())
 ) -> Any:
     """Get info on given user"""
-    TokenValidator.check_token(session, user.id)
-    return ControllerUser.get_by_id(session, user_id=user_id)
+    await TokenValidator.check_token(session, user.id, user.token)
+    return await ControllerUser.get_by_id(session, user_id=user_id)
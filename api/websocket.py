@@ -1,40 +1,73 @@
+from typing import Dict
+
+from core.auth import JWTBearer, TokenValidator
 from core.db import get_session
 from fastapi import (APIRouter, Depends, HTTPException, WebSocket,
                      WebSocketDisconnect, status)
-from process.websocket import WebsocketProcessor
-from schemas.websocket import (WebsocketBase, WebsocketMessage,
-                               WebsocketResponse, WebsocketResponseEnum,
-                               WebsocketToken, WebsocketTurn)
-from sqlalchemy.orm import Session
+from fastapi.websockets import WebSocketState
+from process.protocol import WebsocketCodec
+from process.websocket import WebsocketManager, WebsocketProcessor
+from schemas.message import Message
+from schemas.user import UserBaseSession
+from schemas.websocket import (WebsocketResponse, WebsocketResponseEnum,
+                               WebsocketStats)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
 
 
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket, session: Session = Depends(get_session)):
-    websocket_processor = WebsocketProcessor(websocket, session)
-    await websocket.accept()
+async def websocket_endpoint(websocket: WebSocket):
+    # Clients that offer no known subprotocol get JSON text frames
+    codec = WebsocketCodec.negotiate(websocket.scope.get("subprotocols", []))
+    websocket_processor = WebsocketProcessor(websocket, codec)
+    await websocket.accept(subprotocol=codec.SUBPROTOCOL)
+    request_type = WebsocketResponseEnum.INVALID
     try:
         while True:
-            request = await websocket.receive_json()
-            request_base = WebsocketBase(**request)
-            if request_base.type == WebsocketResponseEnum.TOKEN and websocket_processor.authenticated is False:
-                await websocket_processor.authorize_user(WebsocketToken(**request))
-            elif request_base.type == WebsocketResponseEnum.MESSAGE and websocket_processor.authenticated is True:
-                await websocket_processor.message(WebsocketMessage(**request))
-            elif request_base.type == WebsocketResponseEnum.READY and websocket_processor.authenticated is True:
-                await websocket_processor.ready()
-            elif request_base.type == WebsocketResponseEnum.TURN and websocket_processor.authenticated is True:
-                await websocket_processor.turn(WebsocketTurn(**request))
+            # Frame is parsed once and only the fields of its type are validated
+            raw = await websocket.receive_bytes() if codec.BINARY is True else await websocket.receive_text()
+            request_type, request = codec.decode(raw)
+            if request_type == WebsocketResponseEnum.TOKEN and websocket_processor.authenticated is False:
+                await websocket_processor.authorize_user(request)
+            elif request_type == WebsocketResponseEnum.MESSAGE and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.message, request)
+            elif request_type == WebsocketResponseEnum.PLACE and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.place, request)
+            elif request_type == WebsocketResponseEnum.READY and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.ready)
+            elif request_type == WebsocketResponseEnum.TURN and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.turn, request)
+            elif request_type == WebsocketResponseEnum.VIEWPORT and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.viewport, request)
+            elif request_type == WebsocketResponseEnum.RESUME and websocket_processor.authenticated is True:
+                await websocket_processor.dispatch(websocket_processor.resume, request)
             else:
                 await websocket_processor.default()
                 break
     except (ValueError, TypeError, KeyError):
-        await websocket.send_json(WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=status.HTTP_400_BAD_REQUEST).dict())
+        await websocket_processor.send_error(WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=status.HTTP_400_BAD_REQUEST))
     except HTTPException:
-        await websocket.send_json(WebsocketResponse(type=request_base.type, status=status.HTTP_400_BAD_REQUEST).dict())
+        await websocket_processor.send_error(WebsocketResponse(type=request_type, status=status.HTTP_400_BAD_REQUEST))
     except WebSocketDisconnect:
         ...
     finally:
-        websocket_processor.disconnect()
-        await websocket.close(code=status.WS_1000_NORMAL_CLOSURE)
+        await websocket_processor.disconnect()
+        # Evicted slow consumers are already closed
+        if websocket.application_state == WebSocketState.CONNECTED:
+            await websocket.close(code=status.WS_1000_NORMAL_CLOSURE)
+
+
+@router.get(
+    "/ws/stats",
+    response_model=WebsocketStats,
+    responses={
+        status.HTTP_200_OK: {"model": WebsocketStats},
+        status.HTTP_401_UNAUTHORIZED: {"model": Message},
+        status.HTTP_403_FORBIDDEN: {"model": Message}
+    }
+)
+async def websocket_stats(session: AsyncSession = Depends(get_session), user: UserBaseSession = Depends(JWTBearer())) -> Dict:
+    """Return outbound queue depth and send latency of websocket connections"""
+    await TokenValidator.check_token(session, user.id, user.token)
+    return WebsocketManager.stats()
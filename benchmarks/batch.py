@@ -0,0 +1,37 @@
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from process.batch import BoardBatch
+from process.board import Board
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(0)
+    board_batch = BoardBatch(board_count, rng)
+
+    start = perf_counter()
+    board_batch.populate()
+    populate_time = perf_counter() - start
+
+    # Every board fires at its cells in its own random order until all boards are finished
+    order = np.argsort(rng.random((board_count, Board.BOARD_SIZE)), axis=1)
+    start = perf_counter()
+    move_count = 0
+    for move in range(Board.BOARD_SIZE):
+        if board_batch.finished.all():
+            break
+        xs, ys = np.divmod(order[:, move], Board.BOARD_DIM)
+        board_batch.hit(xs, ys)
+        move_count += board_count
+    hit_time = perf_counter() - start
+
+    print("{:<12} {:>16}".format("batch", "ops / sec"))
+    print("{:<12} {:>16.0f}".format("populate", board_count / populate_time))
+    print("{:<12} {:>16.0f}".format("hit", move_count / hit_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from process.board import Board
+
+
+class ListBoard:
+    """List based board kept as baseline -> Mirrors the engine before bitboards"""
+    BOARD_DIM = 10
+    EMPTY = 0
+    SHIP = 1
+    HIT = 2
+    MISS = 3
+    SHIP_SIZE_LIST = [2, 3, 3, 4, 5]
+    SHIP_PART_COUNT = sum(SHIP_SIZE_LIST)
+
+    def __init__(self) -> None:
+        self.board: List[List[int]] = [[self.EMPTY] * self.BOARD_DIM for _ in range(self.BOARD_DIM)]
+        self.ship_coordinate_list: List[Tuple[int, int]] = []
+        self.ship_hit_list: List[Tuple[int, int]] = []
+        self.ship_miss_list: List[Tuple[int, int]] = []
+        self.finished = False
+        self.populate()
+
+    def populate(self) -> None:
+        """Place the fleet with the same cells as the bitboard would use"""
+        board = Board()
+        for index in range(Board.BOARD_SIZE):
+            if board.ship_mask >> index & 1:
+                x, y = divmod(index, self.BOARD_DIM)
+                self.board[x][y] = self.SHIP
+                self.ship_coordinate_list.append((x, y))
+
+    def hit(self, x: int, y: int) -> bool:
+        Board.check_boundaries(x, y)
+        is_hit = False
+        if self.board[x][y] == self.EMPTY:
+            self.board[x][y] = self.MISS
+            self.ship_miss_list.append((x, y))
+        elif self.board[x][y] == self.SHIP:
+            self.board[x][y] = self.HIT
+            self.ship_hit_list.append((x, y))
+            is_hit = True
+            self.update_game_status()
+        else:
+            raise ValueError("Only EMPTY or SHIP values can be hit!")
+        return is_hit
+
+    def update_game_status(self) -> None:
+        sunk_ship_part_count = 0
+        for x, y in self.ship_coordinate_list:
+            if self.board[x][y] != self.HIT:
+                break
+            else:
+                sunk_ship_part_count += 1
+        self.finished = sunk_ship_part_count == self.SHIP_PART_COUNT
+
+
+def measure_moves(board_factory: Callable, board_count: int, seed: int) -> float:
+    """Play every cell of the boards in random order and return average seconds per move"""
+    random = Random(seed)
+    cell_list = [(x, y) for x in range(Board.BOARD_DIM) for y in range(Board.BOARD_DIM)]
+    board_list = [board_factory() for _ in range(board_count)]
+    order_list = []
+    for _ in range(board_count):
+        random.shuffle(cell_list)
+        order_list.append(list(cell_list))
+    move_count = 0
+    start = perf_counter()
+    for board, order in zip(board_list, order_list):
+        for x, y in order:
+            board.hit(x, y)
+            move_count += 1
+            if board.finished:
+                break
+    return (perf_counter() - start) / move_count
+
+
+def measure_volleys(board_count: int, volley_size: int, seed: int) -> float:
+    """Play every cell of the boards in volleys and return average seconds per shot"""
+    random = Random(seed)
+    cell_list = [(x, y) for x in range(Board.BOARD_DIM) for y in range(Board.BOARD_DIM)]
+    board_list = [Board() for _ in range(board_count)]
+    order_list = []
+    for _ in range(board_count):
+        random.shuffle(cell_list)
+        order_list.append([cell_list[index:index + volley_size] for index in range(0, len(cell_list), volley_size)])
+    shot_count = 0
+    start = perf_counter()
+    for board, order in zip(board_list, order_list):
+        for volley in order:
+            board.hit_many(volley)
+            shot_count += len(volley)
+    return (perf_counter() - start) / shot_count
+
+
+def measure_memory(board_factory: Callable, board_count: int) -> float:
+    """Return average allocated bytes per live board"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board_list = [board_factory() for _ in range(board_count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the boards
+    return (after - before - sys.getsizeof(board_list)) / len(board_list)
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("{:<10} {:>14} {:>16}".format("engine", "ns / move", "bytes / board"))
+    for name, board_factory in (("list", ListBoard), ("bitboard", Board)):
+        per_move = measure_moves(board_factory, board_count, seed=0)
+        per_board = measure_memory(board_factory, board_count)
+        print("{:<10} {:>14.1f} {:>16.1f}".format(name, per_move * 1e9, per_board))
+    print("{:<10} {:>14}".format("volley", "ns / shot"))
+    for volley_size in (1, 5, 10):
+        print("{:<10} {:>14.1f}".format(volley_size, measure_volleys(board_count, volley_size, seed=0) * 1e9))
+
+
+if __name__ == "__main__":
+    main()
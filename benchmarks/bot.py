@@ -0,0 +1,36 @@
+import sys
+from random import Random
+from time import perf_counter
+
+from process.board import Board, HitResult
+from process.bot import ProbabilityDensityStrategy
+
+
+def main() -> None:
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    shot_count = 0
+    move_time = 0.0
+    max_move_time = 0.0
+    budget_exceeded_count = 0
+    for seed in range(game_count):
+        rng = Random(seed)
+        board = Board(rng)
+        strategy = ProbabilityDensityStrategy(rng)
+        while board.finished is False:
+            start = perf_counter()
+            x, y = strategy.choose()
+            elapsed = perf_counter() - start
+            move_time += elapsed
+            max_move_time = max(max_move_time, elapsed)
+            result = board.hit(x, y)
+            strategy.record(x, y, result, board.get_ship_size(x, y) if result >= HitResult.SUNK else None)
+            shot_count += 1
+        budget_exceeded_count += strategy.budget_exceeded_count
+    print("games: {}".format(game_count))
+    print("shots to win: {:.2f}".format(shot_count / game_count))
+    print("us / move: {:.1f} (max {:.1f})".format(move_time / shot_count * 1e6, max_move_time * 1e6))
+    print("budget exceeded: {}".format(budget_exceeded_count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+from time import perf_counter
+from typing import Callable, List
+
+from process.board import Board
+
+
+def measure(func: Callable[[Board], object], board_list: List[Board], repeat: int) -> float:
+    """Return calls per second of given function over the boards"""
+    start = perf_counter()
+    for _ in range(repeat):
+        for board in board_list:
+            func(board)
+    return repeat * len(board_list) / (perf_counter() - start)
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeat = 5
+    board_list = [Board() for _ in range(board_count)]
+    # Play a few moves so that every cell value shows up
+    for board in board_list:
+        for x in range(0, Board.BOARD_DIM, 2):
+            board.hit(x, x)
+    text_list = [board.serialize() for board in board_list]
+    packed_list = [board.encode_base64() for board in board_list]
+    text_iter = iter(text_list * repeat)
+    packed_iter = iter(packed_list * repeat)
+
+    print("{:<28} {:>8} {:>14}".format("codec", "bytes", "ops / sec"))
+    result_list = [
+        ("text serialize", len(text_list[0]), measure(lambda board: board.serialize(), board_list, repeat)),
+        ("text serialize hidden", len(text_list[0]), measure(lambda board: board.serialize(hide_ships=True), board_list, repeat)),
+        ("packed encode", len(board_list[0].encode()), measure(lambda board: board.encode(), board_list, repeat)),
+        ("packed encode hidden cached", len(board_list[0].encode()), measure(lambda board: board.encode(hide_ships=True), board_list, repeat)),
+        ("packed base64 encode", len(packed_list[0]), measure(lambda board: board.encode_base64(), board_list, repeat)),
+        ("packed base64 decode", len(packed_list[0]), measure(lambda board: board.decode_base64(next(packed_iter)), board_list, repeat)),
+        # Text boards load as views without ship ids -> Measured last so that packed encoding still sees the ships
+        ("text deserialize", len(text_list[0]), measure(lambda board: board.deserialize(next(text_iter)), board_list, repeat)),
+    ]
+    for name, size, ops in result_list:
+        print("{:<28} {:>8} {:>14.0f}".format(name, size, ops))
+
+
+if __name__ == "__main__":
+    main()
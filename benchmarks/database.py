@@ -0,0 +1,191 @@
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from api import user
+from core.db import Base, get_session
+from core.security import Security
+from fastapi import FastAPI
+from models.games import Games
+from models.tokens import Tokens
+from models.users import Users
+from process.game import GameState
+from process.websocket import WebsocketManager, WebsocketProcessor
+from schemas.user import UserBaseLoginResponse, UserBaseSession
+from schemas.websocket import WebsocketMessage, WebsocketResponseEnum
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+# Rows counted by the slow query -> About a second on SQLite
+SLOW_ROW_COUNT = 2000000
+SLOW_QUERY = text(
+    "WITH RECURSIVE counter(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM counter WHERE x < :row_count) SELECT count(*) FROM counter"
+)
+# Seconds between probe requests
+PROBE_INTERVAL = 0.02
+
+
+class RecordingWebsocket:
+    """Websocket that sets an event on every frame"""
+
+    def __init__(self) -> None:
+        self.frame_event = asyncio.Event()
+
+    async def send_text(self, frame: str) -> None:
+        self.frame_event.set()
+
+    async def send_bytes(self, frame: bytes) -> None:
+        self.frame_event.set()
+
+    async def close(self, code: int) -> None:
+        pass
+
+
+async def request(app: FastAPI, path: str, token: str) -> int:
+    """Send a GET request to the ASGI app and return its status code"""
+    message_list = []
+
+    async def receive() -> Dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict) -> None:
+        message_list.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"", "headers": [(b"authorization", "Bearer {}".format(token).encode())], "server": ("bench", 80),
+    }
+    await app(scope, receive, send)
+    return message_list[0]["status"]
+
+
+def is_done(end_future: asyncio.Future, due: float) -> bool:
+    """Return whether the next probe is due after the slow query ended"""
+    return end_future.done() and due > end_future.result()
+
+
+async def wait_due(latency_list: List[float], due: float) -> float:
+    """Record latency of a probe from the time it was due, wait until the next one is due and return that time"""
+    latency_list.append(perf_counter() - due)
+    due += PROBE_INTERVAL
+    # Probes missed while the event loop was blocked are still due -> Blocking shows in the latencies
+    await asyncio.sleep(max(0.0, due - perf_counter()))
+    return due
+
+
+async def probe_rest(app: FastAPI, token: str, end_future: asyncio.Future) -> List[float]:
+    """Return latencies of user requests, which check the token and read the user row"""
+    latency_list = []
+    due = perf_counter()
+    while not is_done(end_future, due):
+        assert await request(app, "/user/1", token) == 200
+        due = await wait_due(latency_list, due)
+    return latency_list
+
+
+async def probe_websocket(processor: WebsocketProcessor, end_future: asyncio.Future) -> List[float]:
+    """Return latencies of chat messages until their reply reached the socket"""
+    latency_list = []
+    message = WebsocketMessage(type=WebsocketResponseEnum.MESSAGE, message="ping")
+    due = perf_counter()
+    while not is_done(end_future, due):
+        processor.websocket.frame_event.clear()
+        await processor.dispatch(processor.message, message)
+        await processor.websocket.frame_event.wait()
+        due = await wait_due(latency_list, due)
+    return latency_list
+
+
+def run_sync(path: Path, row_count: int) -> Callable:
+    """Return the slow query on a synchronous session -> Previous controllers, the event loop waits for the query"""
+    async def run() -> None:
+        engine = create_engine("sqlite:///{}".format(path))
+        with sessionmaker(bind=engine)() as session:
+            session.execute(SLOW_QUERY, {"row_count": row_count}).scalar()
+        engine.dispose()
+    return run
+
+
+def run_async(path: Path, row_count: int) -> Callable:
+    """Return the slow query on an async session -> The driver thread runs it while the event loop serves others"""
+    async def run() -> None:
+        engine = create_async_engine("sqlite+aiosqlite:///{}".format(path))
+        async with sessionmaker(bind=engine, class_=AsyncSession)() as session:
+            (await session.execute(SLOW_QUERY, {"row_count": row_count})).scalar()
+        await engine.dispose()
+    return run
+
+
+async def measure(path: Path, slow_func: Callable) -> Tuple[float, List[float], List[float]]:
+    """Run the slow query next to REST and websocket probes, return query seconds and probe latencies"""
+    engine = create_async_engine("sqlite+aiosqlite:///{}".format(path))
+    session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession)
+
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(user.router, prefix="/user")
+    app.dependency_overrides[get_session] = override_session
+    # Token is coerced to text like the login response does
+    token = UserBaseLoginResponse(token=Security.create_token(Users(id=1, username="user1"))).token
+    processor = WebsocketProcessor(RecordingWebsocket(), session_factory=session_factory)
+    processor.user = UserBaseSession(id=1, username="user1")
+    processor.game = Games(id=1, creator_user_id=1, second_user_id=None, bot=False)
+    processor.state = GameState(1, 1, None, False)
+    processor.connection = WebsocketManager.add_connection(1, processor.websocket)
+    processor.authenticated = True
+    # Warm up connections and compiled statements
+    await request(app, "/user/1", token)
+    end_future = asyncio.get_running_loop().create_future()
+    probe_list = [asyncio.create_task(probe_rest(app, token, end_future)), asyncio.create_task(probe_websocket(processor, end_future))]
+    await asyncio.sleep(0.05)
+    start = perf_counter()
+    await slow_func()
+    end = perf_counter()
+    # Probes that were due during the query are still sent and measured
+    end_future.set_result(end)
+    rest_list, websocket_list = await asyncio.gather(*probe_list)
+    await processor.disconnect()
+    await engine.dispose()
+    return end - start, rest_list, websocket_list
+
+
+async def compare(path: Path, row_count: int) -> List[Tuple[float, List[float], List[float]]]:
+    """Measure the slow query on a synchronous session, then on an async session"""
+    return [await measure(path, run_sync(path, row_count)), await measure(path, run_async(path, row_count))]
+
+
+def main() -> None:
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else SLOW_ROW_COUNT
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.db"
+        engine = create_engine("sqlite:///{}".format(path))
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add(Users(id=1, username="user1", password="", email="user1@x.com"))
+            session.add(Tokens(user_id=1, token="", valid=True))
+            session.commit()
+        engine.dispose()
+        print("slow query: {} rows, probes every {} ms".format(row_count, PROBE_INTERVAL * 1000))
+        print("{:<8} {:>8} {:>7} {:>12} {:>12} {:>7} {:>12} {:>12}".format(
+            "session", "query s", "rest n", "rest p50 ms", "rest p99 ms", "ws n", "ws p50 ms", "ws p99 ms"
+        ))
+        # One event loop for both runs -> The game actor of the probe game lives on it
+        result_list = asyncio.run(compare(path, row_count))
+        for name, (elapsed, rest_list, websocket_list) in zip(("sync", "async"), result_list):
+            rest_list.sort()
+            websocket_list.sort()
+            print("{:<8} {:>8.2f} {:>7} {:>12.2f} {:>12.2f} {:>7} {:>12.2f} {:>12.2f}".format(
+                name, elapsed,
+                len(rest_list), rest_list[len(rest_list) // 2] * 1000, rest_list[int(len(rest_list) * 0.99)] * 1000,
+                len(websocket_list), websocket_list[len(websocket_list) // 2] * 1000, websocket_list[int(len(websocket_list) * 0.99)] * 1000
+            ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+from random import Random
+from time import perf_counter
+
+from process.board import Board
+from process.game import GameManager, GameSession, GameStateWriter
+from process.journal import GameJournal
+
+# Shots of each user before the server stops -> Mid-game journal of a 10x10 game
+MOVE_COUNT = 20
+
+
+def write_games(journal: GameJournal, game_count: int, seed: int) -> float:
+    """Journal started games and their moves, return seconds spent in the record calls"""
+    rng = Random(seed)
+    session_list = [GameSession(game_id, 2 * game_id, 2 * game_id + 1, Board(rng), Board(rng)) for game_id in range(1, game_count + 1)]
+    order_list = [rng.sample(range(Board.BOARD_SIZE), MOVE_COUNT) for _ in range(2)]
+    start = perf_counter()
+    for session in session_list:
+        GameManager.record_start(session)
+    for move_index in range(MOVE_COUNT):
+        for session in session_list:
+            for user_id, order in zip(session.user_id_tuple, order_list):
+                GameManager.record_shots(session, user_id, [divmod(order[move_index], Board.BOARD_DIM)])
+                session.state.turn = session.get_other_user_id(user_id)
+                session.state.move_number += 1
+                GameManager.record_turn(session)
+    return perf_counter() - start
+
+
+def main() -> None:
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sync_interval = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    with tempfile.TemporaryDirectory() as directory:
+        GameManager.JOURNAL = GameJournal(os.path.join(directory, "journal"), sync_interval)
+        GameManager.STATE_WRITER = GameStateWriter(interval=60)
+        GameManager.JOURNAL.start()
+        elapsed = write_games(GameManager.JOURNAL, game_count, seed=0)
+        # Include the final sync -> Every record is on disk
+        start = perf_counter()
+        GameManager.JOURNAL.stop()
+        elapsed += perf_counter() - start
+        stats = GameManager.JOURNAL.stats()
+        print("games: {}, moves / game: {}, sync interval: {} ms".format(game_count, 2 * MOVE_COUNT, sync_interval * 1000))
+        print("{:<10} {:>12} {:>14} {:>10} {:>10}".format("write", "records", "records / sec", "MiB / sec", "fsyncs"))
+        print("{:<10} {:>12} {:>14.0f} {:>10.1f} {:>10}".format(
+            "", stats["records"], stats["records"] / elapsed, stats["bytes"] / elapsed / 1024 / 1024, stats["syncs"]
+        ))
+        GameManager.JOURNAL = GameJournal(GameManager.JOURNAL.path, sync_interval)
+        start = perf_counter()
+        recovered_count = GameManager.recover_sessions()
+        elapsed = perf_counter() - start
+        print("{:<10} {:>12} {:>14} {:>10}".format("recover", "games", "seconds", "us / game"))
+        print("{:<10} {:>12} {:>14.2f} {:>10.1f}".format("", recovered_count, elapsed, elapsed / recovered_count * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import sys
+from random import Random
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from process.board import Board, iterate_mask
+from process.sparse import SparseBoard
+
+
+def validate_fleet_lists(ship_list: List[List[Tuple[int, int]]]) -> List[List[Tuple[int, int]]]:
+    """Validate fleet with per-cell scans over a list grid -> Baseline of the mask validator"""
+    grid = [[0] * Board.BOARD_DIM for _ in range(Board.BOARD_DIM)]
+    size_list = list(Board.SHIP_SIZE_LIST)
+    for cell_list in ship_list:
+        if len(cell_list) not in size_list:
+            raise ValueError("Fleet must match SHIP_SIZE_LIST!")
+        size_list.remove(len(cell_list))
+        for x, y in cell_list:
+            Board.check_boundaries(x, y)
+        sorted_list = sorted(cell_list)
+        first_x, first_y = sorted_list[0]
+        for position, (x, y) in enumerate(sorted_list):
+            if (x, y) != (first_x, first_y + position) and (x, y) != (first_x + position, first_y):
+                raise ValueError("Ship cells must form a straight line!")
+        if len({x for x, _ in sorted_list}) > 1 and len({y for _, y in sorted_list}) > 1:
+            raise ValueError("Ship cells must form a straight line!")
+        for x, y in cell_list:
+            if grid[x][y] != 0:
+                raise ValueError("Ships must not overlap!")
+            grid[x][y] = 1
+    return ship_list
+
+
+def return_fleet_list(fleet_count: int, seed: int) -> Tuple[List, List]:
+    """Return valid fleets of random boards and the same fleets with one ship moved over another"""
+    rng = Random(seed)
+    valid_list = []
+    invalid_list = []
+    for _ in range(fleet_count):
+        board = Board(rng)
+        ship_list = [[divmod(index, Board.BOARD_DIM) for index in iterate_mask(ship_mask)] for ship_mask in board.ship_mask_list]
+        valid_list.append(ship_list)
+        # Last ship is checked last -> Rejection costs almost a full validation
+        invalid_list.append(ship_list[:-1] + [ship_list[0][:1] + ship_list[-1][1:]])
+    return valid_list, invalid_list
+
+
+def measure(validate_func: Callable, fleet_list: List) -> float:
+    """Return average seconds per validated fleet"""
+    start = perf_counter()
+    for ship_list in fleet_list:
+        try:
+            validate_func(ship_list)
+        except ValueError:
+            pass
+    return (perf_counter() - start) / len(fleet_list)
+
+
+def main() -> None:
+    fleet_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    valid_list, invalid_list = return_fleet_list(fleet_count, seed=0)
+    # Fill the placement cache before measuring
+    Board.validate_fleet(valid_list[0])
+    print("{:<10} {:>12} {:>14} {:>14}".format("validator", "fleet", "us / fleet", "fleets / sec"))
+    for name, validate_func in (
+        ("list", validate_fleet_lists),
+        ("mask", Board.validate_fleet),
+        ("sparse", SparseBoard.with_rules(Board.BOARD_DIM, Board.SHIP_SIZE_LIST).validate_fleet),
+    ):
+        for fleet_name, fleet_list in (("valid", valid_list), ("overlapping", invalid_list)):
+            per_fleet = measure(validate_func, fleet_list)
+            print("{:<10} {:>12} {:>14.2f} {:>14.0f}".format(name, fleet_name, per_fleet * 1e6, 1 / per_fleet))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+from controllers.game import ControllerGame
+from controllers.token import ControllerToken
+from controllers.user import ControllerUser
+from core.db import Base, add_sqlite_pragmas, return_engine_kwargs
+from models.users import Users
+from schemas.game import GameBaseCreate
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Coroutines writing at the same time on one event loop
+CLIENT_COUNT = 50
+
+
+def create_default(url: str) -> AsyncEngine:
+    """Return engine with default pool and journal settings -> Previous core.db"""
+    return create_async_engine(url, connect_args={"check_same_thread": False})
+
+
+def create_tuned(url: str) -> AsyncEngine:
+    """Return engine with pool and SQLite pragmas of the settings"""
+    engine = create_async_engine(url, **return_engine_kwargs(url, AsyncAdaptedQueuePool))
+    add_sqlite_pragmas(engine.sync_engine)
+    return engine
+
+
+async def login(session: AsyncSession, username: str) -> None:
+    """Database part of a login -> Read user and token, save a new token (password hashing is left out)"""
+    db_user = await ControllerUser.get_by_username(session, username)
+    db_token = await ControllerToken.get_by_user_id(session, db_user.id)
+    if db_token is None:
+        await ControllerToken.save_token(session, "token-{}".format(username), db_user.id)
+    else:
+        await ControllerToken.update_token(session, db_token.id, db_user.id, "token-{}".format(username))
+
+
+async def create_game(session: AsyncSession, username: str) -> None:
+    """Database part of a game creation -> Check the user is in no game, insert the game"""
+    db_user = await ControllerUser.get_by_username(session, username)
+    if await ControllerGame.get_by_user_id(session, db_user.id) is None:
+        await ControllerGame.create(session, GameBaseCreate(name="{}'s Game".format(username)), db_user.id)
+
+
+async def run_clients(engine: AsyncEngine, user_count: int) -> Tuple[float, Dict[str, List[float]], int]:
+    """Log in every user and create a game for each, spread over the clients; return seconds, latencies and errors"""
+    session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession)
+    latency_dict: Dict[str, List[float]] = {"login": [], "create": []}
+    error_list = []
+
+    async def client(client_index: int) -> None:
+        for user_id in range(client_index + 1, user_count + 1, CLIENT_COUNT):
+            for name, func in (("login", login), ("create", create_game)):
+                start = perf_counter()
+                try:
+                    async with session_factory() as session:
+                        await func(session, "user{}".format(user_id))
+                except OperationalError as error:
+                    # Lock waits beyond the driver timeout -> The request would fail
+                    error_list.append(error)
+                    continue
+                latency_dict[name].append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(client(client_index) for client_index in range(CLIENT_COUNT)))
+    elapsed = perf_counter() - start
+    await engine.dispose()
+    return elapsed, latency_dict, len(error_list)
+
+
+def measure(create_func: Callable[[str], AsyncEngine], user_count: int) -> Tuple[float, Dict[str, List[float]], int]:
+    """Run the clients against a fresh SQLite file with given users"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "pool.db"
+        engine = create_engine("sqlite:///{}".format(path))
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            session.bulk_insert_mappings(Users, [
+                {"id": user_id, "username": "user{}".format(user_id), "password": "", "email": "user{}@x.com".format(user_id)}
+                for user_id in range(1, user_count + 1)
+            ])
+            session.commit()
+        engine.dispose()
+        return asyncio.run(run_clients(create_func("sqlite+aiosqlite:///{}".format(path)), user_count))
+
+
+def main() -> None:
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("users: {}, clients: {}".format(user_count, CLIENT_COUNT))
+    print("{:<8} {:>12} {:>14} {:>14} {:>8}".format("engine", "writes / sec", "login p99 ms", "create p99 ms", "errors"))
+    for name, create_func in (("default", create_default), ("tuned", create_tuned)):
+        elapsed, latency_dict, error_count = measure(create_func, user_count)
+        for latency_list in latency_dict.values():
+            latency_list.sort()
+        print("{:<8} {:>12.0f} {:>14.2f} {:>14.2f} {:>8}".format(
+            name, sum(len(latency_list) for latency_list in latency_dict.values()) / elapsed,
+            latency_dict["login"][int(len(latency_dict["login"]) * 0.99)] * 1000,
+            latency_dict["create"][int(len(latency_dict["create"]) * 0.99)] * 1000,
+            error_count
+        ))
+
+
+if __name__ == "__main__":
+    main()
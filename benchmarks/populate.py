@@ -0,0 +1,47 @@
+import sys
+from secrets import randbelow
+from time import perf_counter
+from typing import Callable
+
+from process.board import Board
+
+
+class RejectionBoard(Board):
+    """Board placing ships with the random retry loop used before the placement table"""
+    __slots__ = ()
+
+    def populate(self) -> None:
+        if self.ship_mask != 0:
+            return None
+
+        for ship_size in self.SHIP_SIZE_LIST:
+            while True:
+                x = randbelow(self.BOARD_DIM)
+                y = randbelow(self.BOARD_DIM)
+                direction = randbelow(len(self.MOVEMENT_LIST))
+                ship_mask = self.return_ship_mask(x, y, direction, ship_size)
+                if ship_mask == 0 or ship_mask & self.ship_mask:
+                    continue
+                self.record_ship(ship_mask)
+                break
+
+
+def measure_boards(board_factory: Callable, board_count: int) -> float:
+    """Return generated boards per second"""
+    start = perf_counter()
+    for _ in range(board_count):
+        board_factory()
+    return board_count / (perf_counter() - start)
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Fill the placement cache before measuring
+    Board()
+    print("{:<18} {:>14}".format("populate", "boards / sec"))
+    for name, board_factory in (("rejection loop", RejectionBoard), ("placement table", Board)):
+        print("{:<18} {:>14.0f}".format(name, measure_boards(board_factory, board_count)))
+
+
+if __name__ == "__main__":
+    main()
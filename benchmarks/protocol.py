@@ -0,0 +1,123 @@
+import json
+import sys
+from random import Random
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple, Type
+
+from process.board import Board, HitResult
+from process.protocol import MsgpackCodec, WebsocketCodec
+from schemas.websocket import (WebsocketBase, WebsocketBoard,
+                               WebsocketBoardEncodingEnum, WebsocketResponse,
+                               WebsocketResponseEnum, WebsocketTurn,
+                               WebsocketTurnResponse)
+
+# Games played for the per-game report
+GAME_COUNT = 200
+
+
+def measure(func: Callable[[int], object], count: int) -> float:
+    """Return calls per second of given function"""
+    start = perf_counter()
+    for index in range(count):
+        func(index)
+    return count / (perf_counter() - start)
+
+
+def decode_pydantic(raw: str) -> WebsocketTurn:
+    """Endpoint before the codec -> JSON parse, base model for the type, then the model of the type"""
+    request = json.loads(raw)
+    WebsocketBase(**request)
+    return WebsocketTurn(**request)
+
+
+def encode_pydantic(x: int, y: int) -> str:
+    """Turn response before the codec -> Validated model, dict and stdlib JSON"""
+    response = WebsocketTurnResponse(type=WebsocketResponseEnum.TURN, status=200, hit=True, sunk=False, x=x, y=y, next_turn=True).dict()
+    response["seq"] = x
+    return json.dumps(response)
+
+
+def play_game(rng: Random) -> Tuple[List[Dict], List[Dict]]:
+    """Return inbound messages and outbound frames of one 10x10 game between random shooters, as the server sends them"""
+    board_list = [Board(rng), Board(rng)]
+    inbound_list: List[Dict] = [{"type": "TOKEN", "token": "x" * 150}, {"type": "READY"}] * 2
+    outbound_list: List[Dict] = [WebsocketResponse(type=WebsocketResponseEnum.TOKEN, status=200).dict(), WebsocketCodec.TURN_NOTICE] * 2
+    for index in range(2):
+        outbound_list.append(WebsocketBoard(
+            type=WebsocketResponseEnum.BOARD,
+            self_board=board_list[index].encode_base64(),
+            opponent_board=board_list[1 - index].encode_base64(hide_ships=True),
+            encoding=WebsocketBoardEncodingEnum.PACKED,
+            board_dim=Board.BOARD_DIM
+        ).dict())
+    order_list = [rng.sample(range(Board.BOARD_SIZE), Board.BOARD_SIZE) for _ in range(2)]
+    for move_index in range(Board.BOARD_SIZE):
+        for index in range(2):
+            x, y = divmod(order_list[index][move_index], Board.BOARD_DIM)
+            hit_result = board_list[1 - index].hit(x, y)
+            inbound_list.append({"type": "TURN", "x": x, "y": y})
+            # One result frame per user with the next turn, or the winner of a finished game
+            turn_frame = WebsocketCodec.return_turn_frame(hit_result != HitResult.MISS, hit_result >= HitResult.SUNK, x, y)
+            finished = board_list[1 - index].finished
+            for user_index in range(2):
+                frame = dict(turn_frame, next_turn=not finished and user_index != index, finished=finished)
+                if finished is True:
+                    frame["win"] = user_index == index
+                outbound_list.append(frame)
+            if finished is True:
+                return inbound_list, outbound_list
+    return inbound_list, outbound_list
+
+
+def measure_games(codec: Type[WebsocketCodec], game_list: List[Tuple[List[Dict], List[Dict]]]) -> Tuple[float, float, float]:
+    """Return bytes per game, microseconds per outbound frame encoded and per inbound frame decoded with given codec"""
+    byte_count = encode_time = decode_time = 0.0
+    frame_count = message_count = 0
+    for inbound_list, outbound_list in game_list:
+        raw_list = [codec.encode(message) for message in inbound_list]
+        start = perf_counter()
+        for seq, frame in enumerate(outbound_list):
+            byte_count += len(codec.encode_game(frame, seq))
+        encode_time += perf_counter() - start
+        start = perf_counter()
+        for raw in raw_list:
+            codec.decode(raw)
+        decode_time += perf_counter() - start
+        byte_count += sum(len(raw) for raw in raw_list)
+        frame_count += len(outbound_list)
+        message_count += len(raw_list)
+    return byte_count / len(game_list), encode_time / frame_count * 1e6, decode_time / message_count * 1e6
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    raw_list: List[str] = ['{{"type": "TURN", "x": {}, "y": {}}}'.format(index % 10, index // 10 % 10) for index in range(count)]
+    salvo = '{"type": "TURN", "shots": [' + ", ".join('{{"x": {}, "y": {}}}'.format(x, x) for x in range(5)) + "]}"
+    invalid = WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=400)
+
+    print("frames: {}".format(count))
+    print("{:<24} {:>14} {:>14} {:>8}".format("frame", "pydantic / sec", "codec / sec", "speedup"))
+    result_list = [
+        ("decode TURN", measure(lambda index: decode_pydantic(raw_list[index]), count), measure(lambda index: WebsocketCodec.decode(raw_list[index]), count)),
+        ("decode salvo TURN", measure(lambda index: decode_pydantic(salvo), count), measure(lambda index: WebsocketCodec.decode(salvo), count)),
+        (
+            "encode TURN result",
+            measure(lambda index: encode_pydantic(index % 10, index % 7), count),
+            measure(lambda index: WebsocketCodec.encode_game(dict(WebsocketCodec.return_turn_frame(True, False, index % 10, index % 7), next_turn=True, finished=False), index), count)
+        ),
+        ("encode static reply", measure(lambda index: json.dumps(invalid.dict()), count), measure(lambda index: WebsocketCodec.INVALID, count)),
+    ]
+    for name, before, after in result_list:
+        print("{:<24} {:>14.0f} {:>14.0f} {:>7.1f}x".format(name, before, after, after / before))
+
+    rng = Random(0)
+    game_list = [play_game(rng) for _ in range(GAME_COUNT)]
+    print("games: {}, frames / game: {:.0f}".format(GAME_COUNT, sum(len(inbound) + len(outbound) for inbound, outbound in game_list) / GAME_COUNT))
+    print("{:<24} {:>14} {:>14} {:>14}".format("subprotocol", "bytes / game", "encode us", "decode us"))
+    for codec in (WebsocketCodec, MsgpackCodec):
+        byte_count, encode_us, decode_us = measure_games(codec, game_list)
+        print("{:<24} {:>14.0f} {:>14.2f} {:>14.2f}".format(codec.SUBPROTOCOL or "json", byte_count, encode_us, decode_us))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import sys
+from random import Random
+from time import perf_counter
+
+from process.board import Board
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Fill the placement cache before measuring
+    Board()
+    print("{:<10} {:>14} {:>14}".format("random", "draws / sec", "boards / sec"))
+    for name, rng in (("system", Board.SYSTEM_RANDOM), ("seeded", Random(0))):
+        start = perf_counter()
+        for _ in range(board_count * 10):
+            rng.randrange(100)
+        draw_rate = board_count * 10 / (perf_counter() - start)
+        start = perf_counter()
+        for _ in range(board_count):
+            Board(rng)
+        board_rate = board_count / (perf_counter() - start)
+        print("{:<10} {:>14.0f} {:>14.0f}".format(name, draw_rate, board_rate))
+
+
+if __name__ == "__main__":
+    main()
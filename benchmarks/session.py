@@ -0,0 +1,46 @@
+import sys
+import tracemalloc
+from heapq import heappop, heappush
+from random import Random
+
+from process.board import Board
+from process.game import GameManager, GameSession
+
+HOUR = 3600
+# Share of games that are abandoned instead of finished
+ABANDON_RATIO = 0.3
+
+
+def main() -> None:
+    games_per_second = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    hour_count = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    random = Random(0)
+    # Simulated clock -> Games start at a steady rate, finish after a few minutes or are abandoned
+    finish_list = []
+    game_id = 0
+    now = 0.0
+    tracemalloc.start()
+    print("ttl: {} s, games / sec: {}".format(GameManager.SESSION_TTL, games_per_second))
+    print("{:>5} {:>10} {:>10} {:>10} {:>10} {:>10} {:>12}".format("hour", "sessions", "users", "created", "finished", "expired", "memory MiB"))
+    for hour in range(1, hour_count + 1):
+        while now < hour * HOUR:
+            now += random.expovariate(games_per_second)
+            GameManager.add_session(GameSession(game_id, 2 * game_id + 1, 2 * game_id + 2, Board(random), Board(random)), now=now)
+            if random.random() >= ABANDON_RATIO:
+                heappush(finish_list, (now + random.uniform(60, 900), game_id))
+            game_id += 1
+            # Finish games whose time has come
+            while len(finish_list) > 0 and finish_list[0][0] <= now:
+                _, finished_game_id = heappop(finish_list)
+                GameManager.finish_session(finished_game_id)
+        GameManager.evict_expired(now)
+        stats = GameManager.stats()
+        memory = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+        print("{:>5} {:>10} {:>10} {:>10} {:>10} {:>10} {:>12.2f}".format(
+            hour, stats["sessions"], stats["users"], stats["created"], stats["finished"], stats["expired"], memory
+        ))
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
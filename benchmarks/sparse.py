@@ -0,0 +1,75 @@
+import sys
+import tracemalloc
+from random import Random
+from time import perf_counter
+from typing import List, Type
+
+from process.board import Board
+from process.game import GameManager
+from process.sparse import SparseBoard
+
+DIM_LIST = [10, 32, 100, 316, 1000]
+# Standard fleet repeated -> 200 ships on boards large enough to hold them
+LARGE_FLEET = Board.SHIP_SIZE_LIST * 40
+
+
+def measure_moves(board_type: Type, board_count: int, shot_count: int, seed: int) -> float:
+    """Shoot distinct random cells on the boards and return average seconds per move"""
+    random = Random(seed)
+    board_list = [board_type(random) for _ in range(board_count)]
+    shot_count = min(shot_count, board_type.BOARD_SIZE)
+    order_list = [
+        [divmod(index, board_type.BOARD_DIM) for index in random.sample(range(board_type.BOARD_SIZE), shot_count)]
+        for _ in range(board_count)
+    ]
+    move_count = 0
+    start = perf_counter()
+    for board, order in zip(board_list, order_list):
+        for x, y in order:
+            board.hit(x, y)
+            move_count += 1
+            if board.finished:
+                break
+    return (perf_counter() - start) / move_count
+
+
+def measure_memory(board_type: Type, board_count: int, shot_count: int, seed: int) -> float:
+    """Return average allocated bytes per live board after given count of shots"""
+    random = Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board_list: List = []
+    for _ in range(board_count):
+        board = board_type(random)
+        for index in random.sample(range(board_type.BOARD_SIZE), min(shot_count, board_type.BOARD_SIZE)):
+            if board.finished:
+                break
+            board.hit(*divmod(index, board_type.BOARD_DIM))
+        board_list.append(board)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the boards
+    return (after - before - sys.getsizeof(board_list)) / len(board_list)
+
+
+def main() -> None:
+    board_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    shot_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    print("{:<6} {:<10} {:>6} {:>12} {:>16}".format("dim", "engine", "ships", "ns / move", "bytes / board"))
+    for board_dim in DIM_LIST:
+        row_list = []
+        if board_dim <= GameManager.DENSE_DIM_LIMIT:
+            row_list.append(("bitboard", Board.with_rules(board_dim, Board.SHIP_SIZE_LIST)))
+        row_list.append(("sparse", SparseBoard.with_rules(board_dim, Board.SHIP_SIZE_LIST)))
+        if sum(LARGE_FLEET) <= SparseBoard.MAX_FLEET_RATIO * board_dim * board_dim:
+            row_list.append(("sparse", SparseBoard.with_rules(board_dim, LARGE_FLEET)))
+        for name, board_type in row_list:
+            per_move = measure_moves(board_type, board_count, shot_count, seed=0)
+            per_board = measure_memory(board_type, board_count, shot_count, seed=0)
+            print("{:<6} {:<10} {:>6} {:>12.1f} {:>16.1f}".format(
+                board_dim, name, len(board_type.SHIP_SIZE_LIST), per_move * 1e9, per_board
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from controllers.game import ControllerGame
+from core.db import Base
+from models.games import Games
+from process.game import GameState, GameStateWriter
+
+# Moves written within one flush interval -> 1000 ms interval with 100 games moving every second
+MOVES_PER_FLUSH = 100
+
+
+def create_games(session: Session, game_count: int) -> None:
+    """Insert started games with both users ready"""
+    for game_id in range(1, game_count + 1):
+        session.add(Games(id=game_id, name=str(game_id), creator_user_ready=True, second_user_ready=True))
+    session.commit()
+
+
+def commit_per_move(session: Session, game_count: int, move_count: int) -> None:
+    """Update and commit the game row on every move -> Previous websocket path"""
+    for move_number in range(1, move_count + 1):
+        game = session.get(Games, move_number % game_count + 1)
+        game.move_number = move_number
+        game.turn = move_number
+        session.commit()
+
+
+def write_behind(session: Session, game_count: int, move_count: int) -> None:
+    """Change in-memory states and write dirty ones in one batch per flush interval"""
+    writer = GameStateWriter(interval=1)
+    writer.write_func = lambda mapping_list: ControllerGame.update_states(session, mapping_list)
+    state_list = [GameState(game_id, game_id, None, False) for game_id in range(1, game_count + 1)]
+    for move_number in range(1, move_count + 1):
+        state = state_list[move_number % game_count]
+        state.move_number = move_number
+        state.turn = move_number
+        writer.mark(state)
+        if move_number % MOVES_PER_FLUSH == 0:
+            writer.flush()
+    writer.flush()
+
+
+def measure(write_func: Callable, game_count: int, move_count: int) -> float:
+    """Return moves written per second into a fresh SQLite file"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine("sqlite:///{}".format(Path(directory) / "state.db"))
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        create_games(session, game_count)
+        start = perf_counter()
+        write_func(session, game_count, move_count)
+        elapsed = perf_counter() - start
+        session.close()
+        engine.dispose()
+    return move_count / elapsed
+
+
+def main() -> None:
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    move_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    print("{:<14} {:>8} {:>10} {:>14}".format("writer", "games", "moves", "moves / sec"))
+    for name, write_func in (("commit/move", commit_per_move), ("write-behind", write_behind)):
+        print("{:<14} {:>8} {:>10} {:>14.0f}".format(name, game_count, move_count, measure(write_func, game_count, move_count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import asyncio
+import sys
+from random import Random
+from time import perf_counter
+from typing import List, Tuple
+
+from models.games import Games
+from process.board import Board
+from process.game import GameManager, GameSession
+from process.websocket import WebsocketManager, WebsocketProcessor
+from schemas.user import UserBaseSession
+from schemas.websocket import WebsocketResponseEnum, WebsocketTurn
+
+# Seconds a socket write takes -> Frames of one connection are written one after another
+SEND_DELAY = 0.0002
+
+
+class DelayedWebsocket:
+    """Websocket whose writes take SEND_DELAY seconds"""
+
+    def __init__(self) -> None:
+        self.frame_count = 0
+
+    async def send_text(self, frame: str) -> None:
+        await asyncio.sleep(SEND_DELAY)
+        self.frame_count += 1
+
+    async def send_bytes(self, frame: bytes) -> None:
+        await self.send_text(frame)
+
+    async def close(self, code: int) -> None:
+        pass
+
+
+def create_processor(game_id: int, user_id: int, game: Games, websocket: DelayedWebsocket) -> WebsocketProcessor:
+    """Return processor of an authorized user without a database session"""
+    processor = WebsocketProcessor(websocket)
+    processor.user = UserBaseSession(id=user_id, username="user{}".format(user_id))
+    processor.game = game
+    processor.connection = WebsocketManager.add_connection(user_id, websocket)
+    processor.authenticated = True
+    return processor
+
+
+async def wait_idle(processor_list: List[WebsocketProcessor]) -> None:
+    """Wait until writer tasks sent every queued frame"""
+    while any(len(processor.connection.frame_deque) > 0 or processor.connection.ready_event.is_set() for processor in processor_list):
+        await asyncio.sleep(0)
+
+
+async def play_games(game_count: int, seed: int) -> Tuple[int, int, List[float]]:
+    """Play games between random shooters, return moves, frames written and seconds until each move reached both sockets"""
+    rng = Random(seed)
+    move_count = 0
+    frame_count = 0
+    latency_list = []
+    for game_id in range(1, game_count + 1):
+        user_id_tuple = (2 * game_id, 2 * game_id + 1)
+        game = Games(id=game_id, salvo=False, board_dim=Board.BOARD_DIM)
+        websocket_list = [DelayedWebsocket(), DelayedWebsocket()]
+        processor_list = [create_processor(game_id, user_id, game, websocket) for user_id, websocket in zip(user_id_tuple, websocket_list)]
+        game_session = GameSession(game_id, user_id_tuple[0], user_id_tuple[1], Board(rng), Board(rng))
+        game_session.state.turn = user_id_tuple[0]
+        GameManager.add_session(game_session)
+        for processor in processor_list:
+            processor.state = game_session.state
+        order_list = [rng.sample(range(Board.BOARD_SIZE), Board.BOARD_SIZE) for _ in range(2)]
+        for move_index in range(Board.BOARD_SIZE):
+            for index, processor in enumerate(processor_list):
+                if game_session.state.finished is True:
+                    break
+                x, y = divmod(order_list[index][move_index], Board.BOARD_DIM)
+                start = perf_counter()
+                await processor.turn(WebsocketTurn.construct(type=WebsocketResponseEnum.TURN, x=x, y=y, shots=None))
+                await wait_idle(processor_list)
+                latency_list.append(perf_counter() - start)
+                move_count += 1
+        for processor in processor_list:
+            await processor.disconnect()
+        frame_count += sum(websocket.frame_count for websocket in websocket_list)
+    return move_count, frame_count, latency_list
+
+
+def main() -> None:
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    move_count, frame_count, latency_list = asyncio.run(play_games(game_count, seed=0))
+    latency_list.sort()
+    print("games: {}, moves: {}, socket write: {} ms".format(game_count, move_count, SEND_DELAY * 1000))
+    print("{:>14} {:>14} {:>14} {:>14}".format("frames / move", "avg ms", "p50 ms", "p99 ms"))
+    print("{:>14.2f} {:>14.3f} {:>14.3f} {:>14.3f}".format(
+        frame_count / move_count,
+        sum(latency_list) / move_count * 1000,
+        latency_list[move_count // 2] * 1000,
+        latency_list[int(move_count * 0.99)] * 1000
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-from typing import List, Tuple
-import secrets
+from random import Random, SystemRandom
+from typing import List, Optional, Tuple
 
 
 class Board:
@@ -18,8 +18,14 @@ class Board:
     LEFT = 2
     RIGHT = 3
     MOVEMENT_LIST = [UP, DOWN, LEFT, RIGHT]
+    # Default random provider -> Same CSPRNG as secrets module
+    SYSTEM_RANDOM = SystemRandom()
 
-    def __init__(self):
+    def __init__(self, rng: Optional[Random] = None):
+        """
+        rng: Random provider for populate, pass a seeded Random for reproducible boards
+        """
+        self._rng = rng if rng is not None else self.SYSTEM_RANDOM
         self._board = None
         self._ship_coordinate_list: List[Tuple[int, int]] = []
         self._finished = False
@@ -87,10 +93,10 @@ class Board:
         for ship_size in self.SHIP_SIZE_LIST:
             while True:
                 # Get random coordinates
-                x = secrets.randbelow(self.BOARD_DIM)
-                y = secrets.randbelow(self.BOARD_DIM)
+                x = self._rng.randrange(self.BOARD_DIM)
+                y = self._rng.randrange(self.BOARD_DIM)
                 # Get random directions
-                direction = secrets.randbelow(len(self.MOVEMENT_LIST))
+                direction = self._rng.randrange(len(self.MOVEMENT_LIST))
                 coordinate_list = self._return_coordinates(x, y, direction, ship_size)
                 if len(coordinate_list) == 0:
                     # Invalid coordinates -> Try again
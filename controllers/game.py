@@ -1,11 +1,10 @@
-from typing import List, Optional
-
-from sqlalchemy.sql.functions import user
+from typing import Dict, List, Optional, Set
 
 from models.games import Games
 from models.users import Users
 from schemas.game import GameBaseCreate, GameBaseList
-from sqlalchemy import desc
+from sqlalchemy import desc, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, aliased
 
 from controllers.user import ControllerUser
@@ -18,60 +17,103 @@ class ControllerGame:
     def get_other_user_id(game: Games, user_id: int) -> Optional[int]:
         """Given game and user id, return the other user id in the game"""
         other_user_id = None
-        if game.creator_user_id == user_id:
+        if game.creator_user_id == user_id and game.bot is True:
+            other_user_id = -game.id  # Bot plays with negative game id as its user id
+        elif game.creator_user_id == user_id:
             other_user_id = game.second_user_id  # Might ne None
         elif game.second_user_id == user_id:
             other_user_id = game.creator_user_id  # Cannot be None
         return other_user_id
 
     @staticmethod
-    def get_by_id(session: Session, game_id: int) -> Optional[Games]:
-        return session.query(Games).filter(Games.id == game_id).first()
+    def get_ship_size_list(game: Games) -> Optional[List[int]]:
+        """Return ship sizes of the game fleet, None for the standard fleet"""
+        if game.fleet is None:
+            return None
+        return [int(ship_size) for ship_size in game.fleet.split(",")]
+
+    @staticmethod
+    async def get_by_id(session: AsyncSession, game_id: int) -> Optional[Games]:
+        return await session.scalar(select(Games).filter(Games.id == game_id).limit(1))
 
     @staticmethod
-    def get_by_user_id(session: Session, user_id: int) -> Optional[Games]:
-        return session.query(Games).filter((Games.creator_user_id == user_id) | (Games.second_user_id == user_id)).first()
+    async def get_by_user_id(session: AsyncSession, user_id: int) -> Optional[Games]:
+        """Return last game of the user that is unfinished in the DB -> Its state may already be finished in memory"""
+        return await session.scalar(
+            select(Games).filter((Games.creator_user_id == user_id) | (Games.second_user_id == user_id), Games.finished.is_(False)).order_by(desc(Games.id)).limit(1)
+        )
+
+    @staticmethod
+    async def get_last_by_user_id(session: AsyncSession, user_id: int) -> Optional[Games]:
+        """Return last game of the user -> Users start a game only after their previous one is finished, which can still be resumed"""
+        return await session.scalar(
+            select(Games).filter((Games.creator_user_id == user_id) | (Games.second_user_id == user_id)).order_by(desc(Games.id)).limit(1)
+        )
 
     @classmethod
-    def get_by_username(cls, session: Session, username: str) -> Optional[Games]:
-        user = ControllerUser.get_by_username(session, username)
+    async def get_by_username(cls, session: AsyncSession, username: str) -> Optional[Games]:
+        user = await ControllerUser.get_by_username(session, username)
         if user is None:
             return None
-        return cls.get_by_user_id(session, user.id)
+        return await cls.get_by_user_id(session, user.id)
 
     @staticmethod
-    def create(session: Session, game: GameBaseCreate, user_id: int) -> Games:
-        db_game = Games(**game.dict())
+    async def create(session: AsyncSession, game: GameBaseCreate, user_id: int) -> Games:
+        db_game = Games(**game.dict(exclude={"fleet"}))
         db_game.creator_user_id = user_id
+        if game.fleet is not None:
+            db_game.fleet = ",".join(str(ship_size) for ship_size in game.fleet)
+        # Bot is always ready
+        db_game.second_user_ready = game.bot
         session.add(db_game)
-        session.commit()
-        session.refresh(db_game)
+        await session.commit()
+        await session.refresh(db_game)
         return db_game
 
     @classmethod
-    def list(cls, session: Session, game_param: GameBaseList) -> List[Games]:
+    async def list(cls, session: AsyncSession, game_param: GameBaseList) -> List[Games]:
         creator_user = aliased(Users)
         second_user = aliased(Users)
-        query = session.query(Games)\
+        query = select(Games)\
             .join(creator_user, Games.creator_user_id == creator_user.id, isouter=True)\
             .join(second_user, Games.second_user_id == second_user.id, isouter=True)
 
         if game_param.name is not None:
             query = query.filter(Games.name.contains(game_param.name) | (creator_user.username.contains(game_param.name)) | (second_user.username.contains(game_param.name)))
 
-        return query.order_by(desc(Games.id)).offset(game_param.page).limit(cls.LIMIT).all()
+        return (await session.scalars(query.order_by(desc(Games.id)).offset(game_param.page).limit(cls.LIMIT))).all()
 
     @staticmethod
-    def join(session: Session, game_id: int, user_id: int) -> None:
-        session.query(Games).where(Games.id == game_id).update({Games.second_user_id: user_id})
+    async def join(session: AsyncSession, game_id: int, user_id: int) -> None:
+        await session.execute(update(Games).where(Games.id == game_id).values({Games.second_user_id: user_id}))
+        await session.commit()
+
+    @staticmethod
+    def update_states(session: Session, mapping_list: List[Dict]) -> None:
+        """Write given game state columns keyed by game id in one batch -> Runs on the writer thread with a synchronous session"""
+        session.bulk_update_mappings(Games, mapping_list)
         session.commit()
 
     @staticmethod
-    def get(session: Session, game_id: int) -> Optional[Games]:
+    def finish_unrecovered(session: Session, game_id_set: Set[int]) -> List[int]:
+        """Mark started unfinished games missing from given game ids as finished and return their ids -> Runs at startup with a synchronous session"""
+        game_id_list = [
+            game_id for game_id in session.scalars(
+                select(Games.id).filter(Games.finished.is_(False), Games.creator_user_ready.is_(True), Games.second_user_ready.is_(True))
+            ) if game_id not in game_id_set
+        ]
+        session.bulk_update_mappings(Games, [{"id": game_id, "finished": True, "turn": None} for game_id in game_id_list])
+        session.commit()
+        return game_id_list
+
+    @staticmethod
+    async def get(session: AsyncSession, game_id: int) -> Optional[Games]:
         creator_user = aliased(Users)
         second_user = aliased(Users)
-        return session.query(Games)\
-            .join(creator_user, Games.creator_user_id == creator_user.id, isouter=True)\
-            .join(second_user, Games.second_user_id == second_user.id, isouter=True)\
-            .filter(Games.id == game_id)\
-            .first()
+        return await session.scalar(
+            select(Games)
+            .join(creator_user, Games.creator_user_id == creator_user.id, isouter=True)
+            .join(second_user, Games.second_user_id == second_user.id, isouter=True)
+            .filter(Games.id == game_id)
+            .limit(1)
+        )
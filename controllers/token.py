@@ -1,36 +1,39 @@
 from typing import Optional
 
-from sqlalchemy.sql.functions import user
-
+from core.cache import token_cache
 from models.tokens import Tokens
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class ControllerToken:
 
     @staticmethod
-    def get_by_user_id(session: Session, user_id: int) -> Optional[Tokens]:
-        return session.query(Tokens).filter(Tokens.user_id == user_id).first()
+    async def get_by_user_id(session: AsyncSession, user_id: int) -> Optional[Tokens]:
+        return await session.scalar(select(Tokens).filter(Tokens.user_id == user_id).limit(1))
 
     @staticmethod
-    def get_by_token(session: Session, token: str) -> Optional[Tokens]:
-        return session.query(Tokens).filter(Tokens.token == token).first()
+    async def get_by_token(session: AsyncSession, token: str) -> Optional[Tokens]:
+        return await session.scalar(select(Tokens).filter(Tokens.token == token).limit(1))
 
     @staticmethod
-    def save_token(session: Session, token: str, user_id: int) -> Tokens:
+    async def save_token(session: AsyncSession, token: str, user_id: int) -> Tokens:
         db_token = Tokens(user_id=user_id, token=token, valid=True)
         session.add(db_token)
-        session.commit()
-        session.refresh(db_token)
+        await session.commit()
+        # Cached checks are dropped after the commit -> A check reading the old row cannot cache it again
+        token_cache.invalidate(user_id)
+        await session.refresh(db_token)
         return db_token
 
     @staticmethod
-    def update_token(session: Session, token_id: int, token: str) -> None:
-        session.query(Tokens).where(Tokens.id == token_id).update({Tokens.token: token, Tokens.valid: True, Tokens.create_date: func.now()})
-        session.commit()
+    async def update_token(session: AsyncSession, token_id: int, user_id: int, token: str) -> None:
+        await session.execute(update(Tokens).where(Tokens.id == token_id).values({Tokens.token: token, Tokens.valid: True, Tokens.create_date: func.now()}))
+        await session.commit()
+        token_cache.invalidate(user_id)
 
     @staticmethod
-    def invalidate_token(session: Session, token_id: int) -> None:
-        session.query(Tokens).where(Tokens.id == token_id).update({Tokens.valid: False})
-        session.commit()
+    async def invalidate_token(session: AsyncSession, token_id: int, user_id: int) -> None:
+        await session.execute(update(Tokens).where(Tokens.id == token_id).values({Tokens.valid: False}))
+        await session.commit()
+        token_cache.invalidate(user_id)
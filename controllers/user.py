@@ -3,35 +3,36 @@ from typing import Optional
 from core.security import Security
 from models.users import Users
 from schemas.user import UserBaseCreate
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class ControllerUser:
 
     @staticmethod
-    def get_by_id(session: Session, user_id: int) -> Optional[Users]:
-        return session.query(Users).filter(Users.id == user_id).first()
+    async def get_by_id(session: AsyncSession, user_id: int) -> Optional[Users]:
+        return await session.scalar(select(Users).filter(Users.id == user_id).limit(1))
 
     @staticmethod
-    def get_by_username(session: Session, username: str) -> Optional[Users]:
-        return session.query(Users).filter(Users.username == username).first()
+    async def get_by_username(session: AsyncSession, username: str) -> Optional[Users]:
+        return await session.scalar(select(Users).filter(Users.username == username).limit(1))
 
     @staticmethod
-    def get_by_email(session: Session, email: str) -> Optional[Users]:
-        return session.query(Users).filter(Users.email == email).first()
+    async def get_by_email(session: AsyncSession, email: str) -> Optional[Users]:
+        return await session.scalar(select(Users).filter(Users.email == email).limit(1))
 
     @classmethod
-    def create(cls, session: Session, user: UserBaseCreate) -> Users:
+    async def create(cls, session: AsyncSession, user: UserBaseCreate) -> Users:
         db_user = Users(**user.dict())
         db_user.password = Security.get_pwd_hash(user.password)
         session.add(db_user)
-        session.commit()
-        session.refresh(db_user)
+        await session.commit()
+        await session.refresh(db_user)
         return db_user
 
     @classmethod
-    def authenticate(cls, session: Session, username: str, password: str) -> Optional[Users]:
-        user = cls.get_by_username(session, username)
+    async def authenticate(cls, session: AsyncSession, username: str, password: str) -> Optional[Users]:
+        user = await cls.get_by_username(session, username)
         if user is not None and Security.verify_pwd(password, user.password) is True:
             return user
         else:
@@ -3,11 +3,11 @@ from typing import Optional
 from controllers.token import ControllerToken
 from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from models.tokens import Tokens
 from schemas.user import UserBaseSession
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from schemas.websocket import WebsocketToken
 
+from core.cache import token_cache
 from core.security import Security
 
 
@@ -29,14 +29,21 @@ class JWTBearer(HTTPBearer):
 class TokenValidator:
 
     @staticmethod
-    def check_token(session: Session, user_id: int) -> Tokens:
-        """Check token in database given user id and control its validity"""
-        db_token = ControllerToken.get_by_user_id(session, user_id)
-        if db_token is None:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Token error.")
-        elif db_token.valid is False:
+    async def check_token(session: AsyncSession, user_id: int, token: Optional[str] = None) -> int:
+        """Check token in database given user id and control its validity, return token id -> Cached by user id and token"""
+        cached = token_cache.get(user_id, token) if token is not None else None
+        if cached is None:
+            generation = token_cache.generation
+            db_token = await ControllerToken.get_by_user_id(session, user_id)
+            if db_token is None:
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Token error.")
+            cached = (db_token.id, db_token.valid is not False)
+            if token is not None:
+                token_cache.put(user_id, token, cached[0], cached[1], generation)
+        token_id, valid = cached
+        if valid is False:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid authorization code.")
-        return db_token
+        return token_id
 
     @staticmethod
     def authorize_socket(token: WebsocketToken) -> UserBaseSession:
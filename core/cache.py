@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from core.settings import settings
+
+
+class InvalidationChannel:
+    """Carries invalidated user ids between workers -> This channel serves a single worker, subclasses plug in a broker"""
+
+    def publish(self, user_id: int) -> None:
+        """Send invalidated user id to the other workers"""
+        return None
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        """Call callback with user ids invalidated by other workers, from any thread"""
+        return None
+
+
+class TokenCache:
+    """Bounded LRU of token validity keyed by user id and token -> Entries expire after ttl, writes invalidate them"""
+
+    def __init__(self, size: int, ttl: float, channel: Optional[InvalidationChannel] = None) -> None:
+        self.size = size
+        self.ttl = ttl
+        # Entry: expiry time, token row id, valid flag
+        self.entry_dict: "OrderedDict[Tuple[int, str], Tuple[float, int, bool]]" = OrderedDict()
+        self.user_key_dict: Dict[int, Set[Tuple[int, str]]] = {}
+        # Bumped by every invalidation -> Lookups that started before it do not cache their result
+        self.generation = 0
+        self.lock = Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+        self.expired_count = 0
+        self.evicted_count = 0
+        self.invalidated_count = 0
+        self.channel = channel if channel is not None else InvalidationChannel()
+        self.channel.subscribe(self.drop)
+
+    def set_channel(self, channel: InvalidationChannel) -> None:
+        """Publish invalidations to given channel and drop entries of user ids it delivers"""
+        self.channel = channel
+        channel.subscribe(self.drop)
+
+    def get(self, user_id: int, token: str, now: Optional[float] = None) -> Optional[Tuple[int, bool]]:
+        """Return token row id and valid flag of a live entry, None on a miss"""
+        key = (user_id, token)
+        now = now if now is not None else monotonic()
+        with self.lock:
+            entry = self.entry_dict.get(key, None)
+            if entry is not None and entry[0] <= now:
+                self.remove(key)
+                self.expired_count += 1
+                entry = None
+            if entry is None:
+                self.miss_count += 1
+                return None
+            self.entry_dict.move_to_end(key)
+            self.hit_count += 1
+            return entry[1], entry[2]
+
+    def put(self, user_id: int, token: str, token_id: int, valid: bool, generation: int, now: Optional[float] = None) -> None:
+        """Cache validity read from the DB, generation is the one before the read"""
+        key = (user_id, token)
+        now = now if now is not None else monotonic()
+        with self.lock:
+            if generation != self.generation:
+                # Token changed while it was read -> Result may be stale
+                return None
+            self.entry_dict[key] = (now + self.ttl, token_id, valid)
+            self.entry_dict.move_to_end(key)
+            self.user_key_dict.setdefault(user_id, set()).add(key)
+            while len(self.entry_dict) > self.size:
+                self.remove(next(iter(self.entry_dict)))
+                self.evicted_count += 1
+
+    def remove(self, key: Tuple[int, str]) -> None:
+        """Remove entry of given key and its user index entry, lock must be held"""
+        del self.entry_dict[key]
+        key_set = self.user_key_dict[key[0]]
+        key_set.discard(key)
+        if len(key_set) == 0:
+            del self.user_key_dict[key[0]]
+
+    def drop(self, user_id: int) -> None:
+        """Remove entries of given user id from this worker"""
+        with self.lock:
+            self.generation += 1
+            for key in list(self.user_key_dict.get(user_id, ())):
+                self.remove(key)
+                self.invalidated_count += 1
+
+    def invalidate(self, user_id: int) -> None:
+        """Remove entries of given user id on every worker"""
+        self.drop(user_id)
+        self.channel.publish(user_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters"""
+        return {
+            "size": len(self.entry_dict),
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+            "expired": self.expired_count,
+            "evicted": self.evicted_count,
+            "invalidated": self.invalidated_count,
+        }
+
+
+token_cache = TokenCache(settings.token_cache_size, settings.token_cache_ttl_s)
@@ -1,19 +1,142 @@
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import Any, AsyncGenerator, Dict, List, Type
+from sqlalchemy import UniqueConstraint, create_engine, event, inspect, literal, text
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from core.settings import settings
 
+# Async drivers of the configured databases -> aiosqlite locally, asyncpg in production
+ASYNC_DRIVER_DICT = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
 
-engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+
+def return_async_url(url: str) -> str:
+    """Return given database url with the async driver of its dialect, urls naming a driver are kept"""
+    database_url = make_url(url)
+    if database_url.drivername not in ASYNC_DRIVER_DICT:
+        return url
+    return str(database_url.set(drivername=ASYNC_DRIVER_DICT[database_url.drivername]))
+
+
+def return_engine_kwargs(url: str, poolclass: Type[Pool]) -> Dict[str, Any]:
+    """Return pool and connect arguments of the settings for given database url"""
+    database_url = make_url(url)
+    engine_kwargs: Dict[str, Any] = {"pool_pre_ping": settings.pool_pre_ping, "pool_recycle": settings.pool_recycle_s}
+    if database_url.get_backend_name() == "sqlite":
+        # Connections are shared by threads of the pool -> SQLite-only argument
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if database_url.database in (None, "", ":memory:"):
+            # In-memory database lives in its single connection
+            return engine_kwargs
+        # SQLite files get no pool by default -> Every session would open the file again
+        engine_kwargs["poolclass"] = poolclass
+    engine_kwargs.update(pool_size=settings.pool_size, max_overflow=settings.max_overflow, pool_timeout=settings.pool_timeout_s)
+    return engine_kwargs
+
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Tune each new SQLite connection with the journal, sync, cache and memory map settings"""
+    cursor = dbapi_connection.cursor()
+    if settings.sqlite_wal is True:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous={}".format(settings.sqlite_synchronous))
+    # Negative cache size is in KiB instead of pages
+    cursor.execute("PRAGMA cache_size=-{}".format(settings.sqlite_cache_size_kb))
+    cursor.execute("PRAGMA mmap_size={}".format(settings.sqlite_mmap_size_mb * 1024 * 1024))
+    cursor.close()
+
+
+def add_sqlite_pragmas(engine: Engine) -> None:
+    """Run set_sqlite_pragmas on new connections of given engine if it is a SQLite one"""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+
+
+# Synchronous engine -> Schema creation at startup and the game state writer thread
+engine = create_engine(settings.database_url, **return_engine_kwargs(settings.database_url, QueuePool))
+add_sqlite_pragmas(engine)
 session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async engine -> Request handlers and websockets await queries without blocking the event loop
+async_database_url = return_async_url(settings.database_url)
+async_engine = create_async_engine(async_database_url, **return_engine_kwargs(async_database_url, AsyncAdaptedQueuePool))
+add_sqlite_pragmas(async_engine.sync_engine)
+# Loaded rows stay readable after commit, async sessions cannot lazy load expired attributes
+async_session_local = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine, class_=AsyncSession)
 Base = declarative_base()
 
 
-def get_session() -> Generator[Session, None, None]:
-    session = session_local()
-    try:
+def add_missing_columns(engine: Engine) -> List[str]:
+    """Add model columns missing from existing tables and return their names -> Tables kept from an older version get new columns with their defaults"""
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    added_list = []
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            column_set = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in column_set:
+                    continue
+                if column.nullable is False:
+                    raise RuntimeError("Column {}.{} cannot be added to existing rows, drop the tables!".format(table.name, column.name))
+                statement = "ALTER TABLE {} ADD COLUMN {} {}".format(
+                    preparer.format_table(table), preparer.format_column(column), column.type.compile(dialect=engine.dialect)
+                )
+                if column.default is not None and column.default.is_scalar:
+                    # Existing rows get the model default instead of NULL
+                    statement += " DEFAULT {}".format(literal(column.default.arg, column.type).compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+                connection.execute(text(statement))
+                added_list.append("{}.{}".format(table.name, column.name))
+    return added_list
+
+
+def drop_stale_unique_constraints(engine: Engine) -> List[str]:
+    """Drop unique constraints of existing tables that the models no longer have and return them -> Model indexes are created in their place"""
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    dropped_list = []
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            model_set = {frozenset(constraint.columns.keys()) for constraint in table.constraints if isinstance(constraint, UniqueConstraint)}
+            stale_list = [constraint for constraint in inspector.get_unique_constraints(table.name) if frozenset(constraint["column_names"]) not in model_set]
+            if len(stale_list) == 0:
+                continue
+            if engine.dialect.name == "sqlite":
+                # SQLite cannot drop constraints -> Table is created again and its rows are copied
+                rebuild_sqlite_table(connection, table, [column["name"] for column in inspector.get_columns(table.name)])
+            else:
+                for constraint in stale_list:
+                    connection.execute(text("ALTER TABLE {} DROP CONSTRAINT {}".format(preparer.format_table(table), preparer.quote(constraint["name"]))))
+            index_set = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in index_set:
+                    index.create(connection)
+            dropped_list += ["{}({})".format(table.name, ", ".join(constraint["column_names"])) for constraint in stale_list]
+    return dropped_list
+
+
+def rebuild_sqlite_table(connection: Connection, table: Any, column_name_list: List[str]) -> None:
+    """Create given table from its model and copy the given columns of its rows"""
+    preparer = connection.dialect.identifier_preparer
+    old_name = preparer.quote("_old_{}".format(table.name))
+    column_text = ", ".join(preparer.quote(column.name) for column in table.columns if column.name in column_name_list)
+    # Indexes keep their names on the renamed table -> They are created again with the model
+    for index in inspect(connection).get_indexes(table.name):
+        connection.execute(text("DROP INDEX {}".format(preparer.quote(index["name"]))))
+    # Legacy rename keeps foreign keys of other tables pointing at the table name
+    connection.execute(text("PRAGMA legacy_alter_table=ON"))
+    connection.execute(text("ALTER TABLE {} RENAME TO {}".format(preparer.format_table(table), old_name)))
+    connection.execute(text("PRAGMA legacy_alter_table=OFF"))
+    table.create(connection)
+    connection.execute(text("INSERT INTO {} ({}) SELECT {} FROM {}".format(preparer.format_table(table), column_text, column_text, old_name)))
+    connection.execute(text("DROP TABLE {}".format(old_name)))
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_local() as session:
         yield session
-    finally:
-        session.close()
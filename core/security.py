@@ -12,7 +12,7 @@ from core.settings import settings
 
 
 class Security:
-    KEY = secrets.token_urlsafe(32)
+    KEY = settings.secret_key if settings.secret_key is not None else secrets.token_urlsafe(32)
     ALGORITHM = "HS256"
     PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -39,7 +39,16 @@ class Security:
 
         if data.get("id") is None or data.get("username") is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid token.")
-        return UserBaseSession(id=data.get("id"), username=data.get("username"))
+        return UserBaseSession(id=data.get("id"), username=data.get("username"), token=token)
+
+    @classmethod
+    def is_token_valid(cls, token: str) -> bool:
+        """Return whether given access token is signed with the current key and not expired"""
+        try:
+            cls.decode_token(token)
+        except HTTPException:
+            return False
+        return True
 
     @classmethod
     def get_pwd_hash(cls, password: str) -> str:
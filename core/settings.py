@@ -14,7 +14,36 @@ class Settings:
             self.server_ip: str = config_dict["server"]["ip"]
             self.server_port: int = config_dict["server"]["port"]
             self.token_expire_min: int = config_dict["server"]["token_expire_min"]
+            self.outbound_high_water: int = config_dict["server"]["outbound_high_water"]
+            self.outbound_queue_limit: int = config_dict["server"]["outbound_queue_limit"]
+            self.outbound_evict_after_ms: float = config_dict["server"]["outbound_evict_after_ms"]
+            self.token_cache_size: int = config_dict["server"]["token_cache_size"]
+            self.token_cache_ttl_s: float = config_dict["server"]["token_cache_ttl_s"]
+            self.secret_key: Optional[str] = config_dict["server"]["secret_key"]
+            self.board_pool_size: int = config_dict["game"]["board_pool_size"]
+            self.board_pool_refill: int = config_dict["game"]["board_pool_refill"]
+            self.game_random: str = config_dict["game"]["random"]
+            self.game_seed: Optional[int] = config_dict["game"]["seed"]
+            self.bot_move_budget_ms: float = config_dict["game"]["bot_move_budget_ms"]
+            self.session_ttl_s: float = config_dict["game"]["session_ttl_s"]
+            self.session_sweep_interval_s: float = config_dict["game"]["session_sweep_interval_s"]
+            self.finished_resume_s: float = config_dict["game"]["finished_resume_s"]
+            self.state_flush_interval_ms: float = config_dict["game"]["state_flush_interval_ms"]
+            self.replay_buffer_size: int = config_dict["game"]["replay_buffer_size"]
+            self.journal_path: Optional[str] = config_dict["game"]["journal_path"]
+            self.journal_sync_interval_ms: float = config_dict["game"]["journal_sync_interval_ms"]
+            self.journal_compact_mb: float = config_dict["game"]["journal_compact_mb"]
+            self.actor_idle_s: float = config_dict["game"]["actor_idle_s"]
             self.database_url: str = config_dict["database"]["url"]
+            self.pool_size: int = config_dict["database"]["pool_size"]
+            self.max_overflow: int = config_dict["database"]["max_overflow"]
+            self.pool_timeout_s: float = config_dict["database"]["pool_timeout_s"]
+            self.pool_pre_ping: bool = config_dict["database"]["pool_pre_ping"]
+            self.pool_recycle_s: int = config_dict["database"]["pool_recycle_s"]
+            self.sqlite_wal: bool = config_dict["database"]["sqlite_wal"]
+            self.sqlite_synchronous: str = config_dict["database"]["sqlite_synchronous"]
+            self.sqlite_cache_size_kb: int = config_dict["database"]["sqlite_cache_size_kb"]
+            self.sqlite_mmap_size_mb: int = config_dict["database"]["sqlite_mmap_size_mb"]
 
 
 settings = Settings()
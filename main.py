@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,11 +7,18 @@ from fastapi.responses import HTMLResponse
 
 from api import user, game, websocket
 import api
-from core.db import Base, engine
+from controllers.game import ControllerGame
+from core.db import Base, add_missing_columns, async_engine, drop_stale_unique_constraints, engine, session_local
 from core.settings import settings
+from process.game import GameManager
 
-# Create sqlalchemy tables
-Base.metadata.drop_all(bind=engine)
+# Create sqlalchemy tables -> Tables are kept when unfinished games are recovered from the journal
+if settings.journal_path is None:
+    Base.metadata.drop_all(bind=engine)
+else:
+    # Kept tables may come from an older version
+    add_missing_columns(engine)
+    drop_stale_unique_constraints(engine)
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title=settings.name)
@@ -20,6 +29,51 @@ api_router.include_router(game.router, prefix="/game", tags=["game"])
 api_router.include_router(websocket.router)
 app.include_router(api_router)
 
+
+@app.on_event("startup")
+async def startup() -> None:
+    # Fill board pool in background before the first game starts
+    GameManager.BOARD_POOL.start()
+    # Rebuild games that were running when the server stopped, then journal new events
+    GameManager.recover_sessions()
+    # Started games that did not reach the journal cannot be rebuilt -> They are over
+    finish_unrecovered_games()
+    GameManager.JOURNAL.start()
+    # Write game states changed by websocket games in batches
+    GameManager.STATE_WRITER.start(write_game_states)
+    # Evict idle games when no new game starts
+    GameManager.start_sweeper()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    GameManager.stop_sweeper()
+    # Write states changed since the last flush
+    GameManager.STATE_WRITER.stop()
+    GameManager.JOURNAL.stop()
+    # Close pooled connections -> aiosqlite connection threads would keep the process alive
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def finish_unrecovered_games() -> None:
+    """Mark started games without a recovered session as finished"""
+    session = session_local()
+    try:
+        ControllerGame.finish_unrecovered(session, set(GameManager.SESSIONS))
+    finally:
+        session.close()
+
+
+def write_game_states(mapping_list: List[Dict]) -> None:
+    """Write a batch of game states with a session of the writer thread"""
+    session = session_local()
+    try:
+        ControllerGame.update_states(session, mapping_list)
+    finally:
+        session.close()
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
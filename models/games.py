@@ -1,6 +1,6 @@
 from core.db import Base
-from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Integer, String,
-                        func)
+from sqlalchemy import (BigInteger, Boolean, Column, DateTime, ForeignKey,
+                        Integer, String, Text, func)
 from sqlalchemy.orm import relationship
 
 from models.users import Users
@@ -13,13 +13,20 @@ class Games(Base):
     name = Column(String(length=200), nullable=False)
     password = Column(String(length=200))
     create_date = Column(DateTime, default=func.now())
-    creator_user_id = Column(Integer, ForeignKey(Users.id), unique=True)
-    second_user_id = Column(Integer, ForeignKey(Users.id), unique=True)
+    # Users keep their finished games -> Only one unfinished game per user, checked by the game API
+    creator_user_id = Column(Integer, ForeignKey(Users.id), index=True)
+    second_user_id = Column(Integer, ForeignKey(Users.id), index=True)
     creator_user_ready = Column(Boolean, default=False)
     second_user_ready = Column(Boolean, default=False)
     turn = Column(Integer, ForeignKey(Users.id), unique=True)
     move_number = Column(Integer, default=0)
     finished = Column(Boolean, default=False)
+    seed = Column(BigInteger)  # Board seed in seeded random mode
+    bot = Column(Boolean, default=False)  # Second user is the server bot
+    salvo = Column(Boolean, default=False)  # Users fire a volley of shots each turn
+    salvo_shots = Column(Integer)  # Shots per volley, one shot per surviving ship when empty
+    board_dim = Column(Integer, default=10)
+    fleet = Column(Text)  # Comma separated ship sizes, standard fleet when empty
 
     creator_user = relationship(Users, foreign_keys=[creator_user_id], uselist=False)
     second_user = relationship(Users, foreign_keys=[second_user_id], uselist=False)
@@ -0,0 +1,105 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Tuple
+
+from core.settings import settings
+
+
+class GameActor:
+    """Runs the events of one game one after another -> Handlers of both users never interleave, even across awaits"""
+
+    def __init__(self, game_id: int, idle_timeout: float, stop_func: Callable[["GameActor"], None]) -> None:
+        """
+        idle_timeout: Seconds without events before the actor stops
+        stop_func: Called with the actor when it stops, no event is posted to it afterwards
+        """
+        self.game_id = game_id
+        self.idle_timeout = idle_timeout
+        self.stop_func = stop_func
+        self.mailbox: Deque[Tuple[Callable[..., Awaitable], Tuple, asyncio.Future]] = deque()
+        self.ready_event = asyncio.Event()
+        self.task = None
+        self.event_count = 0
+        self.peak_depth = 0
+
+    def start(self) -> None:
+        """Start actor task on the running event loop"""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def post(self, handler: Callable[..., Awaitable], *args) -> asyncio.Future:
+        """Queue an event, returned future gets the result or the exception of the handler"""
+        future = asyncio.get_running_loop().create_future()
+        self.mailbox.append((handler, args, future))
+        self.peak_depth = max(self.peak_depth, len(self.mailbox))
+        self.ready_event.set()
+        return future
+
+    async def run(self) -> None:
+        """Run queued events until the actor stays idle for idle_timeout"""
+        while True:
+            while len(self.mailbox) == 0:
+                self.ready_event.clear()
+                try:
+                    await asyncio.wait_for(self.ready_event.wait(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    # Mailbox is checked and the actor removed without an await in between -> No event is lost
+                    if len(self.mailbox) == 0:
+                        self.stop_func(self)
+                        return None
+            handler, args, future = self.mailbox.popleft()
+            if future.cancelled():
+                continue
+            try:
+                result = await handler(*args)
+            except Exception as exception:
+                # Handler errors belong to the websocket that posted the event, the actor keeps running
+                if not future.cancelled():
+                    future.set_exception(exception)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+            self.event_count += 1
+
+
+class GameActorManager:
+    """One actor per active game -> Websocket handlers post game events and await their results"""
+    ACTORS: Dict[int, GameActor] = {}
+    IDLE_TIMEOUT = settings.actor_idle_s
+    STARTED_COUNT = 0
+    STOPPED_COUNT = 0
+    EVENT_COUNT = 0
+
+    @classmethod
+    def post(cls, game_id: int, handler: Callable[..., Awaitable], *args) -> asyncio.Future:
+        """Queue an event on the actor of given game id, starting the actor if the game has none"""
+        actor = cls.ACTORS.get(game_id, None)
+        if actor is None:
+            actor = cls.ACTORS[game_id] = GameActor(game_id, cls.IDLE_TIMEOUT, cls.remove_actor)
+            actor.start()
+            cls.STARTED_COUNT += 1
+        return actor.post(handler, *args)
+
+    @classmethod
+    async def submit(cls, game_id: int, handler: Callable[..., Awaitable], *args) -> Any:
+        """Run an event on the actor of given game id and return its result"""
+        return await cls.post(game_id, handler, *args)
+
+    @classmethod
+    def remove_actor(cls, actor: GameActor) -> None:
+        """Remove a stopped actor from the registry"""
+        if cls.ACTORS.get(actor.game_id, None) is actor:
+            del cls.ACTORS[actor.game_id]
+        cls.STOPPED_COUNT += 1
+        cls.EVENT_COUNT += actor.event_count
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return actor counters"""
+        return {
+            "actors": len(cls.ACTORS),
+            "queued": sum(len(actor.mailbox) for actor in cls.ACTORS.values()),
+            "started": cls.STARTED_COUNT,
+            "stopped": cls.STOPPED_COUNT,
+            "events": cls.EVENT_COUNT + sum(actor.event_count for actor in cls.ACTORS.values()),
+        }
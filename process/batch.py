@@ -0,0 +1,117 @@
+from typing import List, Optional, Type
+
+import numpy as np
+
+from process.board import Board, HitResult, iterate_mask
+
+
+class BoardBatch:
+    """Many boards held as NumPy arrays -> Same rules as Board, applied to every board in one call"""
+
+    def __init__(self, board_count: int, rng: Optional[np.random.Generator] = None, board_type: Type[Board] = Board) -> None:
+        self.board_count = board_count
+        self.rng = rng if rng is not None else np.random.default_rng()
+        # Rules of the boards -> Board or a class returned by Board.with_rules()
+        self.board_type = board_type
+        board_size = board_type.BOARD_SIZE
+        # Cell arrays -> Column (x * BOARD_DIM + y) represents the cell at (x, y), ship id is -1 for empty cells
+        ship_id_dtype = np.int8 if len(board_type.SHIP_SIZE_LIST) <= np.iinfo(np.int8).max else np.int16
+        self.ship_id = np.full((board_count, board_size), -1, dtype=ship_id_dtype)
+        self.hit_cell = np.zeros((board_count, board_size), dtype=bool)
+        self.miss_cell = np.zeros((board_count, board_size), dtype=bool)
+        # Remaining parts of each ship and of the whole fleet
+        self.ship_remaining = np.zeros((board_count, len(board_type.SHIP_SIZE_LIST)), dtype=np.int32)
+        self.remaining_part_count = np.zeros(board_count, dtype=np.int32)
+        self.finished = np.zeros(board_count, dtype=bool)
+
+    @staticmethod
+    def return_placement_cells(board_type: Type[Board], ship_size: int) -> np.ndarray:
+        """Return every placement of given ship size on boards of given type as a placement x cell boolean matrix"""
+        placement_table = board_type.return_placement_table(ship_size)
+        placement_cells = np.zeros((len(placement_table.cell_list), board_type.BOARD_SIZE), dtype=bool)
+        for placement_index, cell_tuple in enumerate(placement_table.cell_list):
+            placement_cells[placement_index, list(cell_tuple)] = True
+        return placement_cells
+
+    def populate(self) -> None:
+        """Randomly populate every board -> Each ship is drawn uniformly from the placements that do not overlap placed ships"""
+        row_index = np.arange(self.board_count)
+        occupied = np.zeros((self.board_count, self.board_type.BOARD_SIZE), dtype=bool)
+        self.ship_id.fill(-1)
+        for ship_id, ship_size in enumerate(self.board_type.SHIP_SIZE_LIST):
+            placement_cells = self.return_placement_cells(self.board_type, ship_size)
+            # Placements overlapping no occupied cell -> Float matrix product runs on BLAS
+            available = (occupied.astype(np.float32) @ placement_cells.T.astype(np.float32)) == 0
+            available_count = available.sum(axis=1)
+            if (available_count == 0).any():
+                raise ValueError("Fleet does not fit on the board!")
+            # Pick the placement with the chosen rank among available ones
+            rank = (self.rng.random(self.board_count) * available_count).astype(np.int64)
+            placement_index = np.argmax(np.cumsum(available, axis=1) > rank[:, None], axis=1)
+            ship_cells = placement_cells[placement_index]
+            occupied |= ship_cells
+            self.ship_id[ship_cells] = ship_id
+            self.ship_remaining[row_index, ship_id] = ship_size
+        self.hit_cell.fill(False)
+        self.miss_cell.fill(False)
+        self.remaining_part_count.fill(self.board_type.SHIP_PART_COUNT)
+        self.finished.fill(False)
+
+    def hit(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Register one shot per board and return HitResult values, nothing is registered if any shot is invalid"""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if xs.shape != (self.board_count,) or ys.shape != (self.board_count,):
+            raise ValueError("One shot is needed for each board!")
+        board_dim = self.board_type.BOARD_DIM
+        if ((xs < 0) | (xs >= board_dim) | (ys < 0) | (ys >= board_dim)).any():
+            raise ValueError("Invalid x or y value for board!")
+        row_index = np.arange(self.board_count)
+        cell_index = xs * board_dim + ys
+        if (self.hit_cell[row_index, cell_index] | self.miss_cell[row_index, cell_index]).any():
+            raise ValueError("Only EMPTY or SHIP values can be hit!")
+        ship_id = self.ship_id[row_index, cell_index].astype(np.int64)
+        is_ship = ship_id >= 0
+        self.miss_cell[row_index[~is_ship], cell_index[~is_ship]] = True
+        self.hit_cell[row_index[is_ship], cell_index[is_ship]] = True
+        self.ship_remaining[row_index[is_ship], ship_id[is_ship]] -= 1
+        self.remaining_part_count[is_ship] -= 1
+        # Decide results -> Each result implies the previous ones
+        result = is_ship.astype(np.int8)
+        sunk = is_ship & (self.ship_remaining[row_index, np.maximum(ship_id, 0)] == 0)
+        result[sunk] = HitResult.SUNK
+        finished = is_ship & (self.remaining_part_count == 0)
+        result[finished] = HitResult.FINISHED
+        self.finished |= finished
+        return result
+
+    @classmethod
+    def from_boards(cls, board_list: List[Board]) -> "BoardBatch":
+        """Return batch holding the state of given boards, which share the rules of the first one"""
+        board_batch = cls(len(board_list), board_type=type(board_list[0]))
+        for row, board in enumerate(board_list):
+            for ship_id, ship_mask in enumerate(board.ship_mask_list):
+                board_batch.ship_id[row, list(iterate_mask(ship_mask))] = ship_id
+            board_batch.hit_cell[row, list(iterate_mask(board.hit_mask))] = True
+            board_batch.miss_cell[row, list(iterate_mask(board.miss_mask))] = True
+            board_batch.ship_remaining[row] = board.ship_remaining_list
+            board_batch.remaining_part_count[row] = board.remaining_part_count
+            board_batch.finished[row] = board.finished
+        return board_batch
+
+    def to_board(self, row: int) -> Board:
+        """Return board at given row as a Board object"""
+
+        def return_mask(cells: np.ndarray) -> int:
+            """Return bitboard mask of given cell array"""
+            mask = 0
+            for index in np.flatnonzero(cells):
+                mask |= 1 << int(index)
+            return mask
+
+        ship_mask_list = [return_mask(self.ship_id[row] == ship_id) for ship_id in range(len(self.board_type.SHIP_SIZE_LIST))]
+        # Skip the random population of __init__ -> load_ships() replaces the whole state
+        board = self.board_type.__new__(self.board_type)
+        board.rng = self.board_type.SYSTEM_RANDOM
+        board.load_ships(ship_mask_list, return_mask(self.hit_cell[row]), return_mask(self.miss_cell[row]))
+        return board
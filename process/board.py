@@ -1,9 +1,109 @@
-from secrets import randbelow
-from typing import List, Tuple
+from base64 import b64decode, b64encode
+from bisect import bisect_right
+from enum import IntEnum
+from itertools import accumulate
+from random import Random, SystemRandom
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+
+class HitResult(IntEnum):
+    """Outcome of a hit -> Truthy when a ship part is hit, each value implies the previous ones"""
+    MISS = 0
+    HIT = 1
+    SUNK = 2
+    FINISHED = 3
+
+
+def iterate_mask(mask: int) -> Iterator[int]:
+    """Yield indexes of set bits in given mask starting from the lowest one"""
+    while mask:
+        lowest_mask = mask & -mask
+        yield lowest_mask.bit_length() - 1
+        mask ^= lowest_mask
+
+
+def return_blocked_ratio(board_dim: int, ship_size_list: List[int]) -> float:
+    """Return the largest share of the placements of a ship that the other ships of the fleet can block, wherever they lie"""
+    part_count = sum(ship_size_list)
+    blocked_ratio = 0.0
+    for ship_size in set(ship_size_list):
+        placement_count = board_dim * (board_dim - ship_size + 1) * (1 if ship_size == 1 else 2)
+        # Ship of n cells blocks n + size - 1 placements along it and n * size across it
+        blocked_count = (part_count - ship_size) * (ship_size + 1) + (len(ship_size_list) - 1) * (ship_size - 1)
+        blocked_ratio = max(blocked_ratio, blocked_count / placement_count)
+    return blocked_ratio
+
+
+def create_rules_type(board_type: Type, board_dim: int, ship_size_list: List[int]) -> Type:
+    """Return subclass of given board type overriding its rule constants with given dimension and fleet"""
+    if len(ship_size_list) == 0 or min(ship_size_list) < 1 or max(ship_size_list) > board_dim:
+        raise ValueError("Every ship must fit in a row of the board!")
+    if sum(ship_size_list) > board_type.MAX_FLEET_RATIO * board_dim * board_dim:
+        raise ValueError("Fleet covers too much of the board!")
+    rules_type = type("{}{}".format(board_type.__name__, board_dim), (board_type,), {
+        "__slots__": (),
+        "BOARD_DIM": board_dim,
+        "BOARD_SIZE": board_dim * board_dim,
+        "SHIP_SIZE_LIST": list(ship_size_list),
+        "SHIP_PART_COUNT": sum(ship_size_list),
+    })
+    # Fleet must be placed at random when a game starts -> Below the blocked ratio every ship finds room in any layout
+    if return_blocked_ratio(board_dim, ship_size_list) < board_type.MAX_BLOCKED_RATIO:
+        return rules_type
+    # Small boards are populated in microseconds -> Sample boards that run out of layouts reject the fleet
+    if rules_type.BOARD_SIZE > board_type.MAX_SAMPLE_SIZE:
+        raise ValueError("Fleet cannot be placed reliably on the board!")
+    rng = Random(0)
+    for _ in range(board_type.FLEET_SAMPLE_COUNT):
+        try:
+            rules_type(rng)
+        except ValueError:
+            raise ValueError("Fleet cannot be placed reliably on the board!")
+    return rules_type
+
+
+class PlacementTable:
+    """Every legal placement of one ship size on a board, placement sets are bitsets over placement indexes"""
+    # Set bit count and set bit positions of every byte value
+    POPCOUNT_TABLE = bytes(bin(value).count("1") for value in range(256))
+    SELECT_TABLE = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+    def __init__(self, ship_mask_list: List[int], board_size: int) -> None:
+        self.ship_mask_list: Tuple[int, ...] = tuple(ship_mask_list)
+        self.ship_mask_set = frozenset(ship_mask_list)
+        self.cell_list: Tuple[Tuple[int, ...], ...] = tuple(tuple(iterate_mask(ship_mask)) for ship_mask in ship_mask_list)
+        self.all_mask = (1 << len(ship_mask_list)) - 1
+        self.byte_count = (len(ship_mask_list) + 7) // 8
+        # Placements covering each cell -> Placing a ship blocks the union of its cells' cover masks
+        cover_list = [0] * board_size
+        for placement_index, cell_tuple in enumerate(self.cell_list):
+            for index in cell_tuple:
+                cover_list[index] |= 1 << placement_index
+        self.cover_list: Tuple[int, ...] = tuple(cover_list)
+
+    def block(self, blocked_mask: int, cell_tuple: Tuple[int, ...]) -> int:
+        """Return blocked placements after given cells are occupied"""
+        for index in cell_tuple:
+            blocked_mask |= self.cover_list[index]
+        return blocked_mask
+
+    def choose(self, available_mask: int, randrange_func: Callable[[int], int]) -> int:
+        """Return index of a uniformly chosen placement among available ones, -1 if there is none"""
+        raw = available_mask.to_bytes(self.byte_count, "little")
+        cumulative_list = list(accumulate(raw.translate(self.POPCOUNT_TABLE)))
+        if len(cumulative_list) == 0 or cumulative_list[-1] == 0:
+            return -1
+        rank = randrange_func(cumulative_list[-1])
+        # Find the byte holding the chosen placement, then the bit inside the byte
+        byte_index = bisect_right(cumulative_list, rank)
+        if byte_index > 0:
+            rank -= cumulative_list[byte_index - 1]
+        return byte_index * 8 + self.SELECT_TABLE[raw[byte_index]][rank]
 
 
 class Board:
     BOARD_DIM = 10
+    BOARD_SIZE = BOARD_DIM * BOARD_DIM
     # Cell representation
     EMPTY = 0
     SHIP = 1
@@ -13,13 +113,58 @@ class Board:
     SHIP_SIZE_LIST = [2, 3, 3, 4, 5]
     SHIP_PART_COUNT = sum(SHIP_SIZE_LIST)
     # Ship direction for randomized placement
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+    MOVEMENT_LIST = [UP, DOWN, LEFT, RIGHT]
+    # Hit results as plain class attributes -> Enum attribute lookup is slow on the hit path
+    RESULT_MISS = HitResult.MISS
+    RESULT_HIT = HitResult.HIT
+    RESULT_SUNK = HitResult.SUNK
+    RESULT_FINISHED = HitResult.FINISHED
+    # Every legal ship placement, keyed by board dimension and ship size
+    PLACEMENT_CACHE: Dict[Tuple[int, int], PlacementTable] = {}
+    # Default random provider -> Same CSPRNG as secrets module, a seeded Random gives reproducible boards
+    SYSTEM_RANDOM = SystemRandom()
+    # Legal ship masks of each fleet ship size, keyed by board class
+    FLEET_MASK_CACHE: Dict[Type, Dict[int, frozenset]] = {}
+    # Board classes with custom rules, keyed by base class, dimension and fleet
+    RULES_CACHE: Dict[Tuple[Type, int, Tuple[int, ...]], Type] = {}
+    # Ship id index holds ship id + 1 in a byte -> Larger fleets need SparseBoard
+    MAX_SHIP_COUNT = 254
+    # Largest share of cells a custom fleet may cover -> Random placement must still find room for the last ships
+    MAX_FLEET_RATIO = 0.5
+    # Fleet layouts drawn before population gives up -> Placed ships can leave no room for the next one
+    MAX_LAYOUT_COUNT = 100
+    # Placed ships may block any share of the placements of the next one -> Bitboards draw among the free placements
+    MAX_BLOCKED_RATIO = 1.0
+    # Boards populated when custom rules exceed the blocked ratio, each must find a layout, and the largest board sampled
+    FLEET_SAMPLE_COUNT = 8
+    MAX_SAMPLE_SIZE = 32 * 32
+
+    __slots__ = (
+        "ship_mask", "hit_mask", "miss_mask", "finished",
+        "ship_mask_list", "ship_id_index", "ship_remaining_list", "remaining_part_count",
+        "hidden_view", "ship_starts", "rng"
+    )
 
-    def __init__(self) -> None:
-        self.board: List[List[int]] = [[self.EMPTY] * self.BOARD_DIM for _ in range(self.BOARD_DIM)]
-        self.ship_coordinate_list: List[Tuple[int, int]] = []
-        self.ship_hit_list: List[Tuple[int, int]] = []
-        self.ship_miss_list: List[Tuple[int, int]] = []
+    def __init__(self, rng: Optional[Random] = None) -> None:
+        self.rng: Random = rng if rng is not None else self.SYSTEM_RANDOM
+        # Bitboards -> Bit (x * BOARD_DIM + y) represents the cell at (x, y)
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
         self.finished = False
+        # Ship index -> Ship id is the position of the ship in ship_mask_list, ship_id_index holds ship id + 1 per cell
+        self.ship_mask_list: List[int] = []
+        self.ship_id_index = bytearray(self.BOARD_SIZE)
+        self.ship_remaining_list: List[int] = []
+        self.remaining_part_count = 0
+        # Encoded opponent view -> None when a hit changed the board since the last encoding
+        self.hidden_view: Optional[bytes] = None
+        # Encoded ship starts -> None when ships changed since the last encoding
+        self.ship_starts: Optional[bytes] = None
         self.populate()
 
     def __str__(self) -> str:
@@ -46,13 +191,25 @@ class Board:
         board_str += "|\n"
         board_str += return_row_line()
         # Prepare board content along with row index
-        for row_index, rows in enumerate(self.board, start=0):
+        for row_index in range(self.BOARD_DIM):
             board_str += "| {} ".format(row_index)
-            for cell in rows:
-                board_str += "| {} ".format(cell_str_dict.get(cell))
+            for column_index in range(self.BOARD_DIM):
+                board_str += "| {} ".format(cell_str_dict.get(self.get_cell(row_index, column_index)))
             board_str += "|\n"
         return board_str
 
+    @classmethod
+    def with_rules(cls, board_dim: int, ship_size_list: List[int]) -> Type["Board"]:
+        """Return board class playing with given dimension and fleet, each rule set creates its class once"""
+        key = (cls, board_dim, tuple(ship_size_list))
+        board_type = cls.RULES_CACHE.get(key, None)
+        if board_type is None:
+            if len(ship_size_list) > cls.MAX_SHIP_COUNT:
+                raise ValueError("Fleet has too many ships for a dense board!")
+            board_type = create_rules_type(cls, board_dim, ship_size_list)
+            cls.RULES_CACHE[key] = board_type
+        return board_type
+
     @classmethod
     def check_boundaries(cls, x: int, y: int):
         """Check whether given boundaries are valid"""
@@ -61,109 +218,436 @@ class Board:
         if not 0 <= y < cls.BOARD_DIM:
             raise ValueError("Invalid y value for board!")
 
-    def populate(self) -> None:
-        """Randomly populate the board"""
-        up = 0
-        down = 1
-        left = 2
-        right = 3
-        move_list = [up, down, left, right]
-
-        def return_coordinates(x: int, y: int, direction: int, ship_size: int) -> List[Tuple[int, int]]:
-            """Return coordinates of the ship as a list, if the returned list is empty, it means that given coordinates and direction are invalid for a proper ship"""
-            coordinate_list: List[Tuple[int, int]] = []
-            for ship_index in range(ship_size):
-                _x = x
-                _y = y
-                # Decide coordinate with respect to direction
-                if direction == up:
-                    _y += ship_index
-                elif direction == down:
-                    _y -= ship_index
-                elif direction == left:
-                    _x -= ship_index
-                else:
-                    _x += ship_index
-                # Check coordinate for validity -> Cell must be empty and must be inside board boundaries
-                if not 0 <= _x < self.BOARD_DIM or not 0 <= _y < self.BOARD_DIM or self.board[_x][_y] != self.EMPTY:
-                    # Invalid placement -> Start over for this ship
-                    coordinate_list.clear()
-                    break
-                else:
-                    # This ship part is fine, continue to the next part
-                    coordinate_list.append((_x, _y))
+    @classmethod
+    def return_ship_mask(cls, x: int, y: int, direction: int, ship_size: int) -> int:
+        """Return cells of the ship as a mask, if the returned mask is zero, it means that given coordinates and direction fall outside the board"""
+        # Decide coordinates of the last ship part with respect to direction
+        if direction == cls.UP:
+            end_x, end_y, step = x, y + ship_size - 1, 1
+        elif direction == cls.DOWN:
+            end_x, end_y, step = x, y - ship_size + 1, -1
+        elif direction == cls.LEFT:
+            end_x, end_y, step = x - ship_size + 1, y, -cls.BOARD_DIM
+        else:
+            end_x, end_y, step = x + ship_size - 1, y, cls.BOARD_DIM
+        if not 0 <= end_x < cls.BOARD_DIM or not 0 <= end_y < cls.BOARD_DIM:
+            return 0
+        ship_mask = 0
+        index = x * cls.BOARD_DIM + y
+        for _ in range(ship_size):
+            ship_mask |= 1 << index
+            index += step
+        return ship_mask
+
+    @classmethod
+    def return_placement_table(cls, ship_size: int) -> PlacementTable:
+        """Return every placement of given ship size inside the board, computed once per board dimension"""
+        key = (cls.BOARD_DIM, ship_size)
+        placement_table = cls.PLACEMENT_CACHE.get(key, None)
+        if placement_table is None:
+            placement_set = set()
+            for x in range(cls.BOARD_DIM):
+                for y in range(cls.BOARD_DIM):
+                    # Ships going UP and RIGHT cover every placement, DOWN and LEFT only mirror them
+                    for direction in (cls.UP, cls.RIGHT):
+                        ship_mask = cls.return_ship_mask(x, y, direction, ship_size)
+                        if ship_mask != 0:
+                            placement_set.add(ship_mask)
+            placement_table = PlacementTable(sorted(placement_set), cls.BOARD_SIZE)
+            cls.PLACEMENT_CACHE[key] = placement_table
+        return placement_table
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Return cell representation of given x-y coordinates"""
+        cell_mask = 1 << (x * self.BOARD_DIM + y)
+        if self.hit_mask & cell_mask:
+            return self.HIT
+        elif self.miss_mask & cell_mask:
+            return self.MISS
+        elif self.ship_mask & cell_mask:
+            return self.SHIP
+        return self.EMPTY
 
-            return coordinate_list
+    def reset(self) -> None:
+        """Clear every ship and shot on the board"""
+        self.ship_mask = 0
+        self.hit_mask = 0
+        self.miss_mask = 0
+        self.finished = False
+        self.ship_mask_list = []
+        self.ship_id_index = bytearray(self.BOARD_SIZE)
+        self.ship_remaining_list = []
+        self.remaining_part_count = 0
+        self.hidden_view = None
+        self.ship_starts = None
+
+    def record_ship(self, ship_mask: int) -> int:
+        """Record given ship cells with a new ship id and return the id"""
+        ship_id = len(self.ship_mask_list)
+        ship_size = 0
+        for index in iterate_mask(ship_mask):
+            self.ship_id_index[index] = ship_id + 1
+            ship_size += 1
+        self.ship_mask |= ship_mask
+        self.ship_mask_list.append(ship_mask)
+        self.ship_remaining_list.append(ship_size)
+        self.remaining_part_count += ship_size
+        self.ship_starts = None
+        return ship_id
 
-        if len(self.ship_coordinate_list) > 0:
+    def populate(self) -> None:
+        """Randomly populate the board -> Each ship is drawn uniformly from the placements that do not overlap placed ships"""
+        if self.ship_mask != 0:
             return None
+        # Ships placed so far can leave no room for the next one -> Draw the whole layout again
+        for _ in range(self.MAX_LAYOUT_COUNT):
+            if self.populate_layout() is True:
+                return None
+            self.reset()
+        raise ValueError("Fleet does not fit on the board!")
 
+    def populate_layout(self) -> bool:
+        """Draw ships in SHIP_SIZE_LIST order, return False at a ship with no free placement"""
+        # Placements blocked by already placed ships for each ship size
+        blocked_dict = {ship_size: 0 for ship_size in self.SHIP_SIZE_LIST}
         for ship_size in self.SHIP_SIZE_LIST:
-            while True:
-                # Get random coordinates
-                x = randbelow(self.BOARD_DIM)
-                y = randbelow(self.BOARD_DIM)
-                # Get random directions
-                direction = randbelow(len(move_list))
-                coordinate_list = return_coordinates(x, y, direction, ship_size)
-                if len(coordinate_list) == 0:
-                    # Invalid coordinates -> Try again
-                    continue
-                else:
-                    # Every ship part can be properly placed -> Record the cells
-                    for x, y in coordinate_list:
-                        self.board[x][y] = self.SHIP
-                        self.ship_coordinate_list.append((x, y))
-                # This ship is placed -> Move to the next one
-                break
+            placement_table = self.return_placement_table(ship_size)
+            placement_index = placement_table.choose(placement_table.all_mask & ~blocked_dict[ship_size], self.rng.randrange)
+            if placement_index < 0:
+                return False
+            # Every ship part can be properly placed -> Record the cells
+            self.record_ship(placement_table.ship_mask_list[placement_index])
+            cell_tuple = placement_table.cell_list[placement_index]
+            for size in blocked_dict:
+                blocked_dict[size] = self.return_placement_table(size).block(blocked_dict[size], cell_tuple)
+        return True
+
+    @classmethod
+    def validate_fleet(cls, ship_list: List[List[Tuple[int, int]]]) -> List[int]:
+        """Return ship masks of given ship cells ordered as SHIP_SIZE_LIST, raise ValueError if ships do not form the fleet"""
+        if len(ship_list) != len(cls.SHIP_SIZE_LIST):
+            raise ValueError("Fleet must have every ship of SHIP_SIZE_LIST!")
+        mask_set_dict = cls.FLEET_MASK_CACHE.get(cls, None)
+        if mask_set_dict is None:
+            mask_set_dict = {ship_size: cls.return_placement_table(ship_size).ship_mask_set for ship_size in cls.SHIP_SIZE_LIST}
+            cls.FLEET_MASK_CACHE[cls] = mask_set_dict
+        board_dim = cls.BOARD_DIM
+        mask_dict: Dict[int, List[int]] = {ship_size: [] for ship_size in mask_set_dict}
+        occupied_mask = 0
+        for cell_list in ship_list:
+            mask_set = mask_set_dict.get(len(cell_list), None)
+            if mask_set is None:
+                raise ValueError("Fleet must match SHIP_SIZE_LIST!")
+            ship_mask = 0
+            for x, y in cell_list:
+                if not 0 <= x < board_dim or not 0 <= y < board_dim:
+                    cls.check_boundaries(x, y)
+                ship_mask |= 1 << (x * board_dim + y)
+            # Legal placements are exactly the straight, gapless ship masks -> Repeated cells give a smaller mask
+            if ship_mask not in mask_set:
+                raise ValueError("Ship cells must form a straight line!")
+            if ship_mask & occupied_mask:
+                raise ValueError("Ships must not overlap!")
+            occupied_mask |= ship_mask
+            mask_dict[len(cell_list)].append(ship_mask)
+        ordered_mask_list = []
+        for ship_size in cls.SHIP_SIZE_LIST:
+            if len(mask_dict[ship_size]) == 0:
+                raise ValueError("Fleet must match SHIP_SIZE_LIST!")
+            ordered_mask_list.append(mask_dict[ship_size].pop())
+        return ordered_mask_list
+
+    def place(self, ship_mask_list: List[int]) -> None:
+        """Replace the fleet with given ships returned by validate_fleet()"""
+        self.load_ships(ship_mask_list, 0, 0)
+
+    def return_layout(self) -> List[Tuple[int, ...]]:
+        """Return cell indices of each ship ordered by ship id"""
+        return [tuple(iterate_mask(ship_mask)) for ship_mask in self.ship_mask_list]
+
+    @classmethod
+    def from_layout(cls, layout: List[Tuple[int, ...]]) -> "Board":
+        """Return board with given ships returned by return_layout() -> Skips the random population"""
+        ship_mask_list = []
+        for cell_tuple in layout:
+            ship_mask = 0
+            for index in cell_tuple:
+                ship_mask |= 1 << index
+            ship_mask_list.append(ship_mask)
+        board = cls.__new__(cls)
+        board.rng = cls.SYSTEM_RANDOM
+        board.place(ship_mask_list)
+        return board
 
     def serialize(self, hide_ships: bool = False) -> str:
         """Serialize board into string"""
-        serialized_str = ""
-        for x in range(self.BOARD_DIM):
-            for y in range(self.BOARD_DIM):
-                if hide_ships is True and self.board[x][y] == self.SHIP:
-                    serialized_str += str(self.EMPTY)
+        ship_mask = 0 if hide_ships is True else self.ship_mask & ~self.hit_mask
+        cell_list = []
+        for index in range(self.BOARD_SIZE):
+            cell_mask = 1 << index
+            if self.hit_mask & cell_mask:
+                cell_list.append("2")
+            elif self.miss_mask & cell_mask:
+                cell_list.append("3")
+            elif ship_mask & cell_mask:
+                cell_list.append("1")
+            else:
+                cell_list.append("0")
+        return "".join(cell_list)
+
+    def serialize_viewport(self, x: int, y: int, height: int, width: int, hide_ships: bool = False) -> str:
+        """Serialize the window of given height and width starting at x-y coordinates, window is clipped at board edges"""
+        self.check_boundaries(x, y)
+        ship_mask = 0 if hide_ships is True else self.ship_mask & ~self.hit_mask
+        cell_list = []
+        for row_index in range(x, min(x + height, self.BOARD_DIM)):
+            for column_index in range(y, min(y + width, self.BOARD_DIM)):
+                cell_mask = 1 << (row_index * self.BOARD_DIM + column_index)
+                if self.hit_mask & cell_mask:
+                    cell_list.append("2")
+                elif self.miss_mask & cell_mask:
+                    cell_list.append("3")
+                elif ship_mask & cell_mask:
+                    cell_list.append("1")
                 else:
-                    serialized_str += str(self.board[x][y])
-        return serialized_str
+                    cell_list.append("0")
+        return "".join(cell_list)
 
     def deserialize(self, serialized_str: str) -> None:
         """Deserialize board from string into Board object"""
-        for x in range(self.BOARD_DIM):
-            for y in range(self.BOARD_DIM):
-                # Populate board
-                self.board[x][y] = int(serialized_str[x * self.BOARD_DIM + y])
-                # Populate lists
-                if self.board[x][y] == self.SHIP:
-                    self.ship_coordinate_list.append((x, y))
-                elif self.board[x][y] == self.HIT:
-                    self.ship_hit_list.append((x, y))
-                elif self.board[x][y] == self.MISS:
-                    self.ship_miss_list.append((x, y))
-
-    def hit(self, x: int, y: int) -> bool:
-        """Register given x-y coordinates as hit; If cell is empty -> Miss, If cell is not empty -> Hit"""
-        self.check_boundaries(x, y)
-        is_hit = False
-        if self.board[x][y] == self.EMPTY:
-            self.board[x][y] = self.MISS
-            self.ship_miss_list.append((x, y))
-        elif self.board[x][y] == self.SHIP:
-            self.board[x][y] = self.HIT
-            self.ship_hit_list.append((x, y))
-            is_hit = True
-            self.update_game_status()
-        else:
+        if len(serialized_str) != self.BOARD_SIZE:
+            raise ValueError("Invalid serialized board length!")
+        occupied_mask = 0
+        hit_mask = 0
+        miss_mask = 0
+        for index, cell in enumerate(serialized_str):
+            cell_mask = 1 << index
+            cell = int(cell)
+            if cell == self.SHIP:
+                occupied_mask |= cell_mask
+            elif cell == self.HIT:
+                # Hit cells are still part of a ship
+                occupied_mask |= cell_mask
+                hit_mask |= cell_mask
+            elif cell == self.MISS:
+                miss_mask |= cell_mask
+            elif cell != self.EMPTY:
+                raise ValueError("Invalid cell value for board!")
+        # Text cells carry no ship identity -> Load them as a view
+        self.load_view(occupied_mask, hit_mask, miss_mask)
+
+    def encode(self, hide_ships: bool = False) -> bytes:
+        """Encode board with 2 bits per cell -> Low bit plane followed by high bit plane, cell value is low + 2 * high, then ship starts if ships are shown"""
+        if hide_ships is True and self.hidden_view is not None:
+            return self.hidden_view
+        ship_mask = 0 if hide_ships is True else self.ship_mask & ~self.hit_mask
+        byte_count = (self.BOARD_SIZE + 7) // 8
+        # SHIP = 01, HIT = 10, MISS = 11
+        low_plane = (ship_mask | self.miss_mask).to_bytes(byte_count, "little")
+        high_plane = (self.hit_mask | self.miss_mask).to_bytes(byte_count, "little")
+        encoded = low_plane + high_plane
+        if hide_ships is True:
+            self.hidden_view = encoded
+        elif len(self.ship_mask_list) > 0:
+            encoded += self.encode_ship_starts()
+        return encoded
+
+    def encode_ship_starts(self) -> bytes:
+        """Encode each ship in ship id order as 2 * lowest cell index + 1 if the ship goes RIGHT, 0 if it goes UP"""
+        if self.ship_starts is not None:
+            return self.ship_starts
+        start_byte_count = self.return_start_byte_count()
+        start_list = []
+        for ship_mask in self.ship_mask_list:
+            index = (ship_mask & -ship_mask).bit_length() - 1
+            direction_bit = ship_mask >> (index + self.BOARD_DIM) & 1
+            start_list.append((2 * index + direction_bit).to_bytes(start_byte_count, "little"))
+        self.ship_starts = b"".join(start_list)
+        return self.ship_starts
+
+    def encode_base64(self, hide_ships: bool = False) -> str:
+        """Encode board as base64 text so that it can be sent in JSON fields"""
+        return b64encode(self.encode(hide_ships)).decode("ascii")
+
+    @classmethod
+    def return_start_byte_count(cls) -> int:
+        """Return bytes of each encoded ship start, large enough for every cell index and direction bit"""
+        return ((2 * cls.BOARD_SIZE - 1).bit_length() + 7) // 8
+
+    @classmethod
+    def decode_masks(cls, encoded: bytes) -> Tuple[int, int, int]:
+        """Decode encoded board into visible ship, hit and miss masks without validating the fleet"""
+        byte_count = (cls.BOARD_SIZE + 7) // 8
+        if len(encoded) not in (2 * byte_count, 2 * byte_count + len(cls.SHIP_SIZE_LIST) * cls.return_start_byte_count()):
+            raise ValueError("Invalid encoded board length!")
+        low_plane = int.from_bytes(encoded[:byte_count], "little")
+        high_plane = int.from_bytes(encoded[byte_count:2 * byte_count], "little")
+        if (low_plane | high_plane) >> cls.BOARD_SIZE:
+            raise ValueError("Encoded board has cells outside of the board!")
+        return low_plane & ~high_plane, high_plane & ~low_plane, low_plane & high_plane
+
+    @classmethod
+    def decode_ship_starts(cls, encoded: bytes) -> List[int]:
+        """Decode ship starts encoded by encode_ship_starts() into ship masks ordered as SHIP_SIZE_LIST"""
+        start_byte_count = cls.return_start_byte_count()
+        ship_mask_list = []
+        occupied_mask = 0
+        for ship_id, ship_size in enumerate(cls.SHIP_SIZE_LIST):
+            start = int.from_bytes(encoded[ship_id * start_byte_count:(ship_id + 1) * start_byte_count], "little")
+            index, direction_bit = divmod(start, 2)
+            ship_mask = 0
+            if index < cls.BOARD_SIZE:
+                x, y = divmod(index, cls.BOARD_DIM)
+                ship_mask = cls.return_ship_mask(x, y, cls.RIGHT if direction_bit == 1 else cls.UP, ship_size)
+            if ship_mask == 0 or ship_mask & occupied_mask:
+                raise ValueError("Encoded ships must be on the board without overlapping!")
+            occupied_mask |= ship_mask
+            ship_mask_list.append(ship_mask)
+        return ship_mask_list
+
+    def decode(self, encoded: bytes) -> None:
+        """Decode board encoded by encode() into Board object, boards without ship starts are loaded as views"""
+        ship_mask, hit_mask, miss_mask = self.decode_masks(encoded)
+        ship_start_encoded = encoded[2 * ((self.BOARD_SIZE + 7) // 8):]
+        if len(ship_start_encoded) == 0:
+            self.load_view(ship_mask | hit_mask, hit_mask, miss_mask)
+            return
+        ship_mask_list = self.decode_ship_starts(ship_start_encoded)
+        # Decoded ships never overlap -> Sum of the ship masks is their union
+        if sum(ship_mask_list) != ship_mask | hit_mask:
+            raise ValueError("Encoded ships do not match the ship cells!")
+        self.load_ships(ship_mask_list, hit_mask, miss_mask)
+
+    def decode_base64(self, encoded_str: str) -> None:
+        """Decode board encoded by encode_base64() into Board object"""
+        self.decode(b64decode(encoded_str, validate=True))
+
+    def load_view(self, occupied_mask: int, hit_mask: int, miss_mask: int) -> None:
+        """Replace board state with given masks without ship ids -> Views do not tell ships apart, hits on them never sink"""
+        if hit_mask & ~occupied_mask or miss_mask & occupied_mask:
+            raise ValueError("Hit cells must be ships and miss cells must be empty!")
+        self.reset()
+        self.ship_mask = occupied_mask
+        self.hit_mask = hit_mask
+        self.miss_mask = miss_mask
+        self.remaining_part_count = bin(occupied_mask & ~hit_mask).count("1")
+        self.update_game_status()
+
+    def load_ships(self, ship_mask_list: List[int], hit_mask: int, miss_mask: int) -> None:
+        """Replace board state with given ships, ship ids follow the order of given list"""
+        occupied_mask = 0
+        for ship_mask in ship_mask_list:
+            occupied_mask |= ship_mask
+        if hit_mask & ~occupied_mask or miss_mask & occupied_mask:
+            raise ValueError("Hit cells must be ships and miss cells must be empty!")
+        self.reset()
+        for ship_mask in ship_mask_list:
+            self.record_ship(ship_mask)
+        self.hit_mask = hit_mask
+        self.miss_mask = miss_mask
+        for index in iterate_mask(hit_mask):
+            self.ship_remaining_list[self.ship_id_index[index] - 1] -= 1
+            self.remaining_part_count -= 1
+        self.update_game_status()
+
+    def hit(self, x: int, y: int) -> HitResult:
+        """Register given x-y coordinates as hit; If cell is empty -> Miss, If cell is not empty -> Hit, Sunk or Finished"""
+        if not 0 <= x < self.BOARD_DIM or not 0 <= y < self.BOARD_DIM:
+            # Raise the detailed error only for invalid coordinates
+            self.check_boundaries(x, y)
+        index = x * self.BOARD_DIM + y
+        cell_mask = 1 << index
+        if (self.hit_mask | self.miss_mask) & cell_mask:
             raise ValueError("Only EMPTY or SHIP values can be hit!")
-        return is_hit
+        self.hidden_view = None
+        ship_id = self.ship_id_index[index] - 1
+        if ship_id < 0:
+            if self.ship_mask & cell_mask:
+                return self.hit_view(cell_mask)
+            self.miss_mask |= cell_mask
+            return self.RESULT_MISS
+        self.hit_mask |= cell_mask
+        self.ship_remaining_list[ship_id] -= 1
+        self.remaining_part_count -= 1
+        if self.ship_remaining_list[ship_id] > 0:
+            return self.RESULT_HIT
+        if self.remaining_part_count > 0:
+            return self.RESULT_SUNK
+        self.finished = True
+        return self.RESULT_FINISHED
+
+    def hit_view(self, cell_mask: int) -> HitResult:
+        """Register hit on a ship cell of a view, the view finishes once every ship part of the fleet is hit"""
+        self.hit_mask |= cell_mask
+        self.remaining_part_count -= 1
+        self.update_game_status()
+        return self.RESULT_FINISHED if self.finished is True else self.RESULT_HIT
+
+    def hit_many(self, coordinate_list: List[Tuple[int, int]]) -> List[HitResult]:
+        """Register a volley of shots in one pass and return the result of each shot, nothing is registered if any shot is invalid"""
+        volley_mask = 0
+        index_list = []
+        for x, y in coordinate_list:
+            if not 0 <= x < self.BOARD_DIM or not 0 <= y < self.BOARD_DIM:
+                self.check_boundaries(x, y)
+            index = x * self.BOARD_DIM + y
+            cell_mask = 1 << index
+            if volley_mask & cell_mask:
+                raise ValueError("Same cell cannot be hit twice in a volley!")
+            volley_mask |= cell_mask
+            index_list.append(index)
+        if (self.hit_mask | self.miss_mask) & volley_mask:
+            raise ValueError("Only EMPTY or SHIP values can be hit!")
+        # Every shot is valid -> Apply them
+        self.hidden_view = None
+        result_list = []
+        for index in index_list:
+            ship_id = self.ship_id_index[index] - 1
+            if ship_id < 0:
+                if self.ship_mask >> index & 1:
+                    # Ship cell of a view -> Hit without a ship to sink
+                    self.remaining_part_count -= 1
+                    is_finished = self.remaining_part_count == 0 and bin(self.ship_mask).count("1") == self.SHIP_PART_COUNT
+                    result_list.append(self.RESULT_FINISHED if is_finished else self.RESULT_HIT)
+                else:
+                    result_list.append(self.RESULT_MISS)
+                continue
+            self.ship_remaining_list[ship_id] -= 1
+            self.remaining_part_count -= 1
+            if self.ship_remaining_list[ship_id] > 0:
+                result_list.append(self.RESULT_HIT)
+            elif self.remaining_part_count > 0:
+                result_list.append(self.RESULT_SUNK)
+            else:
+                result_list.append(self.RESULT_FINISHED)
+        self.hit_mask |= volley_mask & self.ship_mask
+        self.miss_mask |= volley_mask & ~self.ship_mask
+        self.update_game_status()
+        return result_list
+
+    def get_surviving_ship_count(self) -> int:
+        """Return count of ships that are not sunk"""
+        return sum(1 for remaining_count in self.ship_remaining_list if remaining_count > 0)
+
+    def get_unshot_cell_count(self) -> int:
+        """Return count of cells that can still be hit"""
+        return self.BOARD_SIZE - bin(self.hit_mask | self.miss_mask).count("1")
+
+    def get_ship_id(self, x: int, y: int) -> Optional[int]:
+        """Return id of the ship on given x-y coordinates, None if the cell is empty"""
+        ship_id = self.ship_id_index[x * self.BOARD_DIM + y] - 1
+        return None if ship_id < 0 else ship_id
+
+    def get_ship_size(self, x: int, y: int) -> int:
+        """Return size of the ship on given x-y coordinates, 0 if the cell is empty"""
+        ship_id = self.get_ship_id(x, y)
+        if ship_id is None:
+            return 0
+        return bin(self.ship_mask_list[ship_id]).count("1")
 
     def update_game_status(self) -> None:
         """Check game status and update finished variable"""
-        sunk_ship_part_count = 0
-        for x, y in self.ship_coordinate_list:
-            if self.board[x][y] != self.HIT:
-                break
-            else:
-                sunk_ship_part_count += 1
-        self.finished = sunk_ship_part_count == self.SHIP_PART_COUNT
+        # Views have no ship ids -> They finish only if they show the whole fleet
+        self.finished = self.remaining_part_count == 0 and (
+            len(self.ship_mask_list) > 0 or bin(self.ship_mask).count("1") == self.SHIP_PART_COUNT
+        )
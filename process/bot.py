@@ -0,0 +1,202 @@
+from collections import Counter
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Type
+
+from process.board import Board, HitResult, iterate_mask
+
+
+class RandomStrategy:
+    """Bot shooting a random unshot cell every turn"""
+
+    def __init__(self, rng: Optional[Random] = None) -> None:
+        self.rng: Random = rng if rng is not None else Board.SYSTEM_RANDOM
+        # Unshot cells -> Shot cells are swapped to the end and dropped
+        self.unshot_list = list(range(Board.BOARD_SIZE))
+
+    def record(self, x: int, y: int, result: HitResult, sunk_size: Optional[int] = None) -> None:
+        """Random bot does not learn from results"""
+        return None
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x-y coordinates of the next shot"""
+        position = self.rng.randrange(len(self.unshot_list))
+        self.unshot_list[position], self.unshot_list[-1] = self.unshot_list[-1], self.unshot_list[position]
+        return divmod(self.unshot_list.pop(), Board.BOARD_DIM)
+
+
+class HuntTargetStrategy:
+    """Bot hunting on a checkerboard pattern and targeting neighbours of hits until the ship is sunk"""
+
+    def __init__(self, rng: Optional[Random] = None) -> None:
+        self.rng: Random = rng if rng is not None else Board.SYSTEM_RANDOM
+        self.shot_mask = 0
+        self.target_list: List[int] = []
+
+    def record(self, x: int, y: int, result: HitResult, sunk_size: Optional[int] = None) -> None:
+        """Queue neighbours of a hit, a sunk ship ends the target mode"""
+        self.shot_mask |= 1 << (x * Board.BOARD_DIM + y)
+        if result == HitResult.MISS:
+            return None
+        if result >= HitResult.SUNK:
+            self.target_list.clear()
+            return None
+        for next_x, next_y in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= next_x < Board.BOARD_DIM and 0 <= next_y < Board.BOARD_DIM:
+                self.target_list.append(next_x * Board.BOARD_DIM + next_y)
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x-y coordinates of the next shot"""
+        while len(self.target_list) > 0:
+            index = self.target_list.pop()
+            if not self.shot_mask >> index & 1:
+                return divmod(index, Board.BOARD_DIM)
+        unshot_list = [index for index in range(Board.BOARD_SIZE) if not self.shot_mask >> index & 1]
+        # Smallest ship covers at least one cell of the checkerboard
+        parity_list = [index for index in unshot_list if sum(divmod(index, Board.BOARD_DIM)) % 2 == 0]
+        candidate_list = parity_list if len(parity_list) > 0 else unshot_list
+        return divmod(candidate_list[self.rng.randrange(len(candidate_list))], Board.BOARD_DIM)
+
+
+class ProbabilityDensityStrategy:
+    """Hunt/target bot scoring every cell by the legal remaining ship placements covering it"""
+
+    def __init__(self, rng: Optional[Random] = None, move_budget: float = 0.005) -> None:
+        """
+        rng: Random provider for breaking ties between equally scored cells
+        move_budget: Seconds a move may take -> Recording the last result and hunt scoring run in full and are charged
+            against it, target scoring gets what is left and falls back to hunt scores when it runs out
+        """
+        self.rng: Random = rng if rng is not None else Board.SYSTEM_RANDOM
+        self.move_budget = move_budget
+        # Moves that took longer than the budget and seconds spent by the last record()
+        self.budget_exceeded_count = 0
+        self.record_seconds = 0.0
+        self.table_dict = {ship_size: Board.return_placement_table(ship_size) for ship_size in set(Board.SHIP_SIZE_LIST)}
+        # Remaining ships and their placements that are consistent with the shots so far
+        self.ship_count_dict: Dict[int, int] = Counter(Board.SHIP_SIZE_LIST)
+        self.available_dict: Dict[int, int] = {ship_size: table.all_mask for ship_size, table in self.table_dict.items()}
+        # Hunt scores -> Count of available placements of remaining ships covering each cell
+        self.density: List[int] = [0] * Board.BOARD_SIZE
+        for ship_size, table in self.table_dict.items():
+            for cell_tuple in table.cell_list:
+                for index in cell_tuple:
+                    self.density[index] += self.ship_count_dict[ship_size]
+        self.shot_mask = 0
+        # Hits on ships that are not sunk yet
+        self.unresolved_mask = 0
+
+    def block(self, cell_mask: int) -> None:
+        """Remove placements covering given cells and their density"""
+        for ship_size, table in self.table_dict.items():
+            blocked_mask = 0
+            for index in iterate_mask(cell_mask):
+                blocked_mask |= table.cover_list[index]
+            blocked_mask &= self.available_dict[ship_size]
+            if blocked_mask == 0:
+                continue
+            self.available_dict[ship_size] ^= blocked_mask
+            ship_count = self.ship_count_dict[ship_size]
+            if ship_count == 0:
+                continue
+            for placement_index in iterate_mask(blocked_mask):
+                for index in table.cell_list[placement_index]:
+                    self.density[index] -= ship_count
+
+    def find_sunk_ship(self, index: int, ship_size: int) -> Optional[int]:
+        """Return cells of the sunk ship -> The only placement through given cell made of unresolved hits, None if it is ambiguous"""
+        table = self.table_dict[ship_size]
+        sunk_mask = None
+        for placement_index in iterate_mask(table.cover_list[index] & self.available_dict[ship_size]):
+            ship_mask = table.ship_mask_list[placement_index]
+            if ship_mask & self.unresolved_mask == ship_mask:
+                if sunk_mask is not None:
+                    return None
+                sunk_mask = ship_mask
+        return sunk_mask
+
+    def record(self, x: int, y: int, result: HitResult, sunk_size: Optional[int] = None) -> None:
+        """Update placements and scores with the result of a shot, sunk_size is the size of the ship sunk by the shot"""
+        start = perf_counter()
+        self.update(x, y, result, sunk_size)
+        self.record_seconds = perf_counter() - start
+
+    def update(self, x: int, y: int, result: HitResult, sunk_size: Optional[int] = None) -> None:
+        """Apply the result of a shot -> Stopping halfway would leave placements and scores inconsistent"""
+        index = x * Board.BOARD_DIM + y
+        cell_mask = 1 << index
+        self.shot_mask |= cell_mask
+        if result == HitResult.MISS:
+            self.block(cell_mask)
+            return None
+        self.unresolved_mask |= cell_mask
+        if result < HitResult.SUNK or sunk_size is None or self.ship_count_dict.get(sunk_size, 0) == 0:
+            return None
+        # Sunk ship cells cannot be a part of another ship -> Ambiguous cells stay unresolved instead of blocking a wrong ship
+        ship_mask = self.find_sunk_ship(index, sunk_size)
+        if ship_mask is not None:
+            self.unresolved_mask &= ~ship_mask
+            self.block(ship_mask)
+        # One ship less of this size -> Its remaining placements weigh one less
+        self.ship_count_dict[sunk_size] -= 1
+        table = self.table_dict[sunk_size]
+        for placement_index in iterate_mask(self.available_dict[sunk_size]):
+            for cell_index in table.cell_list[placement_index]:
+                self.density[cell_index] -= 1
+
+    def choose_best(self, score_list: List[int]) -> Optional[int]:
+        """Return a random cell among the unshot cells with the highest positive score"""
+        best_score = 0
+        best_list: List[int] = []
+        shot_mask = self.shot_mask
+        for index, score in enumerate(score_list):
+            if score < best_score or score == 0 or shot_mask >> index & 1:
+                continue
+            if score > best_score:
+                best_score = score
+                best_list = [index]
+            else:
+                best_list.append(index)
+        if len(best_list) == 0:
+            return None
+        return best_list[self.rng.randrange(len(best_list))]
+
+    def target(self, deadline: float) -> Optional[int]:
+        """Score cells by placements covering unresolved hits, placements covering more hits weigh more"""
+        score_list = [0] * Board.BOARD_SIZE
+        for hit_index in iterate_mask(self.unresolved_mask):
+            if perf_counter() > deadline:
+                break
+            for ship_size, table in self.table_dict.items():
+                ship_count = self.ship_count_dict[ship_size]
+                if ship_count == 0:
+                    continue
+                for placement_index in iterate_mask(table.cover_list[hit_index] & self.available_dict[ship_size]):
+                    weight = ship_count * bin(table.ship_mask_list[placement_index] & self.unresolved_mask).count("1")
+                    for index in table.cell_list[placement_index]:
+                        score_list[index] += weight
+        return self.choose_best(score_list)
+
+    def choose(self) -> Tuple[int, int]:
+        """Return x-y coordinates of the next shot, the move budget covers the last record() too"""
+        deadline = perf_counter() + self.move_budget - self.record_seconds
+        self.record_seconds = 0.0
+        index = None
+        if self.unresolved_mask != 0 and perf_counter() <= deadline:
+            index = self.target(deadline)
+        if index is None:
+            index = self.choose_best(self.density)
+        if index is None:
+            # No consistent placement is left -> Any unshot cell
+            unshot_list = [cell_index for cell_index in range(Board.BOARD_SIZE) if not self.shot_mask >> cell_index & 1]
+            index = unshot_list[self.rng.randrange(len(unshot_list))]
+        if perf_counter() > deadline:
+            self.budget_exceeded_count += 1
+        return divmod(index, Board.BOARD_DIM)
+
+
+STRATEGY_DICT: Dict[str, Type] = {
+    "random": RandomStrategy,
+    "hunt_target": HuntTargetStrategy,
+    "density": ProbabilityDensityStrategy,
+}
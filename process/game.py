@@ -1,22 +1,595 @@
-from typing import Dict, Optional
+import asyncio
+from collections import OrderedDict, deque
+from random import Random, SystemRandom
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Type, Union
+
+from core.settings import settings
 
 from process.board import Board
+from process.bot import ProbabilityDensityStrategy
+from process.journal import GameJournal, RecordType
+from process.sparse import SparseBoard
+
+
+class BoardPool:
+    """Bounded stock of populated boards -> Game start pops a board, a background thread refills the stock"""
+
+    def __init__(self, size: int, refill: int) -> None:
+        self.size = size
+        self.refill = refill
+        self.board_deque: Deque[Board] = deque()
+        self.hit_count = 0
+        self.miss_count = 0
+        self.refill_event = Event()
+        self.thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        """Start background refill thread and fill the pool"""
+        if self.thread is not None:
+            return None
+        self.thread = Thread(target=self.run, name="board-pool", daemon=True)
+        self.thread.start()
+        self.refill_event.set()
+
+    def run(self) -> None:
+        """Wait for refill requests and populate boards until the pool is full"""
+        while True:
+            self.refill_event.wait()
+            self.refill_event.clear()
+            while len(self.board_deque) < self.size:
+                self.board_deque.append(Board())
+
+    def pop(self) -> Board:
+        """Return a ready board, populate one inline if the pool is empty"""
+        try:
+            board = self.board_deque.popleft()
+            self.hit_count += 1
+        except IndexError:
+            board = Board()
+            self.miss_count += 1
+        if len(self.board_deque) < self.refill:
+            self.refill_event.set()
+        return board
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool counters"""
+        return {
+            "size": self.size,
+            "stock": len(self.board_deque),
+            "hit": self.hit_count,
+            "miss": self.miss_count,
+        }
+
+
+class GameState:
+    """Changing columns of a game row kept in memory -> Game logic uses them, GameStateWriter writes them behind"""
+    # Columns written to the games table, user ids are written by the game API
+    COLUMN_TUPLE = ("creator_user_ready", "second_user_ready", "turn", "move_number", "finished", "seed")
+
+    __slots__ = ("game_id", "creator_user_id", "second_user_id", "bot") + COLUMN_TUPLE
+
+    def __init__(self, game_id: int, creator_user_id: int, second_user_id: Optional[int], bot: bool) -> None:
+        self.game_id = game_id
+        self.creator_user_id = creator_user_id
+        self.second_user_id = second_user_id
+        self.bot = bot
+        self.creator_user_ready = False
+        self.second_user_ready = bot
+        self.turn: Optional[int] = None
+        self.move_number = 0
+        self.finished = False
+        self.seed: Optional[int] = None
+
+    @classmethod
+    def from_game(cls, game) -> "GameState":
+        """Return state with the columns of given game row"""
+        state = cls(game.id, game.creator_user_id, game.second_user_id, game.bot is True)
+        for column in cls.COLUMN_TUPLE:
+            setattr(state, column, getattr(game, column))
+        state.move_number = state.move_number or 0
+        return state
+
+    def get_other_user_id(self, user_id: int) -> Optional[int]:
+        """Return the other user id in the game, bot plays with negative game id as its user id"""
+        if user_id == self.creator_user_id:
+            return -self.game_id if self.bot is True else self.second_user_id
+        if user_id == self.second_user_id:
+            return self.creator_user_id
+        return None
+
+    def is_started(self) -> bool:
+        """Return whether both users are ready"""
+        return self.creator_user_ready is True and self.second_user_ready is True
+
+    def return_mapping(self) -> Dict:
+        """Return columns to write keyed by column name along with the game id"""
+        mapping = {column: getattr(self, column) for column in self.COLUMN_TUPLE}
+        mapping["id"] = self.game_id
+        return mapping
+
+
+class GameStateWriter:
+    """Write-behind of game states -> States changed within an interval are written in one batch"""
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.write_func: Optional[Callable[[List[Dict]], None]] = None
+        self.dirty_dict: Dict[int, GameState] = {}
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+        self.mark_count = 0
+        self.flush_count = 0
+        self.row_count = 0
+        self.error_count = 0
+
+    def start(self, write_func: Callable[[List[Dict]], None]) -> None:
+        """Start background flush thread, write_func writes a batch of row mappings to the DB"""
+        if self.thread is not None:
+            return None
+        self.write_func = write_func
+        self.thread = Thread(target=self.run, name="game-state-writer", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Flush dirty states every interval until stopped"""
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop background thread and flush remaining states"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def mark(self, state: GameState) -> None:
+        """Queue given state to be written with the next flush"""
+        with self.lock:
+            self.dirty_dict[state.game_id] = state
+            self.mark_count += 1
+
+    def get_pending(self, game_id: int) -> Optional[GameState]:
+        """Return state of given game id waiting to be written"""
+        with self.lock:
+            return self.dirty_dict.get(game_id, None)
+
+    def flush(self) -> int:
+        """Write every dirty state in one batch and return written row count"""
+        with self.lock:
+            state_list = list(self.dirty_dict.values())
+            self.dirty_dict.clear()
+            mapping_list = [state.return_mapping() for state in state_list]
+        if len(mapping_list) == 0 or self.write_func is None:
+            return 0
+        try:
+            self.write_func(mapping_list)
+        except Exception:
+            # Keep failed states for the next flush unless they changed again meanwhile
+            with self.lock:
+                for state in state_list:
+                    self.dirty_dict.setdefault(state.game_id, state)
+                self.error_count += 1
+            return 0
+        self.flush_count += 1
+        self.row_count += len(mapping_list)
+        return len(mapping_list)
+
+    def stats(self) -> Dict[str, int]:
+        """Return writer counters"""
+        return {
+            "dirty": len(self.dirty_dict),
+            "marks": self.mark_count,
+            "flushes": self.flush_count,
+            "rows": self.row_count,
+            "errors": self.error_count,
+        }
+
+
+class ReplayBuffer:
+    """Recent frames sent to one user of a game -> A reconnecting client gets only the frames it missed"""
+
+    __slots__ = ("frame_deque", "dropped_seq")
+
+    def __init__(self, size: int) -> None:
+        self.frame_deque: Deque[Tuple[int, Dict]] = deque(maxlen=size)
+        # Sequence number of the newest frame that fell out of the buffer
+        self.dropped_seq = 0
+
+    def append(self, seq: int, frame: Dict) -> None:
+        """Keep given frame, the oldest frame is dropped when the buffer is full"""
+        if len(self.frame_deque) == self.frame_deque.maxlen:
+            self.dropped_seq = self.frame_deque[0][0]
+        self.frame_deque.append((seq, frame))
+
+    def return_frames(self, last_seq: int) -> Optional[List[Tuple[int, Dict]]]:
+        """Return sequence numbers and frames sent after given sequence number, None if some of them are no longer buffered"""
+        if last_seq < self.dropped_seq:
+            return None
+        return [(seq, frame) for seq, frame in self.frame_deque if seq > last_seq]
+
+
+class GameSession:
+    """Live state of one game -> Boards, bot and turn state of both users"""
+    # Frames kept per user for RESUME
+    REPLAY_SIZE = settings.replay_buffer_size
+
+    __slots__ = ("game_id", "user_id_tuple", "board_dict", "bot", "state", "last_active", "sequence", "replay_dict")
+
+    def __init__(
+        self,
+        game_id: int,
+        creator_user_id: int,
+        second_user_id: int,
+        creator_board: Union[Board, SparseBoard],
+        second_board: Union[Board, SparseBoard],
+        bot: Optional[ProbabilityDensityStrategy] = None,
+        state: Optional[GameState] = None
+    ) -> None:
+        """
+        bot: Strategy playing as second user, None when both users are real
+        state: Turn state shared with the game state registry
+        """
+        self.game_id = game_id
+        self.user_id_tuple = (creator_user_id, second_user_id)
+        self.board_dict: Dict[int, Union[Board, SparseBoard]] = {creator_user_id: creator_board, second_user_id: second_board}
+        self.bot = bot
+        self.state = state if state is not None else GameState(game_id, creator_user_id, second_user_id, bot is not None)
+        self.last_active = 0.0
+        # Sequence number of the last frame sent in the game
+        self.sequence = 0
+        self.replay_dict: Dict[int, ReplayBuffer] = {
+            user_id: ReplayBuffer(self.REPLAY_SIZE) for user_id in self.user_id_tuple if not self.is_bot(user_id)
+        }
+
+    def get_other_user_id(self, user_id: int) -> int:
+        """Return the other user id in the game"""
+        creator_user_id, second_user_id = self.user_id_tuple
+        return second_user_id if user_id == creator_user_id else creator_user_id
+
+    def get_board(self, user_id: int) -> Union[Board, SparseBoard]:
+        """Return board of given user id"""
+        return self.board_dict[user_id]
+
+    def is_bot(self, user_id: int) -> bool:
+        """Return whether given user id is played by the bot"""
+        return self.bot is not None and user_id == self.user_id_tuple[1]
+
+    def next_sequence(self) -> int:
+        """Return sequence number of the next game frame"""
+        self.sequence += 1
+        return self.sequence
+
+    def record_frame(self, user_id: int, frame: Dict) -> None:
+        """Keep given frame with the current sequence number for RESUME of the user -> Encoded on replay with the codec of the new connection"""
+        self.replay_dict[user_id].append(self.sequence, frame)
 
 
 class GameManager:
-    ACTIVE_GAMES: Dict[int, Board] = {}
+    # Live games by game id, ordered by last activity, and the game of each user id
+    SESSIONS: Dict[int, GameSession] = OrderedDict()
+    USER_SESSIONS: Dict[int, GameSession] = {}
+    # Idle seconds before a session is evicted
+    SESSION_TTL = settings.session_ttl_s
+    # Seconds between sweeps of idle sessions -> Eviction does not wait for a new game
+    SWEEP_INTERVAL = settings.session_sweep_interval_s
+    SWEEP_TASK: Optional[asyncio.Task] = None
+    SESSION_COUNTER = {"created": 0, "finished": 0, "expired": 0, "peak": 0}
+    # Finished games by game id, ordered by finish time, and the finished game of each user id -> Kept for RESUME
+    FINISHED_SESSIONS: Dict[int, GameSession] = OrderedDict()
+    FINISHED_USER_SESSIONS: Dict[int, GameSession] = {}
+    FINISHED_TTL = settings.finished_resume_s
+    # Game states of connected games by game id, written to the DB behind game logic
+    GAME_STATES: Dict[int, GameState] = {}
+    STATE_WRITER = GameStateWriter(settings.state_flush_interval_ms / 1000)
+    # Fleets placed by users before the game starts -> Output of validate_fleet() of the game board class
+    PLACED_FLEETS: Dict[int, List] = {}
+    BOARD_POOL = BoardPool(settings.board_pool_size, settings.board_pool_refill)
+    # Events of started games -> Unfinished games are rebuilt from it on startup
+    JOURNAL = GameJournal(settings.journal_path, settings.journal_sync_interval_ms / 1000, int(settings.journal_compact_mb * 1024 * 1024))
+    # Seeded mode -> Boards of each game are rebuilt from a recorded seed drawn from the master seed
+    SEEDED = settings.game_random == "seeded"
+    SEED_RANDOM = Random(settings.game_seed) if settings.game_seed is not None else SystemRandom()
+    SEED_BITS = 63
+    # Largest dimension played on bitboards -> Placement tables and board-wide masks grow with the area beyond it
+    DENSE_DIM_LIMIT = 32
+
+    @classmethod
+    def new_board(cls) -> Board:
+        """Return a populated board from board pool"""
+        return cls.BOARD_POOL.pop()
+
+    @classmethod
+    def new_seed(cls) -> Optional[int]:
+        """Return board seed for a new game, None when boards are drawn from system random"""
+        if cls.SEEDED is False:
+            return None
+        return cls.SEED_RANDOM.getrandbits(cls.SEED_BITS)
+
+    @classmethod
+    def return_board_type(cls, board_dim: Optional[int], ship_size_list: Optional[List[int]]) -> Type:
+        """Return board class of a game -> Standard rules use Board, large boards store only ships and shots"""
+        board_dim = board_dim if board_dim is not None else Board.BOARD_DIM
+        ship_size_list = ship_size_list if ship_size_list is not None else Board.SHIP_SIZE_LIST
+        if board_dim == Board.BOARD_DIM and ship_size_list == Board.SHIP_SIZE_LIST:
+            return Board
+        if board_dim <= cls.DENSE_DIM_LIMIT and len(ship_size_list) <= Board.MAX_SHIP_COUNT:
+            return Board.with_rules(board_dim, ship_size_list)
+        return SparseBoard.with_rules(board_dim, ship_size_list)
+
+    @staticmethod
+    def create_boards(seed: int, board_type: Type = Board) -> Tuple[Board, Board]:
+        """Create boards of both users from given seed -> Same seed always gives the same boards"""
+        rng = Random(seed)
+        return board_type(rng), board_type(rng)
+
+    @classmethod
+    def new_boards(cls, seed: Optional[int], board_type: Type = Board) -> Tuple[Board, Board]:
+        """Return boards of both users for a new game, only standard boards come from board pool"""
+        if seed is not None:
+            return cls.create_boards(seed, board_type)
+        if board_type is Board:
+            return cls.new_board(), cls.new_board()
+        return board_type(), board_type()
+
+    @staticmethod
+    def new_bot(seed: Optional[int]) -> ProbabilityDensityStrategy:
+        """Return bot for a new game, seeded games also get reproducible bot moves"""
+        rng = Random(seed) if seed is not None else None
+        return ProbabilityDensityStrategy(rng, settings.bot_move_budget_ms / 1000)
+
+    @classmethod
+    def add_fleet(cls, user_id: int, ship_list: List) -> None:
+        """Keep validated fleet of given user id until the game starts"""
+        cls.PLACED_FLEETS[user_id] = ship_list
+
+    @classmethod
+    def pop_fleet(cls, user_id: int) -> Optional[List]:
+        """Remove and return placed fleet of given user id, None if the user did not place one"""
+        return cls.PLACED_FLEETS.pop(user_id, None)
+
+    @classmethod
+    def load_state(cls, game) -> GameState:
+        """Return in-memory state of given game row, the row is read only when the game has no state yet"""
+        state = cls.GAME_STATES.get(game.id, None)
+        if state is None:
+            state = cls.STATE_WRITER.get_pending(game.id)
+            if state is None:
+                state = GameState.from_game(game)
+            cls.GAME_STATES[game.id] = state
+        if state.second_user_id is None:
+            # Second user joins through the game API
+            state.second_user_id = game.second_user_id
+        return state
+
+    @classmethod
+    def is_finished(cls, game) -> bool:
+        """Return whether given game row is finished -> Its in-memory state may be ahead of the row until the state writer flushes it"""
+        state = cls.GAME_STATES.get(game.id, None) or cls.STATE_WRITER.get_pending(game.id)
+        if state is None and game.id in cls.FINISHED_SESSIONS:
+            state = cls.FINISHED_SESSIONS[game.id].state
+        return (state.finished if state is not None else game.finished) is True
+
+    @classmethod
+    def release_state(cls, state: GameState) -> None:
+        """Forget state and placed fleets of a game that did not start -> Called when its last websocket closes, the row is read again on the next login"""
+        if state.game_id in cls.SESSIONS:
+            return None
+        if cls.GAME_STATES.get(state.game_id, None) is state:
+            # Pending changes are still written by the state writer
+            del cls.GAME_STATES[state.game_id]
+        for user_id in (state.creator_user_id, state.second_user_id):
+            if user_id is not None:
+                cls.PLACED_FLEETS.pop(user_id, None)
+
+    @classmethod
+    def mark_state(cls, state: GameState) -> None:
+        """Queue given state to be written to the DB"""
+        cls.STATE_WRITER.mark(state)
+
+    @classmethod
+    def add_session(cls, session: GameSession, now: Optional[float] = None) -> None:
+        """Add given game session and index it by both user ids, expired sessions are evicted first"""
+        now = now if now is not None else monotonic()
+        cls.evict_expired(now)
+        cls.remove_session(session.game_id)
+        session.last_active = now
+        cls.SESSIONS[session.game_id] = session
+        for user_id in session.user_id_tuple:
+            cls.USER_SESSIONS[user_id] = session
+            cls.FINISHED_USER_SESSIONS.pop(user_id, None)
+        cls.SESSION_COUNTER["created"] += 1
+        cls.SESSION_COUNTER["peak"] = max(cls.SESSION_COUNTER["peak"], len(cls.SESSIONS))
+
+    @classmethod
+    def get_session(cls, game_id: int) -> Optional[GameSession]:
+        """Return game session of given game id"""
+        return cls.SESSIONS.get(game_id, None)
+
+    @classmethod
+    def get_user_session(cls, user_id: int) -> Optional[GameSession]:
+        """Return game session that given user id plays in"""
+        return cls.USER_SESSIONS.get(user_id, None)
+
+    @classmethod
+    def touch_session(cls, session: GameSession, now: Optional[float] = None) -> None:
+        """Mark given session as active -> Sessions are kept ordered by last activity"""
+        session.last_active = now if now is not None else monotonic()
+        cls.SESSIONS.move_to_end(session.game_id)
 
     @classmethod
-    def add_board(cls, user_id: int, board: Board) -> None:
-        """Add given websocket to connection dict"""
-        cls.ACTIVE_GAMES[user_id] = board
+    def remove_session(cls, game_id: int) -> Optional[GameSession]:
+        """Remove game session of given game id and its user index entries"""
+        session = cls.SESSIONS.pop(game_id, None)
+        if session is None:
+            return None
+        for user_id in session.user_id_tuple:
+            if cls.USER_SESSIONS.get(user_id, None) is session:
+                del cls.USER_SESSIONS[user_id]
+            cls.PLACED_FLEETS.pop(user_id, None)
+        # Pending changes are still written by the state writer
+        cls.GAME_STATES.pop(game_id, None)
+        cls.JOURNAL.record_end(game_id)
+        return session
 
     @classmethod
-    def get_board(cls, user_id: int) -> Optional[Board]:
-        """Return board related to user id"""
-        return cls.ACTIVE_GAMES.get(user_id, None)
+    def get_finished_session(cls, user_id: int, now: Optional[float] = None) -> Optional[GameSession]:
+        """Return game session that given user id finished within FINISHED_TTL"""
+        cls.evict_finished(now)
+        return cls.FINISHED_USER_SESSIONS.get(user_id, None)
 
     @classmethod
-    def remove_board(cls, user_id: int) -> None:
-        """Remove user id from connection dict"""
-        cls.ACTIVE_GAMES.pop(user_id, None)
+    def finish_session(cls, game_id: int, now: Optional[float] = None) -> None:
+        """Remove game session of a finished game, it is kept for RESUME until FINISHED_TTL passes"""
+        now = now if now is not None else monotonic()
+        session = cls.remove_session(game_id)
+        if session is None:
+            return None
+        cls.SESSION_COUNTER["finished"] += 1
+        cls.evict_finished(now)
+        session.last_active = now
+        cls.FINISHED_SESSIONS[game_id] = session
+        for user_id in session.user_id_tuple:
+            cls.FINISHED_USER_SESSIONS[user_id] = session
+
+    @classmethod
+    def evict_finished(cls, now: Optional[float] = None) -> None:
+        """Forget finished sessions older than FINISHED_TTL"""
+        now = now if now is not None else monotonic()
+        # Oldest finish comes first -> Stop at the first session that can still be resumed
+        while len(cls.FINISHED_SESSIONS) > 0:
+            session = next(iter(cls.FINISHED_SESSIONS.values()))
+            if now - session.last_active < cls.FINISHED_TTL:
+                break
+            del cls.FINISHED_SESSIONS[session.game_id]
+            for user_id in session.user_id_tuple:
+                if cls.FINISHED_USER_SESSIONS.get(user_id, None) is session:
+                    del cls.FINISHED_USER_SESSIONS[user_id]
+
+    @classmethod
+    def evict_expired(cls, now: Optional[float] = None) -> int:
+        """Remove sessions idle for longer than SESSION_TTL, mark their games as finished and return their count"""
+        now = now if now is not None else monotonic()
+        evicted_count = 0
+        # Oldest activity comes first -> Stop at the first session that is still alive
+        while len(cls.SESSIONS) > 0:
+            session = next(iter(cls.SESSIONS.values()))
+            if now - session.last_active < cls.SESSION_TTL:
+                break
+            cls.remove_session(session.game_id)
+            # Abandoned game cannot be resumed -> Its row must not stay open with a turn
+            session.state.finished = True
+            session.state.turn = None
+            cls.mark_state(session.state)
+            evicted_count += 1
+        cls.SESSION_COUNTER["expired"] += evicted_count
+        cls.evict_finished(now)
+        return evicted_count
+
+    @classmethod
+    def start_sweeper(cls) -> None:
+        """Start the task evicting expired sessions every SWEEP_INTERVAL on the running event loop"""
+        if cls.SWEEP_TASK is None:
+            cls.SWEEP_TASK = asyncio.get_running_loop().create_task(cls.sweep())
+
+    @classmethod
+    async def sweep(cls) -> None:
+        """Evict expired sessions every SWEEP_INTERVAL until cancelled"""
+        while True:
+            await asyncio.sleep(cls.SWEEP_INTERVAL)
+            cls.evict_expired()
+
+    @classmethod
+    def stop_sweeper(cls) -> None:
+        """Cancel the sweep task"""
+        if cls.SWEEP_TASK is not None:
+            cls.SWEEP_TASK.cancel()
+            cls.SWEEP_TASK = None
+
+    @classmethod
+    def record_start(cls, session: GameSession) -> None:
+        """Journal a started game with the ships of both boards"""
+        creator_board = session.get_board(session.user_id_tuple[0])
+        cls.JOURNAL.record_start(
+            session.game_id,
+            session.user_id_tuple,
+            session.bot is not None,
+            session.state.seed,
+            creator_board.BOARD_DIM,
+            creator_board.SHIP_SIZE_LIST,
+            tuple(session.get_board(user_id).return_layout() for user_id in session.user_id_tuple)
+        )
+
+    @classmethod
+    def record_shots(cls, session: GameSession, user_id: int, coordinate_list: List[Tuple[int, int]]) -> None:
+        """Journal shots of given user id"""
+        board_dim = session.get_board(user_id).BOARD_DIM
+        cls.JOURNAL.record_shots(session.game_id, user_id, [x * board_dim + y for x, y in coordinate_list])
+
+    @classmethod
+    def record_turn(cls, session: GameSession) -> None:
+        """Journal the current turn of given session"""
+        cls.JOURNAL.record_turn(session.game_id, session.state.turn, session.state.move_number)
+
+    @classmethod
+    def restore_session(cls, game_id: int, payload: bytes) -> GameSession:
+        """Return session of a journaled game start with untouched boards"""
+        user_id_tuple, bot, seed, board_dim, ship_size_list, layout_tuple = GameJournal.decode_start(payload)
+        board_type = cls.return_board_type(board_dim, ship_size_list)
+        creator_board, second_board = (board_type.from_layout(layout) for layout in layout_tuple)
+        creator_user_id, second_user_id = user_id_tuple
+        state = GameState(game_id, creator_user_id, None if bot is True else second_user_id, bot)
+        state.creator_user_ready = True
+        state.second_user_ready = True
+        state.seed = seed
+        return GameSession(game_id, creator_user_id, second_user_id, creator_board, second_board, cls.new_bot(seed) if bot is True else None, state)
+
+    @staticmethod
+    def replay_shots(session: GameSession, user_id: int, index_list: List[int]) -> None:
+        """Apply journaled shots of given user id, bot learns the result of each of its shots again"""
+        board = session.get_board(session.get_other_user_id(user_id))
+        coordinate_list = [divmod(index, board.BOARD_DIM) for index in index_list]
+        if not session.is_bot(user_id):
+            board.hit_many(coordinate_list)
+            return None
+        for x, y in coordinate_list:
+            hit_result = board.hit(x, y)
+            session.bot.record(x, y, hit_result, board.get_ship_size(x, y) if hit_result >= board.RESULT_SUNK else None)
+
+    @classmethod
+    def recover_sessions(cls, now: Optional[float] = None) -> int:
+        """Rebuild unfinished games of the journal, rewrite the journal with their merged records and return their count"""
+        if cls.JOURNAL.path is None:
+            return 0
+        # Ended games are never rebuilt and only the last turn is decoded
+        game_dict = GameJournal.merge_games(GameJournal.read_records(cls.JOURNAL.path))
+        record_list: List[Tuple[int, int, bytes]] = []
+        for game_id, (start_payload, shots_list, turn_payload) in game_dict.items():
+            session = cls.restore_session(game_id, start_payload)
+            # Each user shoots at one board -> Shots of a user are applied in one volley and kept as one record
+            shots_dict = GameJournal.merge_shots(shots_list)
+            for user_id, index_list in shots_dict.items():
+                cls.replay_shots(session, user_id, index_list)
+            if turn_payload is not None:
+                session.state.turn, session.state.move_number = GameJournal.decode_turn(turn_payload)
+            record_list += GameJournal.return_game_records(game_id, start_payload, shots_dict, turn_payload)
+            cls.add_session(session, now)
+            cls.GAME_STATES[game_id] = session.state
+            cls.mark_state(session.state)
+        cls.JOURNAL.compact(record_list)
+        return len(game_dict)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return session counters and sizes of in-memory registries"""
+        return {
+            "sessions": len(cls.SESSIONS),
+            "users": len(cls.USER_SESSIONS),
+            "placed_fleets": len(cls.PLACED_FLEETS),
+            "game_states": len(cls.GAME_STATES),
+            **cls.SESSION_COUNTER,
+        }
+
@@ -0,0 +1,283 @@
+import os
+from enum import IntEnum
+from struct import Struct, pack, unpack_from
+from threading import Event, Lock, Thread
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from zlib import crc32
+
+
+class RecordType(IntEnum):
+    START = 1
+    SHOTS = 2
+    TURN = 3
+    END = 4
+
+
+class GameJournal:
+    """Append-only binary journal of game events -> Records are buffered and written with one fsync per interval"""
+    # Record header -> Type, game id, payload length, CRC32 of the payload
+    HEADER = Struct("<BqII")
+    # START payload -> Creator user id, second user id, bot flag, seed flag, seed, board dimension, ship count
+    START = Struct("<qq??QIH")
+    # SHOTS payload -> Shooter user id followed by the shot cell indices
+    SHOOTER = Struct("<q")
+    # TURN payload -> User id to move, move number
+    TURN = Struct("<qI")
+    COUNT = Struct("<H")
+
+    def __init__(self, path: Optional[str], interval: float, compact_bytes: int = 0) -> None:
+        """
+        path: Journal file, journal records nothing when empty
+        compact_bytes: Size from which the open journal is rewritten with unfinished games once it doubled since the last rewrite, 0 disables it
+        """
+        self.path = path
+        self.interval = interval
+        self.compact_bytes = compact_bytes
+        self.file: Optional[BinaryIO] = None
+        self.buffer = bytearray()
+        self.lock = Lock()
+        self.sync_lock = Lock()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+        self.record_count = 0
+        self.sync_count = 0
+        self.byte_count = 0
+        self.compaction_count = 0
+        # Size of the journal file and its size after the last rewrite
+        self.file_bytes = 0
+        self.compacted_bytes = 0
+
+    def start(self) -> None:
+        """Open journal for appending and start background sync thread"""
+        if self.path is None or self.thread is not None:
+            return None
+        self.file = open(self.path, "ab")
+        self.file_bytes = self.compacted_bytes = os.path.getsize(self.path)
+        self.thread = Thread(target=self.run, name="game-journal", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Sync buffered records every interval until stopped, rewrite the journal when it grew too large"""
+        while not self.stop_event.wait(self.interval):
+            self.sync()
+            if self.needs_compaction():
+                self.compact_open()
+
+    def needs_compaction(self) -> bool:
+        """Return whether the journal reached the compaction size and doubled since its last rewrite -> Each rewrite drops at least as much as it keeps on average"""
+        return self.compact_bytes > 0 and self.file_bytes >= max(self.compact_bytes, 2 * self.compacted_bytes)
+
+    def stop(self) -> None:
+        """Stop background thread, sync remaining records and close the journal"""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sync()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def append(self, record_type: RecordType, game_id: int, payload: bytes = b"") -> None:
+        """Buffer a record, it is durable after the next sync"""
+        if self.file is None:
+            return None
+        header = self.HEADER.pack(record_type, game_id, len(payload), crc32(payload))
+        with self.lock:
+            self.buffer += header
+            self.buffer += payload
+            self.record_count += 1
+
+    def sync(self) -> int:
+        """Write buffered records with one fsync and return written byte count"""
+        with self.sync_lock:
+            with self.lock:
+                data = self.buffer
+                self.buffer = bytearray()
+            if len(data) == 0 or self.file is None:
+                return 0
+            self.file.write(data)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.sync_count += 1
+            self.byte_count += len(data)
+            self.file_bytes += len(data)
+            return len(data)
+
+    def record_start(
+        self,
+        game_id: int,
+        user_id_tuple: Tuple[int, int],
+        bot: bool,
+        seed: Optional[int],
+        board_dim: int,
+        ship_size_list: List[int],
+        layout_tuple: Tuple[List[Tuple[int, ...]], List[Tuple[int, ...]]]
+    ) -> None:
+        """Record a started game with the rules and ship cells of both boards"""
+        if self.file is None:
+            return None
+        creator_user_id, second_user_id = user_id_tuple
+        payload = bytearray(self.START.pack(
+            creator_user_id, second_user_id, bot, seed is not None, seed or 0, board_dim, len(ship_size_list)
+        ))
+        payload += Struct("<{}H".format(len(ship_size_list))).pack(*ship_size_list)
+        for layout in layout_tuple:
+            for cell_tuple in layout:
+                payload += Struct("<H{}I".format(len(cell_tuple))).pack(len(cell_tuple), *cell_tuple)
+        self.append(RecordType.START, game_id, bytes(payload))
+
+    def record_shots(self, game_id: int, user_id: int, index_list: List[int]) -> None:
+        """Record cell indices shot by given user id"""
+        if self.file is None:
+            return None
+        self.append(RecordType.SHOTS, game_id, self.encode_shots(user_id, index_list))
+
+    def record_turn(self, game_id: int, user_id: int, move_number: int) -> None:
+        """Record turn given to the user id"""
+        if self.file is None:
+            return None
+        self.append(RecordType.TURN, game_id, self.TURN.pack(user_id, move_number))
+
+    def record_end(self, game_id: int) -> None:
+        """Record a finished or evicted game -> Replay drops it"""
+        self.append(RecordType.END, game_id)
+
+    @classmethod
+    def decode_start(cls, payload: bytes) -> Tuple[Tuple[int, int], bool, Optional[int], int, List[int], Tuple[List[Tuple[int, ...]], ...]]:
+        """Return user ids, bot flag, seed, board dimension, fleet and ship cells of both boards of a START payload"""
+        creator_user_id, second_user_id, bot, seeded, seed, board_dim, ship_count = cls.START.unpack_from(payload)
+        offset = cls.START.size
+        ship_size_list = list(Struct("<{}H".format(ship_count)).unpack_from(payload, offset))
+        offset += 2 * ship_count
+        layout_list = []
+        for _ in range(2):
+            layout = []
+            for _ in range(ship_count):
+                (cell_count,) = cls.COUNT.unpack_from(payload, offset)
+                offset += cls.COUNT.size
+                layout.append(Struct("<{}I".format(cell_count)).unpack_from(payload, offset))
+                offset += 4 * cell_count
+            layout_list.append(layout)
+        return (creator_user_id, second_user_id), bot, seed if seeded else None, board_dim, ship_size_list, tuple(layout_list)
+
+    @classmethod
+    def encode_shots(cls, user_id: int, index_list: List[int]) -> bytes:
+        """Return SHOTS payload of cell indices shot by given user id"""
+        return cls.SHOOTER.pack(user_id) + pack("<{}I".format(len(index_list)), *index_list)
+
+    @classmethod
+    def merge_shots(cls, payload_list: List[bytes]) -> Dict[int, List[int]]:
+        """Return cell indices shot by each user id in given SHOTS payloads -> Indices are joined as bytes and decoded once per user"""
+        shooter_size = cls.SHOOTER.size
+        index_bytes_dict: Dict[bytes, bytearray] = {}
+        for payload in payload_list:
+            shooter = payload[:shooter_size]
+            index_bytes = index_bytes_dict.get(shooter, None)
+            if index_bytes is None:
+                index_bytes = index_bytes_dict[shooter] = bytearray()
+            index_bytes += payload[shooter_size:]
+        return {
+            cls.SHOOTER.unpack(shooter)[0]: list(unpack_from("<{}I".format(len(index_bytes) // 4), index_bytes))
+            for shooter, index_bytes in index_bytes_dict.items()
+        }
+
+    @classmethod
+    def decode_turn(cls, payload: bytes) -> Tuple[int, int]:
+        """Return user id and move number of a TURN payload"""
+        return cls.TURN.unpack(payload)
+
+    @classmethod
+    def read_records(cls, path: str) -> Iterator[Tuple[int, int, bytes]]:
+        """Iterate record type, game id and payload of given journal, reading stops at a torn or corrupt record"""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as file:
+            data = file.read()
+        header_unpack_from = cls.HEADER.unpack_from
+        header_size = cls.HEADER.size
+        end = len(data) - header_size
+        offset = 0
+        while offset <= end:
+            record_type, game_id, length, checksum = header_unpack_from(data, offset)
+            start = offset + header_size
+            payload = data[start:start + length]
+            if len(payload) != length or crc32(payload) != checksum:
+                # Crash while writing the tail -> Records after it were never acknowledged
+                break
+            yield record_type, game_id, payload
+            offset = start + length
+
+    @classmethod
+    def merge_games(cls, record_iter: Iterator[Tuple[int, int, bytes]]) -> Dict[int, Tuple[bytes, List[bytes], Optional[bytes]]]:
+        """Return START payload, SHOTS payloads and last TURN payload of each unfinished game in given records"""
+        # Records are grouped by game first -> Ended games are never decoded
+        game_dict: Dict[int, Tuple[bytes, List[bytes], Optional[bytes]]] = {}
+        for record_type, game_id, payload in record_iter:
+            if record_type == RecordType.START:
+                game_dict[game_id] = (payload, [], None)
+            elif game_id not in game_dict:
+                continue
+            elif record_type == RecordType.SHOTS:
+                game_dict[game_id][1].append(payload)
+            elif record_type == RecordType.TURN:
+                game_dict[game_id] = game_dict[game_id][:2] + (payload,)
+            elif record_type == RecordType.END:
+                del game_dict[game_id]
+        return game_dict
+
+    @classmethod
+    def return_game_records(cls, game_id: int, start_payload: bytes, shots_dict: Dict[int, List[int]], turn_payload: Optional[bytes]) -> List[Tuple[int, int, bytes]]:
+        """Return merged record set of a game -> START, one SHOTS per user and the last TURN"""
+        record_list = [(RecordType.START, game_id, start_payload)]
+        for user_id, index_list in shots_dict.items():
+            record_list.append((RecordType.SHOTS, game_id, cls.encode_shots(user_id, index_list)))
+        if turn_payload is not None:
+            record_list.append((RecordType.TURN, game_id, turn_payload))
+        return record_list
+
+    def compact(self, record_list: List[Tuple[int, int, bytes]]) -> int:
+        """Replace the journal with given records before it is opened, return written byte count"""
+        if self.path is None or self.file is not None:
+            return 0
+        return self.write_records(record_list)
+
+    def compact_open(self) -> int:
+        """Rewrite the open journal with merged records of unfinished games and return written byte count -> Records appended meanwhile stay buffered and follow them"""
+        with self.sync_lock:
+            if self.file is None:
+                return 0
+            record_list = []
+            for game_id, (start_payload, shots_list, turn_payload) in self.merge_games(self.read_records(self.path)).items():
+                record_list += self.return_game_records(game_id, start_payload, self.merge_shots(shots_list), turn_payload)
+            byte_count = self.write_records(record_list)
+            # Appending continues on the rewritten file
+            self.file.close()
+            self.file = open(self.path, "ab")
+            self.file_bytes = self.compacted_bytes = byte_count
+            self.compaction_count += 1
+            return byte_count
+
+    def write_records(self, record_list: List[Tuple[int, int, bytes]]) -> int:
+        """Replace the journal file with given records, return written byte count"""
+        header_pack = self.HEADER.pack
+        data = b"".join(header_pack(record_type, game_id, len(payload), crc32(payload)) + payload for record_type, game_id, payload in record_list)
+        # Journal is replaced only once the compacted copy is on disk
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+        return len(data)
+
+    def stats(self) -> Dict[str, int]:
+        """Return journal counters"""
+        return {
+            "records": self.record_count,
+            "syncs": self.sync_count,
+            "bytes": self.byte_count,
+            "buffered": len(self.buffer),
+            "file_bytes": self.file_bytes,
+            "compactions": self.compaction_count,
+        }
@@ -0,0 +1,131 @@
+import asyncio
+from collections import deque
+from enum import IntEnum
+from time import monotonic
+from typing import Deque, Dict, Optional, Tuple, Union
+
+
+class PutResult(IntEnum):
+    """Outcome of queueing a frame -> Only EVICTED means the consumer was too slow"""
+    QUEUED = 0
+    CLOSED = 1
+    EVICTED = 2
+
+
+class OutboundConnection:
+    """Outbound frames of one websocket -> A writer task sends them in order, a slow socket only delays its own frames"""
+    # Close code of evicted consumers -> Try again later
+    EVICT_CLOSE_CODE = 1013
+    # Seconds a closing connection may take to send its queued frames
+    DRAIN_TIMEOUT = 1.0
+
+    def __init__(self, websocket, high_water: int, limit: int, evict_after: float, codec=None) -> None:
+        """
+        websocket: Socket with async send_text(), send_bytes() and close()
+        high_water: Queue depth from which the consumer counts as slow
+        limit: Queue depth that evicts the consumer right away
+        evict_after: Seconds a consumer may stay at high water before it is evicted
+        codec: Codec negotiated by the socket, frames of a BINARY codec are sent as bytes, text frames when empty
+        """
+        self.websocket = websocket
+        self.codec = codec
+        self.send_frame = websocket.send_bytes if codec is not None and codec.BINARY is True else websocket.send_text
+        self.high_water = high_water
+        self.limit = limit
+        self.evict_after = evict_after
+        self.frame_deque: Deque[Tuple[Union[str, bytes], float]] = deque()
+        self.ready_event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        # Time the queue reached high water, None while it is below
+        self.over_since: Optional[float] = None
+        self.closing = False
+        self.closed = False
+        self.evicted = False
+        self.sent_count = 0
+        self.peak_depth = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def start(self) -> None:
+        """Start writer task on the running event loop"""
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    def put(self, frame: Union[str, bytes], now: Optional[float] = None) -> PutResult:
+        """Queue an encoded frame without waiting for the socket, return whether it is queued, the connection was closed or this put evicted the consumer"""
+        if self.closed is True:
+            return PutResult.CLOSED
+        now = now if now is not None else monotonic()
+        depth = len(self.frame_deque)
+        if depth >= self.high_water:
+            if self.over_since is None:
+                self.over_since = now
+            if depth >= self.limit or now - self.over_since >= self.evict_after:
+                self.evict()
+                return PutResult.EVICTED
+        else:
+            self.over_since = None
+        self.frame_deque.append((frame, now))
+        self.peak_depth = max(self.peak_depth, depth + 1)
+        self.ready_event.set()
+        return PutResult.QUEUED
+
+    async def run(self) -> None:
+        """Send queued frames until the connection is closed"""
+        while True:
+            while len(self.frame_deque) == 0:
+                if self.closing is True:
+                    return None
+                self.ready_event.clear()
+                await self.ready_event.wait()
+            frame, queued_at = self.frame_deque.popleft()
+            try:
+                await self.send_frame(frame)
+            except Exception:
+                # Socket is gone -> Remaining frames cannot be delivered
+                self.closed = True
+                self.frame_deque.clear()
+                return None
+            latency = monotonic() - queued_at
+            self.sent_count += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if len(self.frame_deque) < self.high_water:
+                self.over_since = None
+
+    def evict(self) -> None:
+        """Drop queued frames and close the socket of a consumer that cannot keep up"""
+        self.closed = True
+        self.evicted = True
+        self.frame_deque.clear()
+        if self.task is not None:
+            self.task.cancel()
+        asyncio.get_running_loop().create_task(self.close_socket())
+
+    async def close_socket(self) -> None:
+        """Close the socket of an evicted consumer, it may already be closed by the client"""
+        try:
+            await self.websocket.close(code=self.EVICT_CLOSE_CODE)
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Send queued frames within DRAIN_TIMEOUT and stop the writer task"""
+        self.closing = True
+        self.ready_event.set()
+        if self.task is not None and not self.task.done():
+            try:
+                await asyncio.wait_for(self.task, self.DRAIN_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+        self.closed = True
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and send latency counters"""
+        return {
+            "depth": len(self.frame_deque),
+            "peak_depth": self.peak_depth,
+            "sent": self.sent_count,
+            "latency_avg_ms": self.latency_total / self.sent_count * 1000 if self.sent_count > 0 else 0.0,
+            "latency_max_ms": self.latency_max * 1000,
+        }
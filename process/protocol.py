@@ -0,0 +1,224 @@
+from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+
+import msgpack
+import orjson
+from schemas.game import FLEET_CELL_LIMIT, FLEET_SHIP_LIMIT
+from schemas.websocket import (WebsocketBase, WebsocketMessage, WebsocketPlace,
+                               WebsocketResponse, WebsocketResponseEnum,
+                               WebsocketResume, WebsocketShot, WebsocketToken,
+                               WebsocketTurn, WebsocketViewport)
+
+
+def return_int(data: Dict, key: str, minimum: Optional[int] = None, maximum: Optional[int] = None, default: Optional[int] = None) -> Optional[int]:
+    """Return integer field of given message, raise ValueError if it is not an integer within the bounds"""
+    value = data.get(key, default)
+    if value is None:
+        return None
+    # Bool is a subclass of int but not a coordinate
+    if type(value) is not int:
+        raise ValueError("Field {} must be an integer!".format(key))
+    if (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        raise ValueError("Field {} is out of range!".format(key))
+    return value
+
+
+def return_str(data: Dict, key: str) -> str:
+    """Return string field of given message, raise ValueError if it is missing"""
+    value = data.get(key, None)
+    if type(value) is not str:
+        raise ValueError("Field {} must be a string!".format(key))
+    return value
+
+
+def decode_token(data: Dict) -> WebsocketToken:
+    """Return TOKEN message of given data"""
+    return WebsocketToken.construct(type=WebsocketResponseEnum.TOKEN, token=return_str(data, "token"))
+
+
+def decode_message(data: Dict) -> WebsocketMessage:
+    """Return MESSAGE message of given data"""
+    return WebsocketMessage.construct(type=WebsocketResponseEnum.MESSAGE, message=return_str(data, "message"))
+
+
+def decode_ready(data: Dict) -> WebsocketBase:
+    """Return READY message, it has no fields"""
+    return WebsocketBase.construct(type=WebsocketResponseEnum.READY)
+
+
+def decode_turn(data: Dict) -> WebsocketTurn:
+    """Return TURN message of given data with x-y coordinates or a list of shots"""
+    shot_list = data.get("shots", None)
+    if shot_list is None:
+        x, y = return_int(data, "x"), return_int(data, "y")
+        if x is None or y is None:
+            raise ValueError("Turn needs x-y coordinates or shots!")
+        return WebsocketTurn.construct(type=WebsocketResponseEnum.TURN, x=x, y=y, shots=None)
+    if type(shot_list) is not list:
+        raise ValueError("Field shots must be a list!")
+    shots = []
+    for shot in shot_list:
+        if type(shot) is not dict:
+            raise ValueError("Shot must be an object!")
+        x, y = return_int(shot, "x"), return_int(shot, "y")
+        if x is None or y is None:
+            raise ValueError("Shot needs x-y coordinates!")
+        shots.append(WebsocketShot.construct(x=x, y=y))
+    return WebsocketTurn.construct(type=WebsocketResponseEnum.TURN, x=return_int(data, "x"), y=return_int(data, "y"), shots=shots)
+
+
+def decode_viewport(data: Dict) -> WebsocketViewport:
+    """Return VIEWPORT message of given data, window size defaults to 32"""
+    x, y = return_int(data, "x", minimum=0), return_int(data, "y", minimum=0)
+    if x is None or y is None:
+        raise ValueError("Viewport needs x-y coordinates!")
+    return WebsocketViewport.construct(
+        type=WebsocketResponseEnum.VIEWPORT,
+        x=x,
+        y=y,
+        height=return_int(data, "height", minimum=1, maximum=64, default=32),
+        width=return_int(data, "width", minimum=1, maximum=64, default=32)
+    )
+
+
+def decode_resume(data: Dict) -> WebsocketResume:
+    """Return RESUME message of given data"""
+    last_seq = return_int(data, "last_seq", minimum=0)
+    if last_seq is None:
+        raise ValueError("Resume needs last_seq!")
+    return WebsocketResume.construct(type=WebsocketResponseEnum.RESUME, last_seq=last_seq)
+
+
+def decode_place(data: Dict) -> WebsocketPlace:
+    """Return PLACE message of given data with the cells of each ship"""
+    # Sent any number of times before READY -> Fleet size is bounded before any cell is decoded
+    ship_list = data.get("ships", None)
+    if type(ship_list) is not list or not 0 < len(ship_list) <= FLEET_SHIP_LIMIT:
+        raise ValueError("Field ships must be a list of 1 to {} ships!".format(FLEET_SHIP_LIMIT))
+    cell_count = 0
+    for cell_list in ship_list:
+        if type(cell_list) is not list or len(cell_list) == 0:
+            raise ValueError("Ship must be a list of cells!")
+        cell_count += len(cell_list)
+    if cell_count > FLEET_CELL_LIMIT:
+        raise ValueError("Fleet has more than {} cells!".format(FLEET_CELL_LIMIT))
+    ships = []
+    for cell_list in ship_list:
+        ship = []
+        for cell in cell_list:
+            if type(cell) is not dict:
+                raise ValueError("Cell must be an object!")
+            x, y = return_int(cell, "x"), return_int(cell, "y")
+            if x is None or y is None:
+                raise ValueError("Cell needs x-y coordinates!")
+            ship.append(WebsocketShot.construct(x=x, y=y))
+        ships.append(ship)
+    return WebsocketPlace.construct(type=WebsocketResponseEnum.PLACE, ships=ships)
+
+
+class WebsocketCodec:
+    """JSON frames of the websocket -> Inbound messages are validated once by their type, constant replies are encoded once"""
+    # Subprotocol that selects the codec, JSON is used when the client asks for none
+    SUBPROTOCOL: Optional[str] = None
+    # Frames are sent as bytes instead of text
+    BINARY = False
+    DECODER_DICT: Dict[str, Callable[[Dict], WebsocketBase]] = {
+        WebsocketResponseEnum.TOKEN.value: decode_token,
+        WebsocketResponseEnum.MESSAGE.value: decode_message,
+        WebsocketResponseEnum.READY.value: decode_ready,
+        WebsocketResponseEnum.TURN.value: decode_turn,
+        WebsocketResponseEnum.VIEWPORT.value: decode_viewport,
+        WebsocketResponseEnum.RESUME.value: decode_resume,
+        WebsocketResponseEnum.PLACE.value: decode_place,
+    }
+    TYPE_DICT = {response_type.value: response_type for response_type in WebsocketResponseEnum}
+
+    # Replies without game data, encoded at import
+    INVALID = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=400).dict()).decode()
+    TOKEN_OK = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.TOKEN, status=200).dict()).decode()
+    MESSAGE_OK = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.MESSAGE, status=200).dict()).decode()
+    READY_OK = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.READY, status=200).dict()).decode()
+    PLACE_OK = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.PLACE, status=200).dict()).decode()
+    PLACE_BAD = orjson.dumps(WebsocketResponse(type=WebsocketResponseEnum.PLACE, status=400).dict()).decode()
+    # Turn notification -> Sent as a game frame with its sequence number
+    TURN_NOTICE: Dict = WebsocketResponse(type=WebsocketResponseEnum.TURN, status=200).dict()
+
+    @classmethod
+    def negotiate(cls, subprotocol_list: List[str]) -> Type["WebsocketCodec"]:
+        """Return codec of the first subprotocol offered by the client that the server speaks, JSON codec otherwise"""
+        for subprotocol in subprotocol_list:
+            codec = SUBPROTOCOL_DICT.get(subprotocol, None)
+            if codec is not None:
+                return codec
+        return cls
+
+    @staticmethod
+    def loads(raw: Union[str, bytes]) -> object:
+        """Return parsed frame"""
+        return orjson.loads(raw)
+
+    @classmethod
+    def decode(cls, raw: Union[str, bytes]) -> Tuple[WebsocketResponseEnum, Optional[WebsocketBase]]:
+        """Return type and validated message of given frame, message is None for types clients do not send"""
+        data = cls.loads(raw)
+        if type(data) is not dict:
+            raise ValueError("Message must be an object!")
+        message_type = cls.TYPE_DICT.get(data.get("type", None), None)
+        if message_type is None:
+            raise ValueError("Unknown message type!")
+        decoder = cls.DECODER_DICT.get(message_type.value, None)
+        return message_type, decoder(data) if decoder is not None else None
+
+    @staticmethod
+    def encode(frame: Dict) -> Union[str, bytes]:
+        """Return JSON text of given frame"""
+        return orjson.dumps(frame).decode()
+
+    @staticmethod
+    def encode_game(frame: Dict, seq: int) -> Union[str, bytes]:
+        """Return JSON text of given frame with its sequence number -> Appended without copying the frame"""
+        return (orjson.dumps(frame)[:-1] + b',"seq":%d}' % seq).decode()
+
+    @staticmethod
+    def return_turn_frame(hit: bool, sunk: bool, x: int, y: int) -> Dict:
+        """Return frame of a shot result, same fields as WebsocketTurnResponse without the fields of the recipient"""
+        return {"type": "TURN", "status": 200, "hit": hit, "sunk": sunk, "x": x, "y": y}
+
+    @staticmethod
+    def return_salvo_frame(shot_list: List[Dict]) -> Dict:
+        """Return frame of volley results, same fields as WebsocketSalvoResponse without the fields of the recipient"""
+        return {"type": "TURN", "status": 200, "shots": shot_list}
+
+
+class MsgpackCodec(WebsocketCodec):
+    """MessagePack frames of the websocket -> Same messages as JSON in binary frames"""
+    SUBPROTOCOL = "battleship.msgpack"
+    BINARY = True
+
+    INVALID = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=400).dict())
+    TOKEN_OK = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.TOKEN, status=200).dict())
+    MESSAGE_OK = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.MESSAGE, status=200).dict())
+    READY_OK = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.READY, status=200).dict())
+    PLACE_OK = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.PLACE, status=200).dict())
+    PLACE_BAD = msgpack.packb(WebsocketResponse(type=WebsocketResponseEnum.PLACE, status=400).dict())
+
+    @staticmethod
+    def loads(raw: Union[str, bytes]) -> object:
+        """Return parsed frame, text frames are not valid MessagePack"""
+        if type(raw) is not bytes:
+            raise ValueError("Message must be a binary frame!")
+        return msgpack.unpackb(raw)
+
+    @staticmethod
+    def encode(frame: Dict) -> bytes:
+        """Return MessagePack bytes of given frame"""
+        return msgpack.packb(frame)
+
+    @staticmethod
+    def encode_game(frame: Dict, seq: int) -> bytes:
+        """Return MessagePack bytes of given frame with its sequence number"""
+        frame = dict(frame)
+        frame["seq"] = seq
+        return msgpack.packb(frame)
+
+
+SUBPROTOCOL_DICT: Dict[str, Type[WebsocketCodec]] = {MsgpackCodec.SUBPROTOCOL: MsgpackCodec}
@@ -0,0 +1,276 @@
+from random import Random
+from typing import Dict, List, Optional, Tuple, Type
+
+from process.board import Board, HitResult, create_rules_type
+
+
+class SparseBoard:
+    """Board storing only ship cells and shots -> Memory and move cost follow the fleet and shot count, not the board area"""
+    BOARD_DIM = 1000
+    BOARD_SIZE = BOARD_DIM * BOARD_DIM
+    # Cell representation, same values as Board
+    EMPTY = Board.EMPTY
+    SHIP = Board.SHIP
+    HIT = Board.HIT
+    MISS = Board.MISS
+    SHIP_SIZE_LIST = Board.SHIP_SIZE_LIST
+    SHIP_PART_COUNT = sum(SHIP_SIZE_LIST)
+    RESULT_MISS = HitResult.MISS
+    RESULT_HIT = HitResult.HIT
+    RESULT_SUNK = HitResult.SUNK
+    RESULT_FINISHED = HitResult.FINISHED
+    SYSTEM_RANDOM = Board.SYSTEM_RANDOM
+    RULES_CACHE: Dict[Tuple[Type, int, Tuple[int, ...]], Type] = {}
+    # Largest share of cells a custom fleet may cover -> Keeps overlapping draws rare
+    MAX_FLEET_RATIO = 0.25
+    # Rejected draws allowed per ship before the layout is drawn again
+    MAX_ATTEMPT_COUNT = 1000
+    # Fleet layouts drawn before population gives up
+    MAX_LAYOUT_COUNT = 100
+    # Each draw hits a free placement at least with the unblocked share -> MAX_ATTEMPT_COUNT draws practically never miss all
+    MAX_BLOCKED_RATIO = 0.9
+    # Boards populated when custom rules exceed the blocked ratio, each must find a layout, and the largest board sampled
+    FLEET_SAMPLE_COUNT = 8
+    MAX_SAMPLE_SIZE = 32 * 32
+
+    __slots__ = (
+        "ship_id_dict", "shot_dict", "ship_cell_list", "ship_remaining_list",
+        "remaining_part_count", "surviving_ship_count", "finished", "rng"
+    )
+
+    def __init__(self, rng: Optional[Random] = None) -> None:
+        self.rng: Random = rng if rng is not None else self.SYSTEM_RANDOM
+        # Cell index (x * BOARD_DIM + y) -> Ship id for ship cells, HIT or MISS for shot cells
+        self.ship_id_dict: Dict[int, int] = {}
+        self.shot_dict: Dict[int, int] = {}
+        self.ship_cell_list: List[Tuple[int, ...]] = []
+        self.ship_remaining_list: List[int] = []
+        self.remaining_part_count = 0
+        self.surviving_ship_count = 0
+        self.finished = False
+        self.populate()
+
+    @classmethod
+    def with_rules(cls, board_dim: int, ship_size_list: List[int]) -> Type["SparseBoard"]:
+        """Return board class playing with given dimension and fleet, each rule set creates its class once"""
+        key = (cls, board_dim, tuple(ship_size_list))
+        board_type = cls.RULES_CACHE.get(key, None)
+        if board_type is None:
+            board_type = create_rules_type(cls, board_dim, ship_size_list)
+            cls.RULES_CACHE[key] = board_type
+        return board_type
+
+    @classmethod
+    def check_boundaries(cls, x: int, y: int):
+        """Check whether given boundaries are valid"""
+        if not 0 <= x < cls.BOARD_DIM:
+            raise ValueError("Invalid x value for board!")
+        if not 0 <= y < cls.BOARD_DIM:
+            raise ValueError("Invalid y value for board!")
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Return cell representation of given x-y coordinates"""
+        index = x * self.BOARD_DIM + y
+        cell = self.shot_dict.get(index, None)
+        if cell is not None:
+            return cell
+        return self.SHIP if index in self.ship_id_dict else self.EMPTY
+
+    def record_ship(self, cell_tuple: Tuple[int, ...]) -> int:
+        """Record given ship cells with a new ship id and return the id"""
+        ship_id = len(self.ship_cell_list)
+        for index in cell_tuple:
+            self.ship_id_dict[index] = ship_id
+        self.ship_cell_list.append(cell_tuple)
+        self.ship_remaining_list.append(len(cell_tuple))
+        self.remaining_part_count += len(cell_tuple)
+        self.surviving_ship_count += 1
+        return ship_id
+
+    def reset(self) -> None:
+        """Clear every ship and shot on the board"""
+        self.ship_id_dict = {}
+        self.shot_dict = {}
+        self.ship_cell_list = []
+        self.ship_remaining_list = []
+        self.remaining_part_count = 0
+        self.surviving_ship_count = 0
+        self.finished = False
+
+    def populate(self) -> None:
+        """Randomly populate the board -> Each ship is drawn uniformly from all placements, overlapping draws are retried"""
+        if len(self.ship_cell_list) > 0:
+            return None
+        # Ships placed so far can leave no room for the next one -> Draw the whole layout again
+        for _ in range(self.MAX_LAYOUT_COUNT):
+            if self.populate_layout() is True:
+                return None
+            self.reset()
+        raise ValueError("Fleet does not fit on the board!")
+
+    def populate_layout(self) -> bool:
+        """Draw ships in SHIP_SIZE_LIST order, return False at a ship that found no free placement"""
+        board_dim = self.BOARD_DIM
+        for ship_size in self.SHIP_SIZE_LIST:
+            # Placements along rows come first, then placements along columns
+            start_count = board_dim - ship_size + 1
+            row_placement_count = board_dim * start_count
+            for _ in range(self.MAX_ATTEMPT_COUNT):
+                placement_index = self.rng.randrange(2 * row_placement_count)
+                if placement_index < row_placement_count:
+                    x, y = divmod(placement_index, start_count)
+                    step = 1
+                else:
+                    y, x = divmod(placement_index - row_placement_count, start_count)
+                    step = board_dim
+                start_index = x * board_dim + y
+                cell_tuple = tuple(range(start_index, start_index + ship_size * step, step))
+                if not any(index in self.ship_id_dict for index in cell_tuple):
+                    self.record_ship(cell_tuple)
+                    break
+            else:
+                return False
+        return True
+
+    @classmethod
+    def validate_fleet(cls, ship_list: List[List[Tuple[int, int]]]) -> List[Tuple[int, ...]]:
+        """Return cells of given ships ordered as SHIP_SIZE_LIST, raise ValueError if ships do not form the fleet"""
+        if len(ship_list) != len(cls.SHIP_SIZE_LIST):
+            raise ValueError("Fleet must have every ship of SHIP_SIZE_LIST!")
+        size_set = set(cls.SHIP_SIZE_LIST)
+        cell_dict: Dict[int, List[Tuple[int, ...]]] = {ship_size: [] for ship_size in size_set}
+        occupied_set = set()
+        for cell_list in ship_list:
+            ship_size = len(cell_list)
+            if ship_size not in size_set:
+                raise ValueError("Fleet must match SHIP_SIZE_LIST!")
+            index_list = []
+            for x, y in cell_list:
+                if not 0 <= x < cls.BOARD_DIM or not 0 <= y < cls.BOARD_DIM:
+                    cls.check_boundaries(x, y)
+                index_list.append(x * cls.BOARD_DIM + y)
+            index_list.sort()
+            # Straight ship -> Cells follow each other along a row (step 1) or a column (step BOARD_DIM)
+            first_index = index_list[0]
+            if ship_size > 1:
+                step = index_list[1] - first_index
+                if (
+                    (step != 1 and step != cls.BOARD_DIM)
+                    or (step == 1 and first_index // cls.BOARD_DIM != index_list[-1] // cls.BOARD_DIM)
+                    or index_list != list(range(first_index, first_index + ship_size * step, step))
+                ):
+                    raise ValueError("Ship cells must form a straight line!")
+            if not occupied_set.isdisjoint(index_list):
+                raise ValueError("Ships must not overlap!")
+            occupied_set.update(index_list)
+            cell_dict[ship_size].append(tuple(index_list))
+        ordered_cell_list = []
+        for ship_size in cls.SHIP_SIZE_LIST:
+            if len(cell_dict[ship_size]) == 0:
+                raise ValueError("Fleet must match SHIP_SIZE_LIST!")
+            ordered_cell_list.append(cell_dict[ship_size].pop())
+        return ordered_cell_list
+
+    def place(self, ship_cell_list: List[Tuple[int, ...]]) -> None:
+        """Replace the fleet with given ships returned by validate_fleet()"""
+        self.reset()
+        for cell_tuple in ship_cell_list:
+            self.record_ship(cell_tuple)
+
+    def return_layout(self) -> List[Tuple[int, ...]]:
+        """Return cell indices of each ship ordered by ship id"""
+        return list(self.ship_cell_list)
+
+    @classmethod
+    def from_layout(cls, layout: List[Tuple[int, ...]]) -> "SparseBoard":
+        """Return board with given ships returned by return_layout() -> Skips the random population"""
+        board = cls.__new__(cls)
+        board.rng = cls.SYSTEM_RANDOM
+        board.place([tuple(cell_tuple) for cell_tuple in layout])
+        return board
+
+    def serialize_viewport(self, x: int, y: int, height: int, width: int, hide_ships: bool = False) -> str:
+        """Serialize the window of given height and width starting at x-y coordinates, window is clipped at board edges"""
+        self.check_boundaries(x, y)
+        ship_id_dict = {} if hide_ships is True else self.ship_id_dict
+        cell_list = []
+        for row_index in range(x, min(x + height, self.BOARD_DIM)):
+            index = row_index * self.BOARD_DIM
+            for column_index in range(y, min(y + width, self.BOARD_DIM)):
+                cell = self.shot_dict.get(index + column_index, None)
+                if cell is None:
+                    cell = self.SHIP if index + column_index in ship_id_dict else self.EMPTY
+                cell_list.append(str(cell))
+        return "".join(cell_list)
+
+    def hit(self, x: int, y: int) -> HitResult:
+        """Register given x-y coordinates as hit; If cell is empty -> Miss, If cell is not empty -> Hit, Sunk or Finished"""
+        if not 0 <= x < self.BOARD_DIM or not 0 <= y < self.BOARD_DIM:
+            self.check_boundaries(x, y)
+        index = x * self.BOARD_DIM + y
+        if index in self.shot_dict:
+            raise ValueError("Only EMPTY or SHIP values can be hit!")
+        ship_id = self.ship_id_dict.get(index, None)
+        if ship_id is None:
+            self.shot_dict[index] = self.MISS
+            return self.RESULT_MISS
+        self.shot_dict[index] = self.HIT
+        return self.record_hit(ship_id)
+
+    def record_hit(self, ship_id: int) -> HitResult:
+        """Count a hit on given ship and return its result"""
+        self.ship_remaining_list[ship_id] -= 1
+        self.remaining_part_count -= 1
+        if self.ship_remaining_list[ship_id] > 0:
+            return self.RESULT_HIT
+        self.surviving_ship_count -= 1
+        if self.remaining_part_count > 0:
+            return self.RESULT_SUNK
+        self.finished = True
+        return self.RESULT_FINISHED
+
+    def hit_many(self, coordinate_list: List[Tuple[int, int]]) -> List[HitResult]:
+        """Register a volley of shots and return the result of each shot, nothing is registered if any shot is invalid"""
+        index_list = []
+        for x, y in coordinate_list:
+            if not 0 <= x < self.BOARD_DIM or not 0 <= y < self.BOARD_DIM:
+                self.check_boundaries(x, y)
+            index_list.append(x * self.BOARD_DIM + y)
+        if len(set(index_list)) != len(index_list):
+            raise ValueError("Same cell cannot be hit twice in a volley!")
+        if any(index in self.shot_dict for index in index_list):
+            raise ValueError("Only EMPTY or SHIP values can be hit!")
+        # Every shot is valid -> Apply them
+        result_list = []
+        for index in index_list:
+            ship_id = self.ship_id_dict.get(index, None)
+            if ship_id is None:
+                self.shot_dict[index] = self.MISS
+                result_list.append(self.RESULT_MISS)
+            else:
+                self.shot_dict[index] = self.HIT
+                result_list.append(self.record_hit(ship_id))
+        return result_list
+
+    def get_surviving_ship_count(self) -> int:
+        """Return count of ships that are not sunk"""
+        return self.surviving_ship_count
+
+    def get_unshot_cell_count(self) -> int:
+        """Return count of cells that can still be hit"""
+        return self.BOARD_SIZE - len(self.shot_dict)
+
+    def get_ship_id(self, x: int, y: int) -> Optional[int]:
+        """Return id of the ship on given x-y coordinates, None if the cell is empty"""
+        return self.ship_id_dict.get(x * self.BOARD_DIM + y, None)
+
+    def get_ship_size(self, x: int, y: int) -> int:
+        """Return size of the ship on given x-y coordinates, 0 if the cell is empty"""
+        ship_id = self.get_ship_id(x, y)
+        if ship_id is None:
+            return 0
+        return len(self.ship_cell_list[ship_id])
+
+    def update_game_status(self) -> None:
+        """Check game status and update finished variable"""
+        self.finished = len(self.ship_cell_list) > 0 and self.remaining_part_count == 0
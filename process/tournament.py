@@ -0,0 +1,125 @@
+"""Bot-vs-bot self-play tournament -> python3 -m process.tournament --help"""
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from process.board import Board, HitResult
+from process.bot import STRATEGY_DICT
+
+
+def play_fleet(strategy_name: str, rng: Random) -> int:
+    """Play given strategy against a new board until the fleet is sunk and return shot count"""
+    board = Board(rng)
+    strategy = STRATEGY_DICT[strategy_name](rng)
+    shot_count = 0
+    while board.finished is False:
+        x, y = strategy.choose()
+        result = board.hit(x, y)
+        strategy.record(x, y, result, board.get_ship_size(x, y) if result >= HitResult.SUNK else None)
+        shot_count += 1
+    return shot_count
+
+
+def play_games(first_name: str, second_name: str, seed: int, game_count: int) -> Tuple[Counter, Counter, int]:
+    """
+    Play games between two strategies and return shots-to-win histograms of both and win count of the first strategy
+    Players shoot at separate boards, so the player sinking the fleet in fewer shots wins, the player moving first wins ties
+    """
+    rng = Random(seed)
+    first_counter: Counter = Counter()
+    second_counter: Counter = Counter()
+    first_win_count = 0
+    for game_index in range(game_count):
+        first_shot_count = play_fleet(first_name, rng)
+        second_shot_count = play_fleet(second_name, rng)
+        first_counter[first_shot_count] += 1
+        second_counter[second_shot_count] += 1
+        # Players take turns to move first
+        if first_shot_count < second_shot_count or (first_shot_count == second_shot_count and game_index % 2 == 0):
+            first_win_count += 1
+    return first_counter, second_counter, first_win_count
+
+
+def run(first_name: str, second_name: str, game_count: int, worker_count: int, seed: int, chunk_size: int) -> Tuple[Counter, Counter, int, float]:
+    """Run games in chunks over a process pool and return merged results and elapsed seconds"""
+    chunk_list: List[int] = []
+    remaining_count = game_count
+    while remaining_count > 0:
+        chunk_list.append(min(chunk_size, remaining_count))
+        remaining_count -= chunk_list[-1]
+    first_counter: Counter = Counter()
+    second_counter: Counter = Counter()
+    first_win_count = 0
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        future_list = [
+            executor.submit(play_games, first_name, second_name, seed + chunk_index, count)
+            for chunk_index, count in enumerate(chunk_list)
+        ]
+        for future in future_list:
+            chunk_first_counter, chunk_second_counter, chunk_first_win_count = future.result()
+            first_counter.update(chunk_first_counter)
+            second_counter.update(chunk_second_counter)
+            first_win_count += chunk_first_win_count
+    return first_counter, second_counter, first_win_count, perf_counter() - start
+
+
+def summarize(counter: Counter) -> Dict[str, float]:
+    """Return mean and percentiles of a shots-to-win histogram"""
+    total = sum(counter.values())
+    summary = {"mean": sum(shots * count for shots, count in counter.items()) / total}
+    percentile_list = [("min", 0.0), ("p10", 0.1), ("p50", 0.5), ("p90", 0.9), ("max", 1.0)]
+    cumulative = 0
+    percentile_index = 0
+    for shots in sorted(counter):
+        cumulative += counter[shots]
+        while percentile_index < len(percentile_list) and cumulative >= max(1, percentile_list[percentile_index][1] * total):
+            summary[percentile_list[percentile_index][0]] = shots
+            percentile_index += 1
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bot-vs-bot self-play tournament with process.board.Board rules")
+    parser.add_argument("first", choices=sorted(STRATEGY_DICT), help="Strategy of the first player")
+    parser.add_argument("second", choices=sorted(STRATEGY_DICT), help="Strategy of the second player")
+    parser.add_argument("--games", type=int, default=10000, help="Game count")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker process count")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed, each chunk uses base seed + chunk index")
+    parser.add_argument("--chunk", type=int, default=500, help="Games played per task")
+    parser.add_argument("--scaling", action="store_true", help="Repeat the run with 1, 2, 4... workers up to --workers")
+    args = parser.parse_args()
+
+    worker_count_list = [args.workers]
+    if args.scaling is True:
+        worker_count_list = []
+        worker_count = 1
+        while worker_count < args.workers:
+            worker_count_list.append(worker_count)
+            worker_count *= 2
+        worker_count_list.append(args.workers)
+
+    base_rate = None
+    for worker_count in worker_count_list:
+        first_counter, second_counter, first_win_count, elapsed = run(args.first, args.second, args.games, worker_count, args.seed, args.chunk)
+        rate = args.games / elapsed
+        base_rate = base_rate if base_rate is not None else rate
+        print("workers: {:>3} games / sec: {:>10.0f} speedup: {:>5.2f}".format(worker_count, rate, rate / base_rate))
+
+    print("{:<8} {:<12} {:>8} {:>8} {:>5} {:>5} {:>5} {:>5} {:>5}".format("player", "strategy", "wins", "mean", "min", "p10", "p50", "p90", "max"))
+    for player, name, counter, win_count in (
+        ("first", args.first, first_counter, first_win_count),
+        ("second", args.second, second_counter, args.games - first_win_count),
+    ):
+        summary = summarize(counter)
+        print("{:<8} {:<12} {:>8} {:>8.2f} {:>5} {:>5} {:>5} {:>5} {:>5}".format(
+            player, name, win_count, summary["mean"], summary["min"], summary["p10"], summary["p50"], summary["p90"], summary["max"]
+        ))
+
+
+if __name__ == "__main__":
+    main()
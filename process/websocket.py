@@ -1,156 +1,444 @@
-from typing import Dict, Optional
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
 
 from controllers.game import ControllerGame
 from core.auth import TokenValidator
+from core.db import async_session_local
+from core.settings import settings
 from fastapi import WebSocket, status
 from models.games import Games
 from schemas.user import UserBaseSession
-from schemas.websocket import (WebsocketBoard, WebsocketMessage,
+from schemas.websocket import (WebsocketBoard, WebsocketBoardEncodingEnum,
+                               WebsocketMessage, WebsocketPlace,
                                WebsocketResponse, WebsocketResponseEnum,
-                               WebsocketToken, WebsocketTurn,
-                               WebsocketTurnResponse, WebsocketUser)
-from sqlalchemy.orm import Session
+                               WebsocketResume, WebsocketResumeResponse,
+                               WebsocketToken, WebsocketTurn, WebsocketUser,
+                               WebsocketViewport)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from process.board import Board
-from process.game import GameManager
+from process.actor import GameActorManager
+from process.board import Board, HitResult
+from process.game import GameManager, GameSession, GameState
+from process.outbound import OutboundConnection, PutResult
+from process.protocol import WebsocketCodec
+from process.sparse import SparseBoard
 
 
 class WebsocketManager:
-    ACTIVE_CONNECTIONS: Dict[int, WebSocket] = {}
+    ACTIVE_CONNECTIONS: Dict[int, OutboundConnection] = {}
+    # Outbound queue limits of each connection
+    HIGH_WATER = settings.outbound_high_water
+    QUEUE_LIMIT = settings.outbound_queue_limit
+    EVICT_AFTER = settings.outbound_evict_after_ms / 1000
+    EVICTED_COUNT = 0
 
     @classmethod
-    def add_connection(cls, user_id: int, websocket: WebSocket) -> None:
-        """Add given websocket to connection dict"""
-        cls.ACTIVE_CONNECTIONS[user_id] = websocket
+    def add_connection(cls, user_id: int, websocket: WebSocket, codec: Type[WebsocketCodec] = WebsocketCodec) -> OutboundConnection:
+        """Add given websocket with its negotiated codec to connection dict and start its writer task"""
+        connection = OutboundConnection(websocket, cls.HIGH_WATER, cls.QUEUE_LIMIT, cls.EVICT_AFTER, codec)
+        connection.start()
+        cls.ACTIVE_CONNECTIONS[user_id] = connection
+        return connection
 
     @classmethod
-    def remove_connection(cls, user_id: int) -> None:
-        """Remove user id from connection dict"""
-        cls.ACTIVE_CONNECTIONS.pop(user_id, None)
+    async def remove_connection(cls, user_id: int, connection: OutboundConnection) -> None:
+        """Remove user id from connection dict unless the user already reconnected, then drain and stop the connection"""
+        if cls.ACTIVE_CONNECTIONS.get(user_id, None) is connection:
+            del cls.ACTIVE_CONNECTIONS[user_id]
+        await connection.close()
 
     @classmethod
-    async def send(cls, user_id: int, message: Dict) -> None:
-        """Fetch websocket related to user id and send message"""
-        websocket = cls.ACTIVE_CONNECTIONS.get(user_id, None)
-        if websocket is None:
+    def is_connected(cls, user_id: int) -> bool:
+        """Return whether given user id has a websocket"""
+        return user_id in cls.ACTIVE_CONNECTIONS
+
+    @classmethod
+    async def send(cls, user_id: int, message: Union[Dict, str, bytes]) -> None:
+        """Queue message on the connection of user id -> Writer task of the connection sends it, encoded frames are sent as is"""
+        cls.queue(user_id, message)
+
+    @classmethod
+    def queue(cls, user_id: int, message: Union[Dict, str, bytes]) -> None:
+        """Queue message on the connection of user id without yielding to the event loop"""
+        connection = cls.ACTIVE_CONNECTIONS.get(user_id, None)
+        if connection is None:
             raise KeyError
-        await websocket.send_json(message)
+        put_result = connection.put(connection.codec.encode(message) if isinstance(message, dict) else message)
+        if put_result == PutResult.QUEUED:
+            return None
+        # Slow consumer is evicted or the socket is gone -> Game frames are replayed when it resumes
+        del cls.ACTIVE_CONNECTIONS[user_id]
+        if put_result == PutResult.EVICTED:
+            cls.EVICTED_COUNT += 1
+
+    @classmethod
+    def stats(cls) -> Dict[str, float]:
+        """Return outbound queue depth and send latency of active connections"""
+        stats_list = [connection.stats() for connection in cls.ACTIVE_CONNECTIONS.values()]
+        sent_count = sum(stats["sent"] for stats in stats_list)
+        return {
+            "connections": len(stats_list),
+            "queued": sum(stats["depth"] for stats in stats_list),
+            "peak_depth": max((stats["peak_depth"] for stats in stats_list), default=0),
+            "sent": sent_count,
+            "evicted": cls.EVICTED_COUNT,
+            "latency_avg_ms": sum(stats["latency_avg_ms"] * stats["sent"] for stats in stats_list) / sent_count if sent_count > 0 else 0.0,
+            "latency_max_ms": max((stats["latency_max_ms"] for stats in stats_list), default=0.0),
+        }
+
+    @classmethod
+    async def send_game(cls, game_session: GameSession, user_id: int, message: Dict) -> None:
+        """Send a numbered game frame to user id, frame is kept for RESUME when the user is disconnected"""
+        cls.queue_game(game_session, user_id, message)
+
+    @classmethod
+    async def send_game_frames(cls, game_session: GameSession, frame_dict: Dict[int, Dict]) -> None:
+        """Send game frames keyed by user id -> Every frame is queued before any is written, writer tasks of the users send them concurrently"""
+        for user_id, message in frame_dict.items():
+            cls.queue_game(game_session, user_id, message)
+
+    @classmethod
+    def queue_game(cls, game_session: GameSession, user_id: int, message: Dict) -> None:
+        """Number a game frame, keep it for RESUME and queue it if the user is connected"""
+        seq = game_session.next_sequence()
+        game_session.record_frame(user_id, message)
+        connection = cls.ACTIVE_CONNECTIONS.get(user_id, None)
+        if connection is not None:
+            cls.queue(user_id, connection.codec.encode_game(message, seq))
 
 
 class WebsocketProcessor:
+    # Window sent with the boards of a sparse game, clients request other windows with VIEWPORT
+    VIEWPORT_DIM = 32
 
-    def __init__(self, websocket: WebSocket, session: Session) -> None:
+    def __init__(self, websocket: WebSocket, codec: Type[WebsocketCodec] = WebsocketCodec, session_factory: Callable[[], AsyncSession] = async_session_local) -> None:
         self.websocket: WebSocket = websocket
-        self.session: Session = session
+        # Sessions are opened per unit of work -> Idle websockets hold no pooled connection
+        self.session_factory = session_factory
+        # Codec of the negotiated subprotocol -> Game logic is the same for every encoding
+        self.codec: Type[WebsocketCodec] = codec
         self.user: Optional[UserBaseSession] = None
         self.game: Optional[Games] = None
+        # In-memory state of the game shared by both users -> Game logic never reads it back from the DB
+        self.state: Optional[GameState] = None
+        self.connection: Optional[OutboundConnection] = None
         self.authenticated = False
 
     async def authorize_user(self, token: WebsocketToken) -> None:
         """Authorize user to websocket connection -> This must be the first action in websocket"""
         # Check if token is valid
         self.user = TokenValidator.authorize_socket(token)
-        TokenValidator.check_token(self.session, self.user.id)
-        # Check if user is in a game
-        self.game = ControllerGame.get_by_user_id(self.session, self.user.id)
+        async with self.session_factory() as session:
+            await TokenValidator.check_token(session, self.user.id, token.token)
+            # Check if user is in a game -> Game columns stay readable after the session closes
+            self.game = await ControllerGame.get_last_by_user_id(session, self.user.id)
         if self.game is None:
             raise KeyError(f"User({self.user.id}) is not in a game.")
-        WebsocketManager.add_connection(self.user.id, self.websocket)
+        self.state = GameManager.load_state(self.game)
+        self.connection = WebsocketManager.add_connection(self.user.id, self.websocket, self.codec)
         self.authenticated = True
         # Check if user is secondary player -> Notify game creator
-        if self.game.second_user_id == self.user.id:
-            user_in = WebsocketUser(type=WebsocketResponseEnum.USER_IN, username=self.game.second_user.username)
+        if self.game.second_user_id == self.user.id and WebsocketManager.is_connected(self.game.creator_user_id):
+            user_in = WebsocketUser(type=WebsocketResponseEnum.USER_IN, username=self.user.username)
             await WebsocketManager.send(self.game.creator_user_id, user_in.dict())
         # Return token response that authentication is successful
-        await WebsocketManager.send(self.user.id, WebsocketResponse(type=WebsocketResponseEnum.TOKEN, status=status.HTTP_200_OK).dict())
+        await WebsocketManager.send(self.user.id, self.codec.TOKEN_OK)
+
+    async def dispatch(self, handler: Callable[..., Awaitable[None]], *args) -> None:
+        """Run given handler with the events of both users of the game in the order they arrive -> Game actor serializes them"""
+        await GameActorManager.submit(self.game.id, handler, *args)
 
     async def message(self, message: WebsocketMessage) -> None:
         """Process incoming messages from users"""
-        self.session.refresh(self.game)
-        other_user_id = ControllerGame.get_other_user_id(self.game, self.user.id)
-        if other_user_id is not None:
+        other_user_id = self.state.get_other_user_id(self.user.id)
+        game_session = GameManager.get_user_session(self.user.id)
+        if game_session is not None and self.state.bot is False:
+            await WebsocketManager.send_game(game_session, other_user_id, message.dict())
+        elif other_user_id is not None and self.state.bot is False and WebsocketManager.is_connected(other_user_id):
             await WebsocketManager.send(other_user_id, message.dict())
-        await WebsocketManager.send(self.user.id, WebsocketResponse(type=WebsocketResponseEnum.MESSAGE, status=status.HTTP_200_OK).dict())
+        await WebsocketManager.send(self.user.id, self.codec.MESSAGE_OK)
+
+    async def place(self, place: WebsocketPlace) -> None:
+        """Validate fleet placed by the user -> Fleet replaces the random one when the game starts"""
+        user_ready = self.state.creator_user_ready if self.state.creator_user_id == self.user.id else self.state.second_user_ready
+        if user_ready is True:
+            # Fleet must be placed before ready
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
+            return
+        board_type = GameManager.return_board_type(self.game.board_dim, ControllerGame.get_ship_size_list(self.game))
+        try:
+            ship_list = board_type.validate_fleet(place.return_ship_list())
+        except ValueError:
+            await WebsocketManager.send(self.user.id, self.codec.PLACE_BAD)
+            return
+        GameManager.add_fleet(self.user.id, ship_list)
+        await WebsocketManager.send(self.user.id, self.codec.PLACE_OK)
 
     async def ready(self) -> None:
         """Process ready message coming from users"""
-        self.session.refresh(self.game)
-        if self.game.creator_user_ready is True and self.game.second_user_ready is True:
+        if self.state.is_started():
             # Game is already started -> Cannot send ready again
-            await WebsocketManager.send(self.user.id, WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=status.HTTP_400_BAD_REQUEST).dict())
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
             return
         # Save ready flags
-        if self.game.creator_user_id == self.user.id:
-            self.game.creator_user_ready = not self.game.creator_user_ready
+        if self.state.creator_user_id == self.user.id:
+            self.state.creator_user_ready = not self.state.creator_user_ready
         else:
-            self.game.second_user_ready = not self.game.second_user_ready
+            self.state.second_user_ready = not self.state.second_user_ready
+        GameManager.mark_state(self.state)
         # Send ready flag response
-        await WebsocketManager.send(self.user.id, WebsocketResponse(type=WebsocketResponseEnum.READY, status=status.HTTP_200_OK).dict())
+        await WebsocketManager.send(self.user.id, self.codec.READY_OK)
         # TODO: Maybe notify other user of readiness
         # Check ready flags -> Start game if every user is ready
-        if self.game.creator_user_ready is True and self.game.second_user_ready is True:
+        if self.state.is_started():
             # Game is ready -> Initiate boards and send them to users
-            GameManager.add_board(self.game.creator_user_id, Board())
-            GameManager.add_board(self.game.second_user_id, Board())
-            await self.send_boards(self.game.creator_user_id, self.game.second_user_id)
-            await self.send_turn(self.game.creator_user_id)
-        self.session.commit()
+            second_user_id = self.state.get_other_user_id(self.state.creator_user_id)
+            self.state.seed = GameManager.new_seed()
+            try:
+                board_type = GameManager.return_board_type(self.game.board_dim, ControllerGame.get_ship_size_list(self.game))
+                if issubclass(board_type, SparseBoard):
+                    # Large fleets take milliseconds to place -> Boards are filled off the event loop
+                    creator_board, second_board = await asyncio.get_running_loop().run_in_executor(None, GameManager.new_boards, self.state.seed, board_type)
+                else:
+                    creator_board, second_board = GameManager.new_boards(self.state.seed, board_type)
+            except ValueError:
+                # Fleet found no layout -> Game stays unstarted and the user can send READY again
+                if self.state.creator_user_id == self.user.id:
+                    self.state.creator_user_ready = False
+                else:
+                    self.state.second_user_ready = False
+                GameManager.mark_state(self.state)
+                await WebsocketManager.send(self.user.id, self.codec.INVALID)
+                return
+            for user_id, board in ((self.state.creator_user_id, creator_board), (second_user_id, second_board)):
+                # Placed fleets replace random ones
+                ship_list = GameManager.pop_fleet(user_id)
+                if ship_list is not None:
+                    board.place(ship_list)
+            bot = GameManager.new_bot(self.state.seed) if self.state.bot is True else None
+            game_session = GameSession(self.state.game_id, self.state.creator_user_id, second_user_id, creator_board, second_board, bot, self.state)
+            GameManager.add_session(game_session)
+            GameManager.record_start(game_session)
+            await self.send_boards(game_session)
+            await self.send_turn(game_session, self.state.creator_user_id)
 
     async def turn(self, turn: WebsocketTurn) -> None:
         """Process turn info"""
-        self.session.refresh(self.game)
+        game_session = GameManager.get_user_session(self.user.id)
+        if game_session is None:
+            raise KeyError
         # Check if it is user's turn to act
-        if self.game.turn != self.user.id:
+        if game_session.state.turn != self.user.id:
             # Turn is not on this user
-            await WebsocketManager.send(self.user.id, WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=status.HTTP_400_BAD_REQUEST).dict())
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
             return
         # Fetch boards of users
-        other_user_id = ControllerGame.get_other_user_id(self.game, self.user.id)
-        self_board = GameManager.get_board(self.user.id)
-        other_board = GameManager.get_board(other_user_id)
-        if self_board is None or other_board is None:
-            raise KeyError
-        # Record hit
-        response = WebsocketTurnResponse(
-            type=WebsocketResponseEnum.TURN,
-            status=status.HTTP_200_OK,
-            hit=other_board.hit(turn.x, turn.y),
-            x=turn.x,
-            y=turn.y
-        )
-        await WebsocketManager.send(self.user.id, response.dict())
-        await WebsocketManager.send(other_user_id, response.dict())
-        # Change turn
-        await self.send_turn(other_user_id)
-        self.session.commit()
+        other_user_id = game_session.get_other_user_id(self.user.id)
+        self_board = game_session.get_board(self.user.id)
+        other_board = game_session.get_board(other_user_id)
+        # Check shot count -> Salvo games fire a volley, other games a single shot
+        coordinate_list = turn.return_coordinate_list()
+        if len(coordinate_list) != self.return_shot_count(self_board, other_board) or (self.game.salvo is False and turn.shots is not None):
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
+            return
+        # Record hits
+        response = self.return_shots_response(coordinate_list, other_board.hit_many(coordinate_list))
+        GameManager.record_shots(game_session, self.user.id, coordinate_list)
+        GameManager.touch_session(game_session)
+        if other_board.finished is True:
+            self.finish(game_session)
+            await WebsocketManager.send_game_frames(game_session, self.return_move_frames(game_session, response, None, self.user.id))
+        elif game_session.bot is None:
+            self.change_turn(game_session, other_user_id)
+            await WebsocketManager.send_game_frames(game_session, self.return_move_frames(game_session, response, other_user_id))
+        else:
+            # Bot plays its turn right away
+            await WebsocketManager.send_game_frames(game_session, self.return_move_frames(game_session, response, other_user_id))
+            await self.bot_turn(game_session)
+
+    async def bot_turn(self, game_session: GameSession) -> None:
+        """Play bot move on user's board and give the turn back to the user"""
+        bot = game_session.bot
+        bot_user_id = game_session.get_other_user_id(self.user.id)
+        board = game_session.get_board(self.user.id)
+        bot_board = game_session.get_board(bot_user_id)
+        game_session.state.move_number += 1
+        coordinate_list = []
+        hit_result_list = []
+        # Bot learns the result of each shot of its volley before choosing the next one
+        for _ in range(self.return_shot_count(bot_board, board)):
+            if board.finished is True:
+                break
+            x, y = bot.choose()
+            hit_result = board.hit(x, y)
+            bot.record(x, y, hit_result, board.get_ship_size(x, y) if hit_result >= HitResult.SUNK else None)
+            coordinate_list.append((x, y))
+            hit_result_list.append(hit_result)
+        GameManager.record_shots(game_session, bot_user_id, coordinate_list)
+        response = self.return_shots_response(coordinate_list, hit_result_list)
+        if board.finished is True:
+            self.finish(game_session)
+            await WebsocketManager.send_game_frames(game_session, self.return_move_frames(game_session, response, None, bot_user_id))
+        else:
+            self.change_turn(game_session, self.user.id)
+            await WebsocketManager.send_game_frames(game_session, self.return_move_frames(game_session, response, self.user.id))
+
+    @staticmethod
+    def finish(game_session: GameSession) -> None:
+        """Evict the finished game and mark its state as finished"""
+        GameManager.finish_session(game_session.game_id)
+        game_session.state.finished = True
+        game_session.state.turn = None
+        GameManager.mark_state(game_session.state)
+
+    @staticmethod
+    def return_move_frames(game_session: GameSession, response: Dict, next_user_id: Optional[int], winner_user_id: Optional[int] = None) -> Dict[int, Dict]:
+        """Return result frame of a move for each user -> Frame tells its user whether they move next, or who won a finished game"""
+        frame_dict = {}
+        for user_id in game_session.user_id_tuple:
+            if game_session.is_bot(user_id):
+                continue
+            frame = dict(response, next_turn=user_id == next_user_id, finished=winner_user_id is not None)
+            if winner_user_id is not None:
+                frame["win"] = user_id == winner_user_id
+            frame_dict[user_id] = frame
+        return frame_dict
+
+    def return_shot_count(self, board: Board, other_board: Board) -> int:
+        """Return shot count of a turn played by the owner of given board on the other board -> A volley never exceeds its unshot cells"""
+        if self.game.salvo is False:
+            return 1
+        if self.game.salvo_shots is not None:
+            return min(self.game.salvo_shots, other_board.get_unshot_cell_count())
+        return min(board.get_surviving_ship_count(), other_board.get_unshot_cell_count())
 
-    async def send_boards(self, first_user_id: int, second_user_id: int) -> None:
+    def return_shots_response(self, coordinate_list: List[Tuple[int, int]], hit_result_list: List[HitResult]) -> Dict:
+        """Return turn response of a single shot, or salvo response of a volley -> Built as a plain dict, fields are known to be valid"""
+        if self.game.salvo is False:
+            x, y = coordinate_list[0]
+            return self.return_turn_response(hit_result_list[0], x, y)
+        return WebsocketCodec.return_salvo_frame([
+            {"x": x, "y": y, "hit": hit_result != HitResult.MISS, "sunk": hit_result >= HitResult.SUNK}
+            for (x, y), hit_result in zip(coordinate_list, hit_result_list)
+        ])
+
+    @staticmethod
+    def return_turn_response(hit_result: HitResult, x: int, y: int) -> Dict:
+        """Return turn response of a shot"""
+        return WebsocketCodec.return_turn_frame(hit_result != HitResult.MISS, hit_result >= HitResult.SUNK, x, y)
+
+    async def send_boards(self, game_session: GameSession) -> None:
         """Send board representations to users -> Opponent must not see the ships"""
-        response = WebsocketBoard(
+        for user_id in game_session.user_id_tuple:
+            if game_session.is_bot(user_id):
+                # Bot has no connection
+                continue
+            await WebsocketManager.send_game(game_session, user_id, self.return_board_response(game_session, user_id).dict())
+
+    def return_board_response(self, game_session: GameSession, user_id: int) -> WebsocketBoard:
+        """Return board response of given user id with the hidden board of the opponent"""
+        self_board = game_session.get_board(user_id)
+        opponent_board = game_session.get_board(game_session.get_other_user_id(user_id))
+        if isinstance(self_board, SparseBoard):
+            # Large board -> Only the first window is sent
+            return self.return_viewport_response(self_board, opponent_board, 0, 0, self.VIEWPORT_DIM, self.VIEWPORT_DIM)
+        return WebsocketBoard(
             type=WebsocketResponseEnum.BOARD,
-            self_board=GameManager.get_board(first_user_id).serialize(),
-            opponent_board=GameManager.get_board(second_user_id).serialize(hide_ships=True)
+            self_board=self_board.encode_base64(),
+            opponent_board=opponent_board.encode_base64(hide_ships=True),
+            encoding=WebsocketBoardEncodingEnum.PACKED,
+            board_dim=self_board.BOARD_DIM
         )
-        await WebsocketManager.send(first_user_id, response.dict())
-        response = WebsocketBoard(
+
+    async def resume(self, resume: WebsocketResume) -> None:
+        """Send frames of the game missed since given sequence number, or a snapshot if they are no longer buffered"""
+        game_session = GameManager.get_user_session(self.user.id)
+        if game_session is None:
+            # Recently finished game still has its final frames
+            game_session = GameManager.get_finished_session(self.user.id)
+        if game_session is None:
+            # Game is not started or over for longer than the resume period
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
+            return
+        frame_list = None
+        # Client ahead of the game means the game was recovered after a restart -> Only a snapshot is consistent
+        if resume.last_seq <= game_session.sequence:
+            frame_list = game_session.replay_dict[self.user.id].return_frames(resume.last_seq)
+        response = WebsocketResumeResponse(
+            type=WebsocketResponseEnum.RESUME, status=status.HTTP_200_OK, seq=game_session.sequence, snapshot=frame_list is None
+        )
+        await WebsocketManager.send(self.user.id, response.dict())
+        if frame_list is None:
+            frame_list = [(game_session.sequence, self.return_board_response(game_session, self.user.id).dict())]
+            if game_session.state.turn == self.user.id:
+                frame_list.append((game_session.sequence, WebsocketCodec.TURN_NOTICE))
+            elif game_session.state.finished is True:
+                # Last frame of a finished game is its result -> It has the winner
+                frame_list.append(game_session.replay_dict[self.user.id].frame_deque[-1])
+        for seq, frame in frame_list:
+            await WebsocketManager.send(self.user.id, self.codec.encode_game(frame, seq))
+
+    async def viewport(self, viewport: WebsocketViewport) -> None:
+        """Send the requested window of both boards"""
+        game_session = GameManager.get_user_session(self.user.id)
+        if game_session is None:
+            # Game is not started yet
+            await WebsocketManager.send(self.user.id, self.codec.INVALID)
+            return
+        self_board = game_session.get_board(self.user.id)
+        other_board = game_session.get_board(game_session.get_other_user_id(self.user.id))
+        response = self.return_viewport_response(self_board, other_board, viewport.x, viewport.y, viewport.height, viewport.width)
+        await WebsocketManager.send(self.user.id, response.dict())
+
+    @staticmethod
+    def return_viewport_response(self_board: Board, opponent_board: Board, x: int, y: int, height: int, width: int) -> WebsocketBoard:
+        """Return board response with the window of given height and width starting at x-y coordinates"""
+        height = min(height, self_board.BOARD_DIM - x)
+        width = min(width, self_board.BOARD_DIM - y)
+        return WebsocketBoard(
             type=WebsocketResponseEnum.BOARD,
-            self_board=GameManager.get_board(second_user_id).serialize(),
-            opponent_board=GameManager.get_board(first_user_id).serialize(hide_ships=True)
+            self_board=self_board.serialize_viewport(x, y, height, width),
+            opponent_board=opponent_board.serialize_viewport(x, y, height, width, hide_ships=True),
+            encoding=WebsocketBoardEncodingEnum.VIEWPORT,
+            board_dim=self_board.BOARD_DIM,
+            x=x,
+            y=y,
+            height=height,
+            width=width
         )
-        await WebsocketManager.send(second_user_id, response.dict())
 
-    async def send_turn(self, user_id: int) -> None:
-        """Change turn information and send it to the user"""
-        self.game.turn = user_id
-        self.game.move_number += 1
-        await WebsocketManager.send(user_id, WebsocketResponse(type=WebsocketResponseEnum.TURN, status=status.HTTP_200_OK).dict())
+    async def send_turn(self, game_session: GameSession, user_id: int) -> None:
+        """Change turn information and send it to the user -> Start of the game, moves carry the turn in their result frames"""
+        self.change_turn(game_session, user_id)
+        await WebsocketManager.send_game(game_session, user_id, WebsocketCodec.TURN_NOTICE)
+
+    @staticmethod
+    def change_turn(game_session: GameSession, user_id: int) -> None:
+        """Give the turn to the user id"""
+        game_session.state.turn = user_id
+        game_session.state.move_number += 1
+        GameManager.mark_state(game_session.state)
+        GameManager.record_turn(game_session)
 
     async def default(self) -> None:
         """Send default response to user"""
-        response = WebsocketResponse(type=WebsocketResponseEnum.INVALID, status=status.HTTP_400_BAD_REQUEST)
-        await WebsocketManager.send(self.user.id, response.dict())
+        await WebsocketManager.send(self.user.id, self.codec.INVALID)
+
+    async def send_error(self, response: WebsocketResponse) -> None:
+        """Send error response -> Through the connection queue once the user is connected so that frames stay in order"""
+        frame = self.codec.encode(response.dict())
+        if self.connection is not None and self.connection.closed is False:
+            self.connection.put(frame)
+        elif self.codec.BINARY is True:
+            await self.websocket.send_bytes(frame)
+        else:
+            await self.websocket.send_text(frame)
 
-    def disconnect(self) -> None:
+    async def disconnect(self) -> None:
         """Process websocket disconnect case"""
-        if self.user is not None:
-            WebsocketManager.remove_connection(self.user.id)
+        if self.connection is not None:
+            await WebsocketManager.remove_connection(self.user.id, self.connection)
+            # Last websocket of the game is closed -> Games that did not start leave memory
+            user_id_tuple = (self.state.creator_user_id, self.state.second_user_id)
+            if not any(WebsocketManager.is_connected(user_id) for user_id in user_id_tuple if user_id is not None):
+                GameManager.release_state(self.state)
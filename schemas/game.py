@@ -1,12 +1,42 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, conint, constr
+from pydantic import BaseModel, conint, conlist, constr, root_validator
+
+# Largest custom fleet -> Rules are checked, boards filled and ship cells journaled on request handlers
+FLEET_SHIP_LIMIT = 500
+FLEET_CELL_LIMIT = 10000
 
 
 class GameBaseCreate(BaseModel):
     name: Optional[constr(min_length=1, max_length=200)] = None
     password: Optional[constr(min_length=1, max_length=200)] = None
+    bot: bool = False
+    salvo: bool = False
+    salvo_shots: Optional[conint(ge=1, le=100)] = None  # Shots per salvo, one shot per surviving ship when empty
+    board_dim: conint(ge=5, le=1000) = 10
+    fleet: Optional[conlist(conint(ge=1, le=1000), min_items=1, max_items=FLEET_SHIP_LIMIT)] = None  # Ship sizes, standard fleet when empty
+
+    @root_validator(skip_on_failure=True)
+    def check_bot_board(cls, values):
+        """Bot plays only on the standard board"""
+        if values.get("bot") is True and (values.get("board_dim") != 10 or values.get("fleet") is not None):
+            raise ValueError("Bot games use the standard board!")
+        return values
+
+    @root_validator(skip_on_failure=True)
+    def check_fleet_cells(cls, values):
+        """Fleet covers a bounded number of cells"""
+        if values.get("fleet") is not None and sum(values["fleet"]) > FLEET_CELL_LIMIT:
+            raise ValueError("Fleet has more than {} ship cells!".format(FLEET_CELL_LIMIT))
+        return values
+
+    @root_validator(skip_on_failure=True)
+    def check_salvo_shots(cls, values):
+        """Volley fits on the board"""
+        if values.get("salvo_shots") is not None and values["salvo_shots"] > values["board_dim"] ** 2:
+            raise ValueError("Salvo has more shots than the board has cells!")
+        return values
 
 
 class GameBaseCreateResponse(BaseModel):
@@ -1,9 +1,12 @@
+from typing import Optional
+
 from pydantic import BaseModel, EmailStr, constr
 
 
 class UserBaseSession(BaseModel):
     id: int
     username: constr(min_length=3, max_length=50)
+    token: Optional[str] = None  # Token the session was decoded from -> Key of the token cache
 
 
 class UserBaseLogin(BaseModel):
@@ -1,7 +1,8 @@
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, conint, conlist, root_validator
+from schemas.game import FLEET_CELL_LIMIT, FLEET_SHIP_LIMIT
 
 
 class WebsocketResponseEnum(str, Enum):
@@ -14,6 +15,15 @@ class WebsocketResponseEnum(str, Enum):
     BOARD = "BOARD"
     TURN = "TURN"
     RESULT = "RESULT"
+    VIEWPORT = "VIEWPORT"
+    PLACE = "PLACE"
+    RESUME = "RESUME"
+
+
+class WebsocketBoardEncodingEnum(str, Enum):
+    TEXT = "TEXT"  # One digit per cell
+    PACKED = "PACKED"  # Base64 of 2 bits per cell, low bit plane followed by high bit plane, then ship starts if ships are shown
+    VIEWPORT = "VIEWPORT"  # One digit per cell of the window starting at x-y, row by row
 
 
 class WebsocketBase(BaseModel):
@@ -39,18 +49,97 @@ class WebsocketUser(WebsocketBase):
 class WebsocketBoard(WebsocketBase):
     self_board: str
     opponent_board: str
+    encoding: WebsocketBoardEncodingEnum = WebsocketBoardEncodingEnum.TEXT
+    board_dim: int = 10
+    # Window of VIEWPORT encoding
+    x: int = 0
+    y: int = 0
+    height: Optional[int] = None
+    width: Optional[int] = None
 
 
-class WebsocketTurn(WebsocketBase):
+class WebsocketViewport(WebsocketBase):
+    x: conint(ge=0)
+    y: conint(ge=0)
+    height: conint(ge=1, le=64) = 32
+    width: conint(ge=1, le=64) = 32
+
+
+class WebsocketShot(BaseModel):
     x: int
     y: int
 
 
-class WebsocketTurnResponse(WebsocketResponse):
+class WebsocketTurn(WebsocketBase):
+    x: Optional[int] = None
+    y: Optional[int] = None
+    shots: Optional[List[WebsocketShot]] = None  # Salvo games
+
+    @root_validator(skip_on_failure=True)
+    def check_shots(cls, values):
+        """Turn has either x-y coordinates or a list of shots"""
+        if values.get("shots") is None and (values.get("x") is None or values.get("y") is None):
+            raise ValueError("Turn needs x-y coordinates or shots!")
+        return values
+
+    def return_coordinate_list(self) -> List[Tuple[int, int]]:
+        """Return coordinates of every shot in the turn"""
+        if self.shots is None:
+            return [(self.x, self.y)]
+        return [(shot.x, shot.y) for shot in self.shots]
+
+
+class WebsocketMoveResponse(WebsocketResponse):
+    next_turn: bool  # Receiving user moves next
+    finished: bool = False
+    win: Optional[bool] = None  # Sent once the game is finished
+
+
+class WebsocketTurnResponse(WebsocketMoveResponse):
     hit: bool
+    sunk: bool = False
     x: int
     y: int
 
 
-class WebsocketResultResponse(WebsocketResponse):
-    win: bool
+class WebsocketPlace(WebsocketBase):
+    ships: conlist(conlist(WebsocketShot, min_items=1, max_items=1000), min_items=1, max_items=FLEET_SHIP_LIMIT)  # Cells of each ship
+
+    @root_validator(skip_on_failure=True)
+    def check_cells(cls, values):
+        """Fleet covers a bounded number of cells"""
+        if sum(len(ship) for ship in values["ships"]) > FLEET_CELL_LIMIT:
+            raise ValueError("Fleet has more than {} cells!".format(FLEET_CELL_LIMIT))
+        return values
+
+    def return_ship_list(self) -> List[List[Tuple[int, int]]]:
+        """Return x-y coordinates of the cells of each ship"""
+        return [[(shot.x, shot.y) for shot in ship] for ship in self.ships]
+
+
+class WebsocketShotResult(WebsocketShot):
+    hit: bool
+    sunk: bool = False
+
+
+class WebsocketSalvoResponse(WebsocketMoveResponse):
+    shots: List[WebsocketShotResult]
+
+
+class WebsocketStats(BaseModel):
+    connections: int
+    queued: int  # Frames waiting in outbound queues
+    peak_depth: int
+    sent: int
+    evicted: int  # Slow consumers closed since start
+    latency_avg_ms: float  # Time from queueing to a completed send
+    latency_max_ms: float
+
+
+class WebsocketResume(WebsocketBase):
+    last_seq: conint(ge=0)  # Sequence number of the last frame the client received
+
+
+class WebsocketResumeResponse(WebsocketResponse):
+    seq: int  # Sequence number of the last frame sent in the game
+    snapshot: bool  # Missed frames are no longer buffered -> Current boards and turn follow instead
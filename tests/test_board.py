@@ -1,3 +1,5 @@
+from random import Random
+
 from board import Board
 import pytest
 
@@ -124,3 +126,13 @@ class TestBoard:
             if board.return_status() is True:
                 # All ships are sunk, exit
                 break
+
+    def test_seeded_populate(self) -> None:
+        """
+        Test populate with seeded random provider
+        """
+        first_board = Board(Random(42))
+        first_board.populate()
+        second_board = Board(Random(42))
+        second_board.populate()
+        assert first_board.return_ship_coordinate_list() == second_board.return_ship_coordinate_list()
@@ -0,0 +1,117 @@
+import asyncio
+from typing import Callable, List
+
+import pytest
+
+from core.cache import InvalidationChannel, TokenCache
+
+
+class BrokerChannel(InvalidationChannel):
+    """Channel of one worker on a shared in-memory broker"""
+
+    def __init__(self, callback_list: List[Callable[[int], None]]) -> None:
+        self.callback_list = callback_list
+        self.callback = None
+
+    def publish(self, user_id: int) -> None:
+        for callback in self.callback_list:
+            if callback is not self.callback:
+                callback(user_id)
+
+    def subscribe(self, callback: Callable[[int], None]) -> None:
+        self.callback = callback
+        self.callback_list.append(callback)
+
+
+class TestTokenCache:
+
+    def test_lru_ttl(self) -> None:
+        """
+        Entries are served until they expire, the least recently used entry is evicted first and both are counted
+        """
+        token_cache = TokenCache(size=2, ttl=10)
+        assert token_cache.get(1, "a", now=0) is None
+        token_cache.put(1, "a", 11, True, token_cache.generation, now=0)
+        token_cache.put(2, "b", 12, False, token_cache.generation, now=0)
+        assert token_cache.get(1, "a", now=5) == (11, True)
+        # Other token of the same user is another key
+        assert token_cache.get(1, "x", now=5) is None
+        token_cache.put(3, "c", 13, True, token_cache.generation, now=5)
+        assert token_cache.get(2, "b", now=5) is None
+        assert token_cache.get(1, "a", now=10) is None
+        assert token_cache.get(3, "c", now=10) == (13, True)
+        assert token_cache.stats() == {"size": 1, "hit": 2, "miss": 4, "expired": 1, "evicted": 1, "invalidated": 0}
+        assert token_cache.user_key_dict == {3: {(3, "c")}}
+
+    def test_invalidate(self) -> None:
+        """
+        Invalidation drops every token of the user on all workers, results read before it are not cached
+        """
+        callback_list = []
+        worker_list = [TokenCache(size=10, ttl=10, channel=BrokerChannel(callback_list)) for _ in range(2)]
+        for token_cache in worker_list:
+            token_cache.put(1, "a", 11, True, token_cache.generation, now=0)
+            token_cache.put(1, "b", 11, True, token_cache.generation, now=0)
+            token_cache.put(2, "c", 12, True, token_cache.generation, now=0)
+        generation = worker_list[1].generation
+        worker_list[0].invalidate(1)
+        for token_cache in worker_list:
+            assert token_cache.get(1, "a", now=1) is None and token_cache.get(2, "c", now=1) == (12, True)
+            assert token_cache.stats()["invalidated"] == 2
+        # Lookup started before the invalidation -> Its stale result is not cached
+        worker_list[1].put(1, "a", 11, True, generation, now=1)
+        assert worker_list[1].get(1, "a", now=1) is None
+
+    def test_check_token(self, monkeypatch, tmp_path) -> None:
+        """
+        Repeated checks of a token skip the database until logout or a new login invalidates them
+        """
+        pytest.importorskip("fastapi")
+        pytest.importorskip("sqlalchemy")
+        import controllers.token
+        import core.auth
+        from controllers.token import ControllerToken
+        from core.auth import TokenValidator
+        from core.db import Base
+        from fastapi import HTTPException
+        from models.users import Users
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        from sqlalchemy.orm import sessionmaker
+
+        token_cache = TokenCache(size=10, ttl=60)
+        monkeypatch.setattr(core.auth, "token_cache", token_cache)
+        monkeypatch.setattr(controllers.token, "token_cache", token_cache)
+        engine = create_engine("sqlite:///{}".format(tmp_path / "token.db"))
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add(Users(id=1, username="user1", password="", email="user1@x.com"))
+            session.commit()
+        engine.dispose()
+
+        async def run() -> List[int]:
+            async_engine = create_async_engine("sqlite+aiosqlite:///{}".format(tmp_path / "token.db"))
+            statement_list = []
+            event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statement_list.append(args[2]))
+            async with sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)() as session:
+                db_token = await ControllerToken.save_token(session, "first", 1)
+                query_count_list = []
+                for token in ("first", "first", "first"):
+                    assert await TokenValidator.check_token(session, 1, token) == db_token.id
+                    query_count_list.append(len(statement_list))
+                await ControllerToken.invalidate_token(session, db_token.id, 1)
+                with pytest.raises(HTTPException):
+                    await TokenValidator.check_token(session, 1, "first")
+                with pytest.raises(HTTPException):
+                    await TokenValidator.check_token(session, 1, "first")
+                query_count_list.append(len(statement_list))
+                await ControllerToken.update_token(session, db_token.id, 1, "second")
+                assert await TokenValidator.check_token(session, 1, "second") == db_token.id
+            await async_engine.dispose()
+            return query_count_list
+
+        query_count_list = asyncio.run(run())
+        # First check reads the row, repeated checks are hits -> Logout is seen on the next check and cached too
+        assert query_count_list[1] == query_count_list[2] == query_count_list[0]
+        assert query_count_list[3] == query_count_list[2] + 2
+        assert token_cache.stats()["hit"] == 3 and token_cache.stats()["miss"] == 3
@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import asyncio  # noqa: E402
+
+from controllers.game import ControllerGame  # noqa: E402
+from core.db import Base, add_missing_columns, drop_stale_unique_constraints  # noqa: E402
+from models.games import Games  # noqa: E402
+from models.users import Users  # noqa: E402
+from sqlalchemy import create_engine, inspect, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+
+class TestDatabase:
+
+    def test_add_missing_columns(self, tmp_path) -> None:
+        """
+        Games table of an older version gets the new columns, its rows read the model defaults
+        """
+        engine = create_engine("sqlite:///{}".format(tmp_path / "old.db"))
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE games (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, password VARCHAR(200), create_date DATETIME, "
+                "creator_user_id INTEGER UNIQUE, second_user_id INTEGER UNIQUE, creator_user_ready BOOLEAN, second_user_ready BOOLEAN, "
+                "turn INTEGER UNIQUE, move_number INTEGER, finished BOOLEAN)"
+            ))
+            connection.execute(text("INSERT INTO games (id, name, creator_user_id) VALUES (1, 'old', 1)"))
+        assert add_missing_columns(engine) == ["games.seed", "games.bot", "games.salvo", "games.salvo_shots", "games.board_dim", "games.fleet"]
+        Base.metadata.create_all(bind=engine)
+        assert {column["name"] for column in inspect(engine).get_columns("games")} == {column.name for column in Games.__table__.columns}
+        with engine.connect() as connection:
+            row = connection.execute(text("SELECT bot, salvo, salvo_shots, board_dim, fleet FROM games")).one()
+        assert tuple(row) == (0, 0, None, 10, None)
+        # Schema is up to date -> Nothing to add
+        assert add_missing_columns(engine) == []
+        engine.dispose()
+
+    def test_drop_stale_unique_constraints(self, tmp_path) -> None:
+        """
+        Games table of an older version loses the unique user columns, its rows are kept and the user columns are indexed
+        """
+        engine = create_engine("sqlite:///{}".format(tmp_path / "old.db"))
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE games (id INTEGER PRIMARY KEY, name VARCHAR(200) NOT NULL, password VARCHAR(200), create_date DATETIME, "
+                "creator_user_id INTEGER UNIQUE, second_user_id INTEGER UNIQUE, creator_user_ready BOOLEAN, second_user_ready BOOLEAN, "
+                "turn INTEGER UNIQUE, move_number INTEGER, finished BOOLEAN)"
+            ))
+            connection.execute(text("INSERT INTO games (id, name, creator_user_id, second_user_id, finished) VALUES (1, 'old', 1, 2, 1)"))
+        add_missing_columns(engine)
+        assert drop_stale_unique_constraints(engine) == ["games(creator_user_id)", "games(second_user_id)"]
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO games (id, name, creator_user_id, second_user_id, finished) VALUES (2, 'new', 1, 2, 0)"))
+            assert connection.execute(text("SELECT name, board_dim FROM games ORDER BY id")).all() == [("old", 10), ("new", None)]
+        assert {index["name"] for index in inspect(engine).get_indexes("games")} == {index.name for index in Games.__table__.indexes}
+        assert [constraint["column_names"] for constraint in inspect(engine).get_unique_constraints("games")] == [["turn"]]
+        # Schema is up to date -> Nothing to drop
+        assert drop_stale_unique_constraints(engine) == []
+        engine.dispose()
+
+    def test_finished_games(self, tmp_path) -> None:
+        """
+        Users of finished games can create new ones, started games that were not recovered are finished at startup
+        """
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        engine = create_engine("sqlite:///{}".format(tmp_path / "games.db"))
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as session:
+            session.add_all([Users(id=user_id, username="user{}".format(user_id), password="", email="user{}@x.com".format(user_id)) for user_id in (1, 2, 3)])
+            session.add_all([
+                Games(id=1, name="finished", creator_user_id=1, second_user_id=2, creator_user_ready=True, second_user_ready=True, finished=True),
+                Games(id=2, name="recovered", creator_user_id=1, second_user_id=2, creator_user_ready=True, second_user_ready=True, turn=1),
+                Games(id=3, name="lost", creator_user_id=3, bot=True, creator_user_ready=True, second_user_ready=True, turn=3),
+                Games(id=4, name="waiting", creator_user_id=2, second_user_ready=True),
+            ])
+            session.commit()
+            assert ControllerGame.finish_unrecovered(session, {2}) == [3]
+            assert [game.turn for game in session.query(Games).order_by(Games.id)] == [None, 1, None, None]
+        engine.dispose()
+
+        async def run() -> List[Optional[int]]:
+            async_engine = create_async_engine("sqlite+aiosqlite:///{}".format(tmp_path / "games.db"))
+            async with sessionmaker(bind=async_engine, class_=AsyncSession)() as session:
+                game_list = [await ControllerGame.get_by_user_id(session, user_id) for user_id in (1, 3)]
+                game_list.append(await ControllerGame.get_last_by_user_id(session, 3))
+            await async_engine.dispose()
+            return [game.id if game is not None else None for game in game_list]
+
+        assert asyncio.run(run()) == [2, None, 3]
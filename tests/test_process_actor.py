@@ -0,0 +1,156 @@
+import asyncio
+from collections import OrderedDict
+from random import Random
+from typing import List
+
+import pytest
+
+from process.actor import GameActorManager
+
+# Concurrent games of the stress tests -> Processor games play real boards and take longer
+GAME_COUNT = 2000
+PROCESSOR_GAME_COUNT = 1000
+
+
+class TurnGame:
+    """Two users taking turns -> Moves yield to the event loop between the turn check and the update"""
+
+    def __init__(self) -> None:
+        self.turn = 0
+        self.move_list: List[int] = []
+
+    async def move(self, user: int) -> int:
+        if self.turn != user:
+            raise ValueError("Not your turn!")
+        # Stands for a DB or network await inside the handler
+        await asyncio.sleep(0)
+        self.move_list.append(user)
+        self.turn = 1 - user
+        return len(self.move_list)
+
+
+class FakeWebsocket:
+    """Websocket that records the frames sent to it"""
+
+    def __init__(self) -> None:
+        self.frame_list: List[str] = []
+
+    async def send_text(self, frame: str) -> None:
+        self.frame_list.append(frame)
+
+    async def send_bytes(self, frame: bytes) -> None:
+        self.frame_list.append(frame)
+
+    async def close(self, code: int) -> None:
+        pass
+
+
+class TestGameActor:
+
+    def test_serialized_events(self, monkeypatch) -> None:
+        """
+        Concurrent moves of both users never interleave, handler errors reach the caller and idle actors stop
+        """
+        monkeypatch.setattr(GameActorManager, "ACTORS", {})
+        monkeypatch.setattr(GameActorManager, "IDLE_TIMEOUT", 0.05)
+        monkeypatch.setattr(GameActorManager, "STARTED_COUNT", 0)
+        monkeypatch.setattr(GameActorManager, "STOPPED_COUNT", 0)
+        monkeypatch.setattr(GameActorManager, "EVENT_COUNT", 0)
+        game_list = [TurnGame() for _ in range(GAME_COUNT)]
+
+        async def play(game_id: int, user: int) -> int:
+            accepted_count = 0
+            for _ in range(10):
+                try:
+                    await GameActorManager.submit(game_id, game_list[game_id].move, user)
+                    accepted_count += 1
+                except ValueError:
+                    await asyncio.sleep(0)
+            return accepted_count
+
+        async def run() -> List[int]:
+            accepted_list = await asyncio.gather(*(play(game_id, user) for game_id in range(GAME_COUNT) for user in (0, 1)))
+            assert GameActorManager.stats()["actors"] == GAME_COUNT
+            await asyncio.sleep(0.2)
+            return accepted_list
+
+        accepted_list = asyncio.run(run())
+        for game_id, game in enumerate(game_list):
+            assert len(game.move_list) == accepted_list[2 * game_id] + accepted_list[2 * game_id + 1]
+            # Users alternate -> No move passed the turn check twice
+            assert all(game.move_list[index] != game.move_list[index + 1] for index in range(len(game.move_list) - 1))
+        stats = GameActorManager.stats()
+        assert stats["actors"] == 0 and stats["started"] == stats["stopped"] == GAME_COUNT
+        assert stats["events"] == 20 * GAME_COUNT
+
+    def test_processor_stress(self, monkeypatch) -> None:
+        """
+        Concurrent READY and TURN events of thousands of games start each game once and keep turns and frame order intact
+        """
+        pytest.importorskip("fastapi")
+        pytest.importorskip("sqlalchemy")
+        import orjson
+        from models.games import Games
+        from process.game import GameManager, GameStateWriter
+        from process.websocket import WebsocketManager, WebsocketProcessor
+        from schemas.user import UserBaseSession
+        from schemas.websocket import WebsocketResponseEnum, WebsocketTurn
+
+        monkeypatch.setattr(GameActorManager, "ACTORS", {})
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(WebsocketManager, "ACTIVE_CONNECTIONS", {})
+        rng = Random(0)
+
+        async def play(processor: WebsocketProcessor) -> None:
+            await processor.dispatch(processor.ready)
+            for _ in range(30):
+                x, y = rng.randrange(10), rng.randrange(10)
+                try:
+                    await processor.dispatch(processor.turn, WebsocketTurn.construct(type=WebsocketResponseEnum.TURN, x=x, y=y, shots=None))
+                except ValueError:
+                    # Cell is already shot -> Endpoint answers INVALID
+                    continue
+                except KeyError:
+                    # Game is already over
+                    return None
+
+        async def run() -> List[WebsocketProcessor]:
+            processor_list = []
+            for game_id in range(1, PROCESSOR_GAME_COUNT + 1):
+                game = Games(
+                    id=game_id, creator_user_id=2 * game_id, second_user_id=2 * game_id + 1, creator_user_ready=False, second_user_ready=False,
+                    move_number=0, finished=False, bot=False, salvo=False, board_dim=10
+                )
+                for user_id in (game.creator_user_id, game.second_user_id):
+                    websocket = FakeWebsocket()
+                    processor = WebsocketProcessor(websocket)
+                    processor.user = UserBaseSession(id=user_id, username="user{}".format(user_id))
+                    processor.game = game
+                    processor.state = GameManager.load_state(game)
+                    processor.connection = WebsocketManager.add_connection(user_id, websocket)
+                    processor.authenticated = True
+                    processor_list.append(processor)
+            await asyncio.gather(*(play(processor) for processor in processor_list))
+            for processor in processor_list:
+                await processor.disconnect()
+            return processor_list
+
+        processor_list = asyncio.run(run())
+        assert GameManager.SESSION_COUNTER["created"] == PROCESSOR_GAME_COUNT
+        for processor in processor_list:
+            frame_list = [orjson.loads(frame) for frame in processor.websocket.frame_list]
+            # Game frames reach each user in sequence order
+            seq_list = [frame["seq"] for frame in frame_list if "seq" in frame]
+            assert seq_list == sorted(seq_list) and len(seq_list) == len(set(seq_list))
+            # Both users became ready exactly once -> One READY reply and one set of boards
+            assert sum(frame["type"] == "READY" for frame in frame_list) == 1
+            assert sum(frame["type"] == "BOARD" for frame in frame_list) == 1
+            # Turn passes to the other user after every move -> Result frames alternate between own and opponent moves
+            next_turn_list = [frame["next_turn"] for frame in frame_list if "next_turn" in frame and frame["finished"] is False]
+            assert all(next_turn_list[index] != next_turn_list[index + 1] for index in range(len(next_turn_list) - 1))
+            state = processor.state
+            assert state.move_number == 1 + len(next_turn_list)
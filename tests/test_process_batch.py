@@ -0,0 +1,109 @@
+from random import Random
+
+import pytest
+
+from process.board import Board, HitResult, iterate_mask
+
+np = pytest.importorskip("numpy")
+from process.batch import BoardBatch  # noqa: E402
+
+
+class TestBoardBatch:
+    BOARD_COUNT = 64
+    SEED = 1234
+
+    def test_populate(self) -> None:
+        """
+        Every batched board must hold a legal fleet in ship size order
+        """
+        board_batch = BoardBatch(self.BOARD_COUNT, np.random.default_rng(self.SEED))
+        board_batch.populate()
+        assert (board_batch.remaining_part_count == Board.SHIP_PART_COUNT).all()
+        for row in range(self.BOARD_COUNT):
+            board = board_batch.to_board(row)
+            assert board.remaining_part_count == Board.SHIP_PART_COUNT
+            for ship_id, ship_mask in enumerate(board.ship_mask_list):
+                assert ship_mask in Board.return_placement_table(Board.SHIP_SIZE_LIST[ship_id]).ship_mask_list
+
+    def test_parity(self) -> None:
+        """
+        Batched and scalar engines must give the same results for the same seeded shots
+        """
+        board_batch = BoardBatch(self.BOARD_COUNT, np.random.default_rng(self.SEED))
+        board_batch.populate()
+        board_list = [board_batch.to_board(row) for row in range(self.BOARD_COUNT)]
+        random = Random(self.SEED)
+        order_list = []
+        for _ in range(self.BOARD_COUNT):
+            order = list(range(Board.BOARD_SIZE))
+            random.shuffle(order)
+            order_list.append(order)
+        for move in range(Board.BOARD_SIZE):
+            xs, ys = np.divmod(np.array([order[move] for order in order_list]), Board.BOARD_DIM)
+            result = board_batch.hit(xs, ys)
+            for row, board in enumerate(board_list):
+                assert result[row] == board.hit(int(xs[row]), int(ys[row]))
+                assert board_batch.finished[row] == board.finished
+        assert board_batch.finished.all()
+        for row, board in enumerate(board_list):
+            assert board_batch.to_board(row).encode() == board.encode()
+
+    def test_from_boards(self) -> None:
+        """
+        Batch built from scalar boards keeps their state
+        """
+        board_list = [Board() for _ in range(8)]
+        for board in board_list:
+            board.hit(0, 0)
+        board_batch = BoardBatch.from_boards(board_list)
+        for row, board in enumerate(board_list):
+            assert board_batch.to_board(row).encode() == board.encode()
+        # Second shot on the same cell is invalid for every engine
+        with pytest.raises(ValueError):
+            board_batch.hit(np.zeros(8), np.zeros(8))
+        with pytest.raises(ValueError):
+            board_batch.hit(np.full(8, Board.BOARD_DIM), np.zeros(8))
+        result = board_batch.hit(np.ones(8), np.ones(8))
+        for row, board in enumerate(board_list):
+            assert HitResult(result[row]) == board.hit(1, 1)
+
+    def test_rules(self) -> None:
+        """
+        Batch follows the dimension and fleet of a rules class and returns boards of that class
+        """
+        board_type = Board.with_rules(7, [2, 2, 4])
+        board_batch = BoardBatch(self.BOARD_COUNT, np.random.default_rng(self.SEED), board_type=board_type)
+        board_batch.populate()
+        assert board_batch.ship_id.shape == (self.BOARD_COUNT, 49)
+        assert (board_batch.remaining_part_count == 8).all()
+        board_list = [board_batch.to_board(row) for row in range(self.BOARD_COUNT)]
+        for board in board_list:
+            assert type(board) is board_type
+            assert [len(cell_tuple) for cell_tuple in board.return_layout()] == [2, 2, 4]
+        with pytest.raises(ValueError):
+            board_batch.hit(np.full(self.BOARD_COUNT, 7), np.zeros(self.BOARD_COUNT))
+        result = board_batch.hit(np.full(self.BOARD_COUNT, 6), np.full(self.BOARD_COUNT, 6))
+        for row, board in enumerate(board_list):
+            assert HitResult(result[row]) == board.hit(6, 6)
+        assert type(BoardBatch.from_boards([board_type() for _ in range(4)]).to_board(0)) is board_type
+
+    def test_distribution(self) -> None:
+        """
+        Batched and scalar populations place the same ship count with the same cell occupancy distribution
+        """
+        board_count = 4000
+        board_batch = BoardBatch(board_count, np.random.default_rng(self.SEED))
+        board_batch.populate()
+        batch_count = (board_batch.ship_id >= 0).sum(axis=0)
+        assert ((board_batch.ship_id >= 0).sum(axis=1) == Board.SHIP_PART_COUNT).all()
+        assert (np.stack([(board_batch.ship_id == ship_id).sum(axis=1) for ship_id in range(len(Board.SHIP_SIZE_LIST))], axis=1) == Board.SHIP_SIZE_LIST).all()
+        random = Random(self.SEED)
+        board_count_list = np.zeros(Board.BOARD_SIZE)
+        for _ in range(board_count):
+            board = Board(rng=random)
+            assert len(board.ship_mask_list) == len(Board.SHIP_SIZE_LIST)
+            board_count_list[list(iterate_mask(board.ship_mask))] += 1
+        # Occupancy of each cell is a binomial count -> Five standard deviations of its difference
+        frequency = (batch_count + board_count_list) / (2 * board_count)
+        tolerance = 5 * np.sqrt(2 * board_count * frequency * (1 - frequency))
+        assert (np.abs(batch_count - board_count_list) <= tolerance).all()
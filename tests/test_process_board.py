@@ -0,0 +1,238 @@
+from random import Random
+
+from process.board import Board, HitResult, iterate_mask
+import pytest
+
+
+class TestProcessBoard:
+
+    def test_populate(self) -> None:
+        """
+        Populate function of the board
+        """
+        board = Board()
+
+        # Check if ship cell count equals to total ship part count
+        assert bin(board.ship_mask).count("1") == Board.SHIP_PART_COUNT
+        # Check if cell for each ship part is correct
+        ship_cell_count = 0
+        for x in range(Board.BOARD_DIM):
+            for y in range(Board.BOARD_DIM):
+                if board.get_cell(x, y) == Board.SHIP:
+                    ship_cell_count += 1
+                else:
+                    assert board.get_cell(x, y) == Board.EMPTY
+        assert ship_cell_count == Board.SHIP_PART_COUNT
+
+    def test_hit(self) -> None:
+        """
+        Test hit function
+        Empty -> Miss
+        Ship -> Hit, Sunk when it is the last part of the ship, Finished when it is the last part of the fleet
+        Hit/Miss -> Error
+        """
+        board = Board()
+        sunk_count = 0
+        for x in range(Board.BOARD_DIM):
+            for y in range(Board.BOARD_DIM):
+                is_ship = board.get_cell(x, y) == Board.SHIP
+                result = board.hit(x, y)
+                assert bool(result) is is_ship
+                assert board.get_cell(x, y) == (Board.HIT if is_ship else Board.MISS)
+                if result >= HitResult.SUNK:
+                    ship_mask = board.ship_mask_list[board.get_ship_id(x, y)]
+                    assert board.hit_mask & ship_mask == ship_mask
+                    sunk_count += 1
+                assert board.finished is (sunk_count == len(Board.SHIP_SIZE_LIST))
+                with pytest.raises(ValueError):
+                    board.hit(x, y)
+        assert board.finished is True
+        assert sunk_count == len(Board.SHIP_SIZE_LIST)
+
+    def test_hit_boundaries(self) -> None:
+        """
+        Test boundaries for hit function
+        """
+        board = Board()
+        with pytest.raises(ValueError):
+            board.hit(Board.BOARD_DIM, Board.BOARD_DIM)
+        with pytest.raises(ValueError):
+            board.hit(-1, 0)
+        with pytest.raises(ValueError):
+            board.hit(0, Board.BOARD_DIM)
+
+    def test_serialize(self) -> None:
+        """
+        Test serialize & deserialize round trip and hidden ships
+        """
+        board = Board()
+        board.hit(0, 0)
+        board.hit(5, 5)
+        serialized_str = board.serialize()
+        assert len(serialized_str) == Board.BOARD_SIZE
+        assert serialized_str.count(str(Board.SHIP)) + serialized_str.count(str(Board.HIT)) == Board.SHIP_PART_COUNT
+        assert str(Board.SHIP) not in board.serialize(hide_ships=True)
+
+        other_board = Board()
+        other_board.deserialize(serialized_str)
+        assert other_board.serialize() == serialized_str
+        assert other_board.ship_mask == board.ship_mask
+        assert other_board.hit_mask == board.hit_mask
+        assert other_board.miss_mask == board.miss_mask
+        assert other_board.remaining_part_count == board.remaining_part_count
+        # Text boards are views -> Ship cells without ship ids
+        assert other_board.ship_mask_list == []
+        assert other_board.get_ship_id(0, 0) is None
+        with pytest.raises(ValueError):
+            other_board.deserialize(serialized_str[1:])
+        with pytest.raises(ValueError):
+            other_board.deserialize(serialized_str.replace(str(Board.EMPTY), "4", 1))
+
+        # Hidden views and partial fleets are loaded as they are
+        other_board.deserialize(board.serialize(hide_ships=True))
+        assert other_board.ship_mask == board.hit_mask
+        assert other_board.finished is False
+        other_board.deserialize(serialized_str.replace(str(Board.SHIP), str(Board.EMPTY), 1))
+        assert other_board.remaining_part_count == board.remaining_part_count - 1
+
+        # Hits on a full view finish it once the whole fleet is hit
+        other_board.deserialize(serialized_str)
+        result_list = [other_board.hit(*divmod(index, Board.BOARD_DIM)) for index in iterate_mask(board.ship_mask & ~board.hit_mask)]
+        assert result_list[:-1] == [Board.RESULT_HIT] * (len(result_list) - 1)
+        assert result_list[-1] == Board.RESULT_FINISHED
+        assert other_board.finished is True
+
+    def test_placement_table(self) -> None:
+        """
+        Test legal placement table and placement choice
+        """
+        ship_size = 5
+        placement_table = Board.return_placement_table(ship_size)
+        # Horizontal and vertical placements in every row and column
+        assert len(placement_table.ship_mask_list) == 2 * Board.BOARD_DIM * (Board.BOARD_DIM - ship_size + 1)
+        assert Board.return_placement_table(ship_size) is placement_table
+        # Block every placement covering the center cell
+        center_index = Board.BOARD_SIZE // 2 + Board.BOARD_DIM // 2
+        blocked_mask = placement_table.block(0, (center_index,))
+        available_mask = placement_table.all_mask & ~blocked_mask
+        available_count = bin(available_mask).count("1")
+        chosen_set = set()
+        for rank in range(available_count):
+            placement_index = placement_table.choose(available_mask, lambda _: rank)
+            assert not placement_table.ship_mask_list[placement_index] >> center_index & 1
+            chosen_set.add(placement_index)
+        # Each rank selects a distinct available placement
+        assert len(chosen_set) == available_count
+        assert placement_table.choose(0, lambda _: 0) == -1
+
+    def test_encode(self) -> None:
+        """
+        Test packed encoding round trip, hidden ships and opponent view cache
+        """
+        board = Board()
+        board.hit(0, 0)
+        board.hit(9, 9)
+        encoded = board.encode()
+        # Bit planes followed by a ship start per ship
+        assert len(encoded) == 2 * ((Board.BOARD_SIZE + 7) // 8) + len(Board.SHIP_SIZE_LIST) * Board.return_start_byte_count()
+
+        other_board = Board()
+        other_board.decode_base64(board.encode_base64())
+        assert other_board.serialize() == board.serialize()
+        assert other_board.remaining_part_count == board.remaining_part_count
+        assert other_board.ship_mask_list == board.ship_mask_list
+        # Ship starts are cached until the ships change
+        assert board.encode_ship_starts() is board.encode_ship_starts()
+
+        # Hidden view keeps hits & misses only
+        ship_mask, hit_mask, miss_mask = Board.decode_masks(board.encode(hide_ships=True))
+        assert ship_mask == 0
+        assert hit_mask == board.hit_mask
+        assert miss_mask == board.miss_mask
+        # Hidden view is cached until the next hit
+        assert board.encode(hide_ships=True) is board.encode(hide_ships=True)
+        board.hit(5, 5)
+        assert board.hidden_view is None
+        assert Board.decode_masks(board.encode(hide_ships=True))[2] == board.miss_mask
+        with pytest.raises(ValueError):
+            other_board.decode(encoded[1:])
+
+        # Hidden views decode without ship ids
+        other_board.decode(board.encode(hide_ships=True))
+        assert other_board.hit_mask == board.hit_mask
+        assert other_board.ship_mask_list == []
+        with pytest.raises(ValueError):
+            # Ship starts must match the ship cells
+            other_board.decode(board.encode(hide_ships=True) + encoded[len(board.encode(hide_ships=True)):])
+
+    def test_encode_ship_identity(self) -> None:
+        """
+        Equal ships lying end to end must keep their ship ids through the packed encoding
+        """
+        board_type = Board.with_rules(5, [2, 2])
+        board = board_type()
+        # Second ship holds the lower cells -> Any partition of the cells would swap the ships
+        first_ship_mask = board_type.return_ship_mask(0, 2, Board.UP, 2)
+        second_ship_mask = board_type.return_ship_mask(0, 0, Board.UP, 2)
+        board.load_ships([first_ship_mask, second_ship_mask], 0, 0)
+        assert board.hit(0, 3) == Board.RESULT_HIT
+
+        other_board = board_type()
+        other_board.decode(board.encode())
+        assert other_board.ship_mask_list == [first_ship_mask, second_ship_mask]
+        assert other_board.hit(0, 2) == Board.RESULT_SUNK
+        assert other_board.get_surviving_ship_count() == 1
+        with pytest.raises(ValueError):
+            # Overlapping ship starts
+            other_board.decode(board.encode()[:-1] + board.encode()[-2:-1])
+
+    def test_seeded_random(self) -> None:
+        """
+        Boards populated from the same seed must be identical
+        """
+        first_board = Board(Random(42))
+        second_board = Board(Random(42))
+        assert first_board.ship_mask_list == second_board.ship_mask_list
+        assert Board(Random(43)).ship_mask_list != first_board.ship_mask_list
+
+    def test_hit_many(self) -> None:
+        """
+        Test volley of shots -> Same results as single hits, invalid volleys register nothing
+        """
+        board = Board(Random(11))
+        other_board = Board(Random(11))
+        coordinate_list = [(x, y) for x in range(Board.BOARD_DIM) for y in range(Board.BOARD_DIM)]
+        for volley_index in range(0, Board.BOARD_SIZE, 5):
+            volley = coordinate_list[volley_index:volley_index + 5]
+            assert board.hit_many(volley) == [other_board.hit(x, y) for x, y in volley]
+            assert board.finished is other_board.finished
+            assert board.get_surviving_ship_count() == sum(1 for remaining in other_board.ship_remaining_list if remaining > 0)
+        assert board.encode() == other_board.encode()
+
+        board = Board()
+        with pytest.raises(ValueError):
+            board.hit_many([(0, 0), (0, 0)])
+        with pytest.raises(ValueError):
+            board.hit_many([(0, 1), (Board.BOARD_DIM, 0)])
+        assert board.hit_mask == board.miss_mask == 0
+        board.hit_many([(0, 0)])
+        with pytest.raises(ValueError):
+            board.hit_many([(1, 1), (0, 0)])
+        assert bin(board.hit_mask | board.miss_mask).count("1") == 1
+
+    def test_populate_retry(self, monkeypatch) -> None:
+        """
+        Layout that runs out of room is drawn again, fleets that keep running out of room are rejected with their rules
+        """
+        # Small ships first often leave no row or column for the long ones
+        ship_size_list = [1, 2, 3, 4, 6, 6, 9, 9]
+        board_type = Board.with_rules(9, ship_size_list)
+        random = Random(1)
+        for _ in range(200):
+            board = board_type(random)
+            assert sorted(len(cell_tuple) for cell_tuple in board.return_layout()) == ship_size_list
+        monkeypatch.setattr(Board, "RULES_CACHE", {})
+        monkeypatch.setattr(Board, "MAX_LAYOUT_COUNT", 1)
+        with pytest.raises(ValueError):
+            Board.with_rules(9, ship_size_list)
+        assert Board.RULES_CACHE == {}
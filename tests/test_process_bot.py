@@ -0,0 +1,85 @@
+from random import Random
+
+from process.board import Board, HitResult
+from process.bot import STRATEGY_DICT, ProbabilityDensityStrategy
+from process.tournament import play_games, summarize
+
+
+class TestProbabilityDensityStrategy:
+
+    @staticmethod
+    def play(board: Board, strategy: ProbabilityDensityStrategy, shot_limit: int = Board.BOARD_SIZE) -> int:
+        """Play strategy against board until the fleet is sunk and return shot count"""
+        shot_set = set()
+        while board.finished is False and len(shot_set) < shot_limit:
+            x, y = strategy.choose()
+            # Cell must not be shot twice
+            assert (x, y) not in shot_set
+            shot_set.add((x, y))
+            result = board.hit(x, y)
+            sunk_size = Board.SHIP_SIZE_LIST[board.get_ship_id(x, y)] if result >= HitResult.SUNK else None
+            strategy.record(x, y, result, sunk_size)
+        return len(shot_set)
+
+    def test_play(self) -> None:
+        """
+        Strategy must sink the fleet in fewer shots than the board has cells
+        """
+        for seed in range(20):
+            rng = Random(seed)
+            assert self.play(Board(rng), ProbabilityDensityStrategy(rng)) < Board.BOARD_SIZE
+
+    def test_incremental_density(self) -> None:
+        """
+        Incrementally updated density must equal a recount over available placements
+        """
+        rng = Random(3)
+        board = Board(rng)
+        strategy = ProbabilityDensityStrategy(rng)
+        for shot_limit in (10, 30, Board.BOARD_SIZE):
+            self.play(board, strategy, shot_limit)
+            density = [0] * Board.BOARD_SIZE
+            for ship_size, table in strategy.table_dict.items():
+                for placement_index, cell_tuple in enumerate(table.cell_list):
+                    if strategy.available_dict[ship_size] >> placement_index & 1:
+                        for index in cell_tuple:
+                            density[index] += strategy.ship_count_dict[ship_size]
+            assert strategy.density == density
+        # Every ship is sunk -> Nothing is left to score
+        assert sum(strategy.ship_count_dict.values()) == 0
+        assert strategy.unresolved_mask == 0
+
+    def test_move_budget(self) -> None:
+        """
+        Time spent recording the last result counts against the move, an exhausted budget skips target scoring
+        """
+        strategy = ProbabilityDensityStrategy(Random(4), move_budget=1.0)
+        x, y = 4, 4
+        strategy.record(x, y, HitResult.HIT)
+        assert strategy.record_seconds > 0
+        # Target scoring picks a neighbour of the hit
+        target_x, target_y = strategy.choose()
+        assert abs(target_x - x) + abs(target_y - y) == 1
+        assert strategy.budget_exceeded_count == 0 and strategy.record_seconds == 0
+        # Last record() used up the budget -> Hunt scores answer and the move is counted
+        strategy.record(target_x, target_y, HitResult.MISS)
+        strategy.record_seconds = 2.0
+        hunt_x, hunt_y = strategy.choose()
+        assert not strategy.shot_mask >> (hunt_x * Board.BOARD_DIM + hunt_y) & 1
+        assert strategy.budget_exceeded_count == 1
+
+
+class TestTournament:
+
+    def test_play_games(self) -> None:
+        """
+        Every strategy sinks the fleet and results are reproducible with the same seed
+        """
+        for name in STRATEGY_DICT:
+            first_counter, second_counter, first_win_count = play_games(name, "density", seed=5, game_count=5)
+            assert sum(first_counter.values()) == sum(second_counter.values()) == 5
+            assert Board.SHIP_PART_COUNT <= min(first_counter) <= max(first_counter) <= Board.BOARD_SIZE
+            assert 0 <= first_win_count <= 5
+            assert play_games(name, "density", seed=5, game_count=5) == (first_counter, second_counter, first_win_count)
+        summary = summarize(first_counter)
+        assert summary["min"] <= summary["p50"] <= summary["max"]
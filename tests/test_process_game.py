@@ -0,0 +1,259 @@
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from process.board import Board
+from process.game import BoardPool, GameManager, GameSession, GameState, GameStateWriter, ReplayBuffer
+from process.sparse import SparseBoard
+
+
+class TestBoardPool:
+
+    def test_pop(self) -> None:
+        """
+        Empty pool populates inline and counts a miss, filled pool counts a hit
+        """
+        board_pool = BoardPool(size=4, refill=2)
+        assert isinstance(board_pool.pop(), Board)
+        assert board_pool.stats()["miss"] == 1
+        # Refill is requested as stock is below the refill level
+        assert board_pool.refill_event.is_set()
+        board_pool.board_deque.extend(Board() for _ in range(4))
+        board = board_pool.pop()
+        assert board.remaining_part_count == Board.SHIP_PART_COUNT
+        assert board_pool.stats() == {"size": 4, "stock": 3, "hit": 1, "miss": 1}
+
+    def test_refill(self) -> None:
+        """
+        Background thread fills the pool up to its size
+        """
+        board_pool = BoardPool(size=8, refill=4)
+        board_pool.start()
+        for _ in range(1000):
+            if len(board_pool.board_deque) == 8:
+                break
+            board_pool.thread.join(timeout=0.01)
+        assert len(board_pool.board_deque) == 8
+
+
+class TestGameStateWriter:
+
+    def test_flush(self) -> None:
+        """
+        Repeated changes of a game are written as one row per flush with the latest values
+        """
+        batch_list = []
+        writer = GameStateWriter(interval=60)
+        writer.write_func = batch_list.append
+        state = GameState(1, 10, 20, False)
+        for move_number in range(1, 6):
+            state.move_number = move_number
+            writer.mark(state)
+        writer.mark(GameState(2, 11, None, True))
+        assert writer.flush() == 2
+        assert batch_list[0][0] == {
+            "id": 1, "creator_user_ready": False, "second_user_ready": False, "turn": None, "move_number": 5, "finished": False, "seed": None
+        }
+        assert batch_list[0][1]["second_user_ready"] is True
+        assert writer.flush() == 0 and len(batch_list) == 1
+        assert writer.stats() == {"dirty": 0, "marks": 6, "flushes": 1, "rows": 2, "errors": 0}
+
+    def test_failed_flush(self) -> None:
+        """
+        States of a failed write are kept for the next flush
+        """
+        def fail(mapping_list) -> None:
+            raise RuntimeError("Database is locked")
+
+        writer = GameStateWriter(interval=60)
+        writer.write_func = fail
+        writer.mark(GameState(1, 10, 20, False))
+        assert writer.flush() == 0
+        assert writer.get_pending(1) is not None
+        batch_list = []
+        writer.write_func = batch_list.append
+        writer.stop()
+        assert len(batch_list[0]) == 1 and writer.get_pending(1) is None
+        assert writer.stats()["errors"] == 1
+
+    def test_other_user_id(self) -> None:
+        """
+        Bot plays with the negative game id, missing second user is None
+        """
+        assert GameState(3, 10, None, True).get_other_user_id(10) == -3
+        assert GameState(3, 10, 20, False).get_other_user_id(20) == 10
+        assert GameState(3, 10, None, False).get_other_user_id(10) is None
+
+
+class TestGameManager:
+
+    def test_create_boards(self) -> None:
+        """
+        Recorded seed rebuilds the exact boards of a game
+        """
+        creator_board, second_board = GameManager.create_boards(7)
+        rebuilt_creator_board, rebuilt_second_board = GameManager.create_boards(7)
+        assert creator_board.encode() == rebuilt_creator_board.encode()
+        assert second_board.encode() == rebuilt_second_board.encode()
+        assert creator_board.encode() != second_board.encode()
+
+    def test_return_board_type(self) -> None:
+        """
+        Standard rules use Board, small custom boards use bitboards and large boards are sparse
+        """
+        assert GameManager.return_board_type(None, None) is Board
+        board_type = GameManager.return_board_type(20, [3, 3])
+        assert issubclass(board_type, Board) and board_type.BOARD_DIM == 20
+        creator_board, second_board = GameManager.new_boards(None, board_type)
+        assert creator_board.remaining_part_count == second_board.remaining_part_count == 6
+        assert issubclass(GameManager.return_board_type(1000, None), SparseBoard)
+
+    def test_session_lifecycle(self, monkeypatch) -> None:
+        """
+        Sessions are indexed by both users, evicted on finish and after TTL of inactivity
+        """
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "SESSION_TTL", 100)
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(GameManager, "FINISHED_SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "FINISHED_USER_SESSIONS", {})
+        for game_id in range(3):
+            GameManager.add_session(GameSession(game_id, 10 + game_id, 20 + game_id, Board(), Board()), now=game_id)
+        session = GameManager.get_user_session(21)
+        assert session is GameManager.get_session(1) is GameManager.get_user_session(11)
+        assert session.get_other_user_id(21) == 11 and session.get_board(11) is not session.get_board(21)
+        # Finished game leaves both indexes
+        GameManager.finish_session(1, now=2)
+        assert GameManager.get_user_session(11) is None and GameManager.get_user_session(21) is None
+        # Activity keeps game 0 alive, game 2 expires when a new game is added
+        GameManager.touch_session(GameManager.get_session(0), now=50)
+        assert GameManager.evict_expired(now=101) == 0
+        GameManager.add_session(GameSession(3, 13, -3, Board(), Board()), now=102)
+        assert GameManager.get_session(2) is None and GameManager.get_session(0) is not None
+        assert GameManager.evict_expired(now=150) == 1
+        assert GameManager.stats() == {"sessions": 1, "users": 2, "placed_fleets": len(GameManager.PLACED_FLEETS), "game_states": len(GameManager.GAME_STATES), "created": 4, "finished": 1, "expired": 2, "peak": 3}
+
+    def test_finished_session(self, monkeypatch) -> None:
+        """
+        Finished session can be resumed by both users until FINISHED_TTL passes or a user starts another game
+        """
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "FINISHED_SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "FINISHED_USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "FINISHED_TTL", 60)
+        session_list = [GameSession(game_id, 10 + game_id, 20 + game_id, Board(), Board()) for game_id in range(2)]
+        for session in session_list:
+            GameManager.add_session(session, now=0)
+        GameManager.finish_session(0, now=10)
+        GameManager.finish_session(1, now=30)
+        assert GameManager.get_user_session(10) is None
+        assert GameManager.get_finished_session(10, now=69) is session_list[0] is GameManager.get_finished_session(20, now=69)
+        assert GameManager.get_finished_session(10, now=70) is None and GameManager.get_finished_session(21, now=70) is session_list[1]
+        # New game of a user replaces the finished one
+        GameManager.add_session(GameSession(2, 21, 22, Board(), Board()), now=71)
+        assert GameManager.get_finished_session(21, now=72) is None and GameManager.get_finished_session(11, now=72) is session_list[1]
+        GameManager.evict_expired(now=90)
+        assert GameManager.FINISHED_SESSIONS == {} and GameManager.FINISHED_USER_SESSIONS == {}
+
+    def test_is_finished(self, monkeypatch) -> None:
+        """
+        Game finished in memory counts as finished before its row is written
+        """
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "FINISHED_SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        row_list = [SimpleNamespace(id=game_id, finished=False) for game_id in range(4)]
+        for game_id in range(3):
+            state = GameState(game_id, 10 + game_id, 20 + game_id, False)
+            state.finished = True
+            if game_id == 0:
+                GameManager.GAME_STATES[game_id] = state
+            elif game_id == 1:
+                GameManager.mark_state(state)
+            else:
+                GameManager.FINISHED_SESSIONS[game_id] = GameSession(game_id, 12, 22, Board(), Board(), state=state)
+        assert [GameManager.is_finished(row) for row in row_list] == [True, True, True, False]
+        assert GameManager.is_finished(SimpleNamespace(id=3, finished=True)) is True
+
+    def test_evict_expired(self, monkeypatch) -> None:
+        """
+        Evicted game is marked as finished without a turn and its state is queued for the DB
+        """
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "SESSION_TTL", 100)
+        batch_list = []
+        writer = GameStateWriter(interval=60)
+        writer.write_func = batch_list.append
+        monkeypatch.setattr(GameManager, "STATE_WRITER", writer)
+        session = GameSession(1, 10, 20, Board(), Board())
+        session.state.turn = 10
+        session.state.move_number = 7
+        GameManager.add_session(session, now=0)
+        GameManager.add_session(GameSession(2, 11, 21, Board(), Board()), now=50)
+        assert GameManager.evict_expired(now=120) == 1
+        assert session.state.finished is True and session.state.turn is None
+        assert writer.flush() == 1
+        assert batch_list[0][0]["id"] == 1 and batch_list[0][0]["finished"] is True and batch_list[0][0]["turn"] is None
+        assert batch_list[0][0]["move_number"] == 7
+        assert GameManager.get_session(2).state.finished is False
+
+    def test_sweep(self, monkeypatch) -> None:
+        """
+        Sweep task evicts idle sessions without any new game being added
+        """
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(GameManager, "SESSION_TTL", 0.05)
+        monkeypatch.setattr(GameManager, "SWEEP_INTERVAL", 0.01)
+        session = GameSession(1, 10, 20, Board(), Board())
+        GameManager.add_session(session)
+
+        async def run() -> None:
+            GameManager.start_sweeper()
+            await asyncio.sleep(0.02)
+            assert GameManager.get_session(1) is session
+            await asyncio.sleep(0.1)
+            GameManager.stop_sweeper()
+
+        asyncio.run(run())
+        assert GameManager.get_session(1) is None and session.state.finished is True
+        assert GameManager.SESSION_COUNTER["expired"] == 1 and GameManager.SWEEP_TASK is None
+
+
+class TestReplayBuffer:
+
+    def test_return_frames(self) -> None:
+        """
+        Missed frames are replayed until they fall out of the buffer
+        """
+        replay_buffer = ReplayBuffer(size=3)
+        for seq in range(1, 6):
+            replay_buffer.append(seq, {"seq": seq})
+        assert replay_buffer.return_frames(3) == [(4, {"seq": 4}), (5, {"seq": 5})]
+        assert replay_buffer.return_frames(2) == [(3, {"seq": 3}), (4, {"seq": 4}), (5, {"seq": 5})]
+        assert replay_buffer.return_frames(5) == []
+        # Frame 2 is no longer buffered
+        assert replay_buffer.return_frames(1) is None
+
+    def test_record_frame(self) -> None:
+        """
+        Frames of both users share the game sequence, bot has no buffer
+        """
+        session = GameSession(1, 11, 21, Board(), Board())
+        for user_id, frame in ((11, "TURN"), (21, "TURN"), (11, "BOARD")):
+            session.next_sequence()
+            session.record_frame(user_id, {"type": frame})
+        assert session.sequence == 3
+        assert session.replay_dict[11].return_frames(1) == [(3, {"type": "BOARD"})]
+        assert session.replay_dict[21].return_frames(1) == [(2, {"type": "TURN"})]
+        assert list(GameSession(2, 12, -2, Board(), Board(), GameManager.new_bot(None)).replay_dict) == [12]
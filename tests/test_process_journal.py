@@ -0,0 +1,112 @@
+import os
+from collections import OrderedDict
+from random import Random
+
+from process.board import Board
+from process.game import GameManager, GameSession, GameStateWriter
+from process.journal import GameJournal, RecordType
+from process.sparse import SparseBoard
+
+
+class TestGameJournal:
+
+    def test_layout(self) -> None:
+        """
+        Boards rebuilt from a layout have the same ships and ship ids
+        """
+        rng = Random(3)
+        for board_type in (Board, Board.with_rules(16, [2, 3, 3, 4, 5, 6]), SparseBoard.with_rules(100, Board.SHIP_SIZE_LIST)):
+            board = board_type(rng)
+            rebuilt_board = board_type.from_layout(board.return_layout())
+            assert rebuilt_board.return_layout() == board.return_layout()
+            assert rebuilt_board.remaining_part_count == board_type.SHIP_PART_COUNT
+
+    def test_torn_tail(self, tmp_path) -> None:
+        """
+        Reading stops at a record that was not completely written
+        """
+        journal = GameJournal(str(tmp_path / "journal"), interval=60)
+        journal.start()
+        journal.record_turn(1, 10, 1)
+        journal.record_turn(1, 20, 2)
+        journal.stop()
+        with open(journal.path, "ab") as file:
+            file.write(GameJournal.HEADER.pack(RecordType.TURN, 1, GameJournal.TURN.size, 0) + b"\x00")
+        assert [GameJournal.decode_turn(payload) for _, _, payload in GameJournal.read_records(journal.path)] == [(10, 1), (20, 2)]
+        byte_count = 2 * (GameJournal.HEADER.size + GameJournal.TURN.size)
+        assert journal.stats() == {"records": 2, "syncs": 1, "bytes": byte_count, "buffered": 0, "file_bytes": byte_count, "compactions": 0}
+
+    def test_compact_open(self, tmp_path) -> None:
+        """
+        Open journal is rewritten with merged records of unfinished games once it doubled, later records are appended to it
+        """
+        journal = GameJournal(str(tmp_path / "journal"), interval=60, compact_bytes=1)
+        journal.start()
+        for game_id in (1, 2):
+            board_tuple = (Board(Random(game_id)), Board(Random(game_id + 2)))
+            journal.record_start(
+                game_id, (game_id * 10, game_id * 10 + 1), False, None, Board.BOARD_DIM, Board.SHIP_SIZE_LIST, tuple(board.return_layout() for board in board_tuple)
+            )
+        journal.record_shots(1, 10, [3, 4])
+        journal.record_shots(1, 10, [5])
+        for move_number in range(1, 4):
+            journal.record_turn(1, 11, move_number)
+        journal.record_end(2)
+        journal.sync()
+        assert journal.needs_compaction() is True
+        byte_count = journal.compact_open()
+        assert journal.needs_compaction() is False
+        assert [record_type for record_type, _, _ in GameJournal.read_records(journal.path)] == [RecordType.START, RecordType.SHOTS, RecordType.TURN]
+        journal.record_shots(1, 11, [7])
+        journal.stop()
+        record_list = list(GameJournal.read_records(journal.path))
+        assert {game_id for _, game_id, _ in record_list} == {1}
+        assert GameJournal.merge_shots([payload for record_type, _, payload in record_list if record_type == RecordType.SHOTS]) == {10: [3, 4, 5], 11: [7]}
+        assert GameJournal.decode_turn(record_list[2][2]) == (11, 3)
+        assert journal.stats()["file_bytes"] == os.path.getsize(journal.path) > byte_count
+        assert journal.stats()["compactions"] == 1
+
+    def test_recover_sessions(self, tmp_path, monkeypatch) -> None:
+        """
+        Unfinished games are rebuilt with their shots and turn, finished games are dropped from the journal
+        """
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(GameManager, "JOURNAL", GameJournal(str(tmp_path / "journal"), interval=60))
+        GameManager.JOURNAL.start()
+        session = GameSession(1, 11, 21, Board(), Board())
+        bot_session = GameSession(2, 12, -2, Board(), Board(), GameManager.new_bot(5))
+        bot_session.state.seed = 5
+        for game_session in (session, bot_session, GameSession(3, 13, 23, Board(), Board())):
+            GameManager.add_session(game_session)
+            GameManager.record_start(game_session)
+        session.get_board(21).hit_many([(0, 0), (1, 1)])
+        GameManager.record_shots(session, 11, [(0, 0), (1, 1)])
+        session.state.turn, session.state.move_number = 21, 2
+        GameManager.record_turn(session)
+        for x, y in ((4, 4), (5, 5)):
+            hit_result = bot_session.get_board(12).hit(x, y)
+            bot_session.bot.record(x, y, hit_result)
+        GameManager.record_shots(bot_session, -2, [(4, 4), (5, 5)])
+        GameManager.finish_session(3)
+        GameManager.JOURNAL.stop()
+        board_dict = {user_id: board.encode() for game_session in (session, bot_session) for user_id, board in game_session.board_dict.items()}
+        GameManager.SESSIONS.clear()
+        GameManager.USER_SESSIONS.clear()
+        GameManager.GAME_STATES.clear()
+
+        assert GameManager.recover_sessions() == 2
+        assert GameManager.get_session(3) is None
+        recovered_session = GameManager.get_user_session(21)
+        assert (recovered_session.state.turn, recovered_session.state.move_number) == (21, 2)
+        assert GameManager.GAME_STATES[1] is recovered_session.state
+        recovered_bot_session = GameManager.get_user_session(12)
+        assert recovered_bot_session.is_bot(-2) and recovered_bot_session.state.seed == 5
+        assert recovered_bot_session.bot.shot_mask == bot_session.bot.shot_mask
+        for game_session in (recovered_session, recovered_bot_session):
+            for user_id, board in game_session.board_dict.items():
+                assert board.encode() == board_dict[user_id]
+        # Compacted journal keeps records of unfinished games only
+        assert {game_id for _, game_id, _ in GameJournal.read_records(GameManager.JOURNAL.path)} == {1, 2}
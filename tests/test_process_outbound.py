@@ -0,0 +1,89 @@
+import asyncio
+from typing import List
+
+from process.outbound import OutboundConnection, PutResult
+
+
+class FakeWebsocket:
+    """Websocket whose sends wait until the test opens the gate"""
+
+    def __init__(self) -> None:
+        self.frame_list: List[str] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.close_code = None
+
+    async def send_text(self, frame: str) -> None:
+        await self.gate.wait()
+        self.frame_list.append(frame)
+
+    async def send_bytes(self, frame: bytes) -> None:
+        await self.send_text(frame)
+
+    async def close(self, code: int) -> None:
+        self.close_code = code
+
+
+class TestOutboundConnection:
+
+    def test_order_and_drain(self) -> None:
+        """
+        Frames are sent in order by the writer task and queued frames are sent on close
+        """
+        async def run() -> None:
+            websocket = FakeWebsocket()
+            connection = OutboundConnection(websocket, high_water=8, limit=16, evict_after=1)
+            connection.start()
+            for seq in range(5):
+                assert connection.put(str(seq)) == PutResult.QUEUED
+            await connection.close()
+            assert websocket.frame_list == [str(seq) for seq in range(5)]
+            assert connection.stats()["sent"] == 5 and connection.stats()["depth"] == 0
+            assert connection.put("5") == PutResult.CLOSED
+
+        asyncio.run(run())
+
+    def test_evict(self) -> None:
+        """
+        Consumer is evicted at the queue limit, or after staying at high water for evict_after seconds
+        """
+        async def run() -> None:
+            connection_list = []
+            for now_list in ([0] * 17, [0] * 4 + [1, 3]):
+                websocket = FakeWebsocket()
+                websocket.gate.clear()
+                connection = OutboundConnection(websocket, high_water=4, limit=16, evict_after=2)
+                connection.start()
+                for now in now_list[:-1]:
+                    assert connection.put(str(now), now=now) == PutResult.QUEUED
+                assert connection.put(str(now_list[-1]), now=now_list[-1]) == PutResult.EVICTED
+                # Later frames find the connection closed -> The consumer is evicted once
+                assert connection.put("late", now=now_list[-1]) == PutResult.CLOSED
+                connection_list.append((connection, websocket))
+            await asyncio.sleep(0)
+            for connection, websocket in connection_list:
+                assert connection.evicted is True and websocket.close_code == OutboundConnection.EVICT_CLOSE_CODE
+                assert len(websocket.frame_list) == 0 and connection.stats()["depth"] == 0
+
+        asyncio.run(run())
+
+    def test_drained_high_water(self) -> None:
+        """
+        A consumer that catches up below high water is not evicted for an earlier backlog
+        """
+        async def run() -> None:
+            websocket = FakeWebsocket()
+            websocket.gate.clear()
+            connection = OutboundConnection(websocket, high_water=2, limit=16, evict_after=2)
+            connection.start()
+            for index in range(3):
+                connection.put(str(index), now=0)
+            assert connection.over_since == 0
+            websocket.gate.set()
+            await asyncio.sleep(0.01)
+            assert connection.over_since is None
+            assert connection.put("3", now=10) == PutResult.QUEUED
+            await connection.close()
+            assert len(websocket.frame_list) == 4 and connection.stats()["peak_depth"] == 3
+
+        asyncio.run(run())
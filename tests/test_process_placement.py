@@ -0,0 +1,117 @@
+from random import Random
+from typing import List, Tuple
+
+from process.board import Board, iterate_mask
+from process.sparse import SparseBoard
+import pytest
+
+
+def is_valid_fleet(ship_list: List[List[Tuple[int, int]]], board_dim: int, ship_size_list: List[int]) -> bool:
+    """Reference check of a placed fleet -> Plain coordinate comparisons"""
+    occupied_set = set()
+    for cell_list in ship_list:
+        if any(not 0 <= x < board_dim or not 0 <= y < board_dim for x, y in cell_list):
+            return False
+        if len(set(cell_list)) != len(cell_list):
+            return False
+        x_list = sorted(x for x, _ in cell_list)
+        y_list = sorted(y for _, y in cell_list)
+        if len(set(x_list)) == 1:
+            if y_list != list(range(y_list[0], y_list[0] + len(cell_list))):
+                return False
+        elif len(set(y_list)) == 1:
+            if x_list != list(range(x_list[0], x_list[0] + len(cell_list))):
+                return False
+        else:
+            return False
+        if not occupied_set.isdisjoint(cell_list):
+            return False
+        occupied_set.update(cell_list)
+    return sorted(len(cell_list) for cell_list in ship_list) == sorted(ship_size_list)
+
+
+def return_ship_list(board) -> List[List[Tuple[int, int]]]:
+    """Return x-y coordinates of each ship on given board"""
+    if isinstance(board, SparseBoard):
+        index_list_list = [list(cell_tuple) for cell_tuple in board.ship_cell_list]
+    else:
+        index_list_list = [list(iterate_mask(ship_mask)) for ship_mask in board.ship_mask_list]
+    return [[divmod(index, board.BOARD_DIM) for index in index_list] for index_list in index_list_list]
+
+
+def mutate(ship_list: List[List[Tuple[int, int]]], board_dim: int, rng: Random) -> List[List[Tuple[int, int]]]:
+    """Return shuffled copy of given fleet with a random, possibly harmless, change"""
+    ship_list = [list(cell_list) for cell_list in ship_list]
+    rng.shuffle(ship_list)
+    for cell_list in ship_list:
+        rng.shuffle(cell_list)
+    ship = rng.choice(ship_list)
+    cell_index = rng.randrange(len(ship))
+    x, y = ship[cell_index]
+    mutation = rng.randrange(8)
+    if mutation == 1:
+        # Move one cell
+        ship[cell_index] = rng.choice([(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)])
+    elif mutation == 2 and len(ship) > 1:
+        # Drop one cell
+        ship.pop(cell_index)
+    elif mutation == 3 and len(ship) > 1:
+        # Repeat one cell
+        ship[cell_index] = ship[cell_index - 1]
+    elif mutation == 4:
+        # Shift whole ship, may overlap other ships or leave the board
+        offset_x, offset_y = rng.randint(-3, 3), rng.randint(-3, 3)
+        ship[:] = [(cell_x + offset_x, cell_y + offset_y) for cell_x, cell_y in ship]
+    elif mutation == 5:
+        # Remove one ship
+        ship_list.remove(ship)
+    elif mutation == 6:
+        # Add one more ship
+        ship_list.append(list(ship))
+    elif mutation == 7:
+        # Replace one cell with any coordinates
+        ship[cell_index] = (rng.randint(-1, board_dim), rng.randint(-1, board_dim))
+    return ship_list
+
+
+class TestFleetValidation:
+
+    @pytest.mark.parametrize("board_type", [Board, SparseBoard.with_rules(10, Board.SHIP_SIZE_LIST), SparseBoard.with_rules(1000, Board.SHIP_SIZE_LIST * 4)])
+    def test_fuzz(self, board_type) -> None:
+        """
+        Validator accepts exactly the fleets accepted by the reference check
+        Accepted fleets are placed with the same cells
+        """
+        rng = Random(17)
+        accepted_count = 0
+        for _ in range(2000):
+            ship_list = mutate(return_ship_list(board_type(rng)), board_type.BOARD_DIM, rng)
+            expected = is_valid_fleet(ship_list, board_type.BOARD_DIM, board_type.SHIP_SIZE_LIST)
+            try:
+                validated_list = board_type.validate_fleet(ship_list)
+            except ValueError:
+                assert expected is False
+                continue
+            assert expected is True
+            accepted_count += 1
+            board = board_type(rng)
+            board.place(validated_list)
+            placed_list = return_ship_list(board)
+            assert sorted(sorted(cell_list) for cell_list in placed_list) == sorted(sorted(cell_list) for cell_list in ship_list)
+            # Ship ids follow SHIP_SIZE_LIST
+            assert [len(cell_list) for cell_list in placed_list] == board_type.SHIP_SIZE_LIST
+            assert board.remaining_part_count == board_type.SHIP_PART_COUNT
+        # Both outcomes must be covered
+        assert 0 < accepted_count < 2000
+
+    def test_wrapped_ship(self) -> None:
+        """
+        Cells running over the end of a row are not a straight ship
+        """
+        ship_list = [[(0, 8), (0, 9), (1, 0)], [(2, 0), (2, 1)], [(3, 0), (3, 1), (3, 2)], [(4, 0), (4, 1), (4, 2), (4, 3)], [(5, 0), (5, 1), (5, 2), (5, 3), (5, 4)]]
+        for board_type in (Board, SparseBoard.with_rules(10, Board.SHIP_SIZE_LIST)):
+            with pytest.raises(ValueError):
+                board_type.validate_fleet(ship_list)
+            ship_list[0] = [(0, 7), (0, 8), (0, 9)]
+            assert len(board_type.validate_fleet(ship_list)) == len(Board.SHIP_SIZE_LIST)
+            ship_list[0] = [(0, 8), (0, 9), (1, 0)]
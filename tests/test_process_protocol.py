@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+orjson = pytest.importorskip("orjson")
+msgpack = pytest.importorskip("msgpack")
+pytest.importorskip("pydantic")
+
+from process.protocol import MsgpackCodec, WebsocketCodec  # noqa: E402
+from schemas.game import FLEET_CELL_LIMIT, FLEET_SHIP_LIMIT  # noqa: E402
+from schemas.websocket import (WebsocketPlace,  # noqa: E402
+                               WebsocketResponseEnum, WebsocketSalvoResponse,
+                               WebsocketTurn, WebsocketTurnResponse)
+
+
+class TestWebsocketCodec:
+
+    def test_decode(self) -> None:
+        """
+        Messages are decoded by their type with the same fields as the pydantic schemas
+        """
+        request_type, turn = WebsocketCodec.decode('{"type": "TURN", "x": 3, "y": 4}')
+        assert request_type == WebsocketResponseEnum.TURN and turn.return_coordinate_list() == [(3, 4)]
+        _, salvo = WebsocketCodec.decode('{"type": "TURN", "shots": [{"x": 1, "y": 2}, {"x": 5, "y": 6}]}')
+        assert salvo.return_coordinate_list() == WebsocketTurn(type="TURN", shots=[{"x": 1, "y": 2}, {"x": 5, "y": 6}]).return_coordinate_list()
+        _, viewport = WebsocketCodec.decode('{"type": "VIEWPORT", "x": 0, "y": 32}')
+        assert (viewport.x, viewport.y, viewport.height, viewport.width) == (0, 32, 32, 32)
+        _, token = WebsocketCodec.decode('{"type": "TOKEN", "token": "abc"}')
+        assert token.token == "abc"
+        assert WebsocketCodec.decode('{"type": "READY"}')[0] == WebsocketResponseEnum.READY
+        # Server-only types are accepted and answered with the default response
+        assert WebsocketCodec.decode('{"type": "BOARD"}') == (WebsocketResponseEnum.BOARD, None)
+
+    def test_decode_invalid(self) -> None:
+        """
+        Malformed frames and fields raise ValueError, which the endpoint answers with INVALID
+        """
+        for raw in (
+            "{", "[]", '{"type": "SHOOT"}', '{"x": 1}',
+            '{"type": "TURN", "x": "1", "y": 2}', '{"type": "TURN", "x": true, "y": 2}', '{"type": "TURN", "x": 1}',
+            '{"type": "TURN", "shots": [{"x": 1}]}', '{"type": "TURN", "shots": {"x": 1, "y": 1}}',
+            '{"type": "VIEWPORT", "x": -1, "y": 0}', '{"type": "VIEWPORT", "x": 0, "y": 0, "width": 65}',
+            '{"type": "RESUME", "last_seq": -1}', '{"type": "TOKEN"}', '{"type": "PLACE", "ships": 1}',
+        ):
+            with pytest.raises(ValueError):
+                WebsocketCodec.decode(raw)
+
+    def test_decode_place(self) -> None:
+        """
+        PLACE gives the same ships as the schema, fleets beyond the limits are rejected before their cells are decoded
+        """
+        ship_list = [[{"x": 0, "y": y} for y in range(5)], [{"x": 2, "y": 3}, {"x": 3, "y": 3}]]
+        _, place = WebsocketCodec.decode(orjson.dumps({"type": "PLACE", "ships": ship_list}))
+        assert place.return_ship_list() == WebsocketPlace(type="PLACE", ships=ship_list).return_ship_list() == [[(0, y) for y in range(5)], [(2, 3), (3, 3)]]
+        for ship_list in (
+            [], [[]], [[{"x": 0}]], [[{"x": 0, "y": "1"}]], [[[0, 1]]],
+            [[{"x": 0, "y": 0}]] * (FLEET_SHIP_LIMIT + 1),
+            # Cells after the limit are never looked at
+            [[{"x": 0, "y": 0}] * 1000] * (FLEET_CELL_LIMIT // 1000) + [[None]],
+        ):
+            with pytest.raises(ValueError):
+                WebsocketCodec.decode(orjson.dumps({"type": "PLACE", "ships": ship_list}))
+        with pytest.raises(ValueError):
+            WebsocketPlace(type="PLACE", ships=[[{"x": 0, "y": 0}] * 1000] * (FLEET_CELL_LIMIT // 1000 + 1))
+
+    def test_encode(self) -> None:
+        """
+        Encoded frames match the pydantic responses, game frames carry their sequence number
+        """
+        turn_frame = WebsocketCodec.return_turn_frame(True, False, 1, 2)
+        assert dict(turn_frame, next_turn=True, finished=False, win=None) == WebsocketTurnResponse(type="TURN", status=200, hit=True, sunk=False, x=1, y=2, next_turn=True).dict()
+        salvo_frame = WebsocketCodec.return_salvo_frame([{"x": 1, "y": 2, "hit": False, "sunk": False}])
+        assert dict(salvo_frame, next_turn=False, finished=True, win=True) == WebsocketSalvoResponse(
+            type="TURN", status=200, shots=[{"x": 1, "y": 2, "hit": False}], next_turn=False, finished=True, win=True
+        ).dict()
+        assert json.loads(WebsocketCodec.encode_game(turn_frame, 7)) == dict(turn_frame, seq=7)
+        assert "seq" not in turn_frame
+        assert json.loads(WebsocketCodec.INVALID) == {"type": "INVALID", "status": 400}
+        assert json.loads(WebsocketCodec.PLACE_BAD) == {"type": "PLACE", "status": 400}
+
+    def test_msgpack(self) -> None:
+        """
+        MessagePack subprotocol is negotiated on request and carries the same messages as JSON
+        """
+        assert WebsocketCodec.negotiate([]) is WebsocketCodec
+        assert WebsocketCodec.negotiate(["chat", MsgpackCodec.SUBPROTOCOL]) is MsgpackCodec
+        request_type, turn = MsgpackCodec.decode(msgpack.packb({"type": "TURN", "x": 3, "y": 4}))
+        assert request_type == WebsocketResponseEnum.TURN and turn.return_coordinate_list() == [(3, 4)]
+        with pytest.raises(ValueError):
+            MsgpackCodec.decode('{"type": "READY"}')
+        with pytest.raises(ValueError):
+            MsgpackCodec.decode(msgpack.packb({"type": "TURN", "x": 3})[:-1])
+        turn_frame = WebsocketCodec.return_turn_frame(False, False, 1, 2)
+        assert msgpack.unpackb(MsgpackCodec.encode_game(turn_frame, 7)) == json.loads(WebsocketCodec.encode_game(turn_frame, 7))
+        assert msgpack.unpackb(MsgpackCodec.INVALID) == json.loads(WebsocketCodec.INVALID)
+
+    def test_move_frames(self) -> None:
+        """
+        Each user gets one result frame telling whether they move next, the bot gets none
+        """
+        pytest.importorskip("sqlalchemy")
+        from process.board import Board
+        from process.game import GameManager, GameSession
+        from process.websocket import WebsocketProcessor
+        response = WebsocketCodec.return_turn_frame(True, True, 1, 2)
+        session = GameSession(1, 11, 21, Board(), Board())
+        frame_dict = WebsocketProcessor.return_move_frames(session, response, 21)
+        assert [(frame["next_turn"], frame["finished"]) for frame in frame_dict.values()] == [(False, False), (True, False)]
+        assert "win" not in frame_dict[11] and "next_turn" not in response
+        frame_dict = WebsocketProcessor.return_move_frames(session, response, None, 11)
+        assert [(frame["next_turn"], frame["finished"], frame["win"]) for frame in frame_dict.values()] == [(False, True, True), (False, True, False)]
+        bot_session = GameSession(2, 12, -2, Board(), Board(), GameManager.new_bot(None))
+        assert list(WebsocketProcessor.return_move_frames(bot_session, response, -2)) == [12]
@@ -0,0 +1,91 @@
+from random import Random
+
+from process.board import Board, HitResult, return_blocked_ratio
+from process.sparse import SparseBoard
+import pytest
+
+
+class TestSparseBoard:
+
+    def test_populate(self) -> None:
+        """
+        Every ship lies inside the board in a straight line and ships do not overlap
+        """
+        board_type = SparseBoard.with_rules(1000, Board.SHIP_SIZE_LIST * 40)
+        board = board_type(Random(3))
+        assert len(board.ship_id_dict) == board.remaining_part_count == sum(board_type.SHIP_SIZE_LIST)
+        for ship_id, cell_tuple in enumerate(board.ship_cell_list):
+            assert len(cell_tuple) == board_type.SHIP_SIZE_LIST[ship_id]
+            row_set = {index // board_type.BOARD_DIM for index in cell_tuple}
+            column_set = {index % board_type.BOARD_DIM for index in cell_tuple}
+            assert len(row_set) == 1 or len(column_set) == 1
+            assert all(board.ship_id_dict[index] == ship_id for index in cell_tuple)
+
+    def test_hit(self) -> None:
+        """
+        Results match the bitboard engine on the same ships
+        """
+        board = SparseBoard.with_rules(10, Board.SHIP_SIZE_LIST)(Random(5))
+        dense_board = Board()
+        ship_mask_list = [sum(1 << index for index in cell_tuple) for cell_tuple in board.ship_cell_list]
+        dense_board.load_ships(ship_mask_list, 0, 0)
+        assert board.serialize_viewport(0, 0, 10, 10) == dense_board.serialize()
+        for x in range(Board.BOARD_DIM):
+            for y in range(Board.BOARD_DIM):
+                assert board.hit(x, y) == dense_board.hit(x, y)
+                assert board.get_surviving_ship_count() == dense_board.get_surviving_ship_count()
+        assert board.finished is True
+        assert board.serialize_viewport(2, 3, 4, 5, hide_ships=True) == dense_board.serialize_viewport(2, 3, 4, 5, hide_ships=True)
+        with pytest.raises(ValueError):
+            board.hit(0, 0)
+        with pytest.raises(ValueError):
+            board.hit_many([(0, 10)])
+
+    def test_with_rules(self) -> None:
+        """
+        Rule classes are cached and fleets that cannot fit are rejected
+        """
+        board_type = SparseBoard.with_rules(500, [4, 4, 2])
+        assert board_type is SparseBoard.with_rules(500, [4, 4, 2])
+        assert board_type.BOARD_SIZE == 250000 and board_type.SHIP_PART_COUNT == 10
+        with pytest.raises(ValueError):
+            SparseBoard.with_rules(5, [6])
+        with pytest.raises(ValueError):
+            SparseBoard.with_rules(10, [5] * 6)
+        board = board_type()
+        x, y = divmod(board.ship_cell_list[2][0], board_type.BOARD_DIM)
+        assert board.get_ship_size(x, y) == 2
+        assert board.hit(x, y) == HitResult.HIT
+
+    def test_blocked_ratio(self, monkeypatch) -> None:
+        """
+        Large fleets are accepted or rejected by the blocked ratio without populating a board
+        """
+        assert return_blocked_ratio(10, [5]) == 0
+        # Other ship of 2 cells blocks 2 + 3 - 1 placements along it and 2 * 3 across it
+        assert return_blocked_ratio(10, [3, 2]) == max(10 / (2 * 10 * 8), 10 / (2 * 10 * 9))
+        assert return_blocked_ratio(10, Board.SHIP_SIZE_LIST) < Board.MAX_BLOCKED_RATIO
+
+        def populate(self) -> None:
+            raise AssertionError("Rules must not populate large boards!")
+
+        monkeypatch.setattr(SparseBoard, "RULES_CACHE", {})
+        monkeypatch.setattr(SparseBoard, "populate", populate)
+        assert SparseBoard.with_rules(1000, [20] * 500).SHIP_PART_COUNT == 10000
+        with pytest.raises(ValueError):
+            SparseBoard.with_rules(1000, [25] * 10000)
+        with pytest.raises(ValueError):
+            SparseBoard.with_rules(1000, [1000] * 10)
+
+    def test_fleet_limit(self) -> None:
+        """
+        Game API accepts fleets of up to FLEET_SHIP_LIMIT ships and FLEET_CELL_LIMIT cells
+        """
+        pytest.importorskip("pydantic")
+        from pydantic import ValidationError
+        from schemas.game import FLEET_CELL_LIMIT, FLEET_SHIP_LIMIT, GameBaseCreate
+
+        assert len(GameBaseCreate(board_dim=1000, fleet=[20] * FLEET_SHIP_LIMIT).fleet) == FLEET_SHIP_LIMIT
+        for fleet in ([1] * (FLEET_SHIP_LIMIT + 1), [FLEET_CELL_LIMIT // 100 + 1] * 100):
+            with pytest.raises(ValidationError):
+                GameBaseCreate(board_dim=1000, fleet=fleet)
@@ -0,0 +1,198 @@
+import asyncio
+from collections import OrderedDict
+from typing import List
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+
+from core.db import Base  # noqa: E402
+from core.security import Security  # noqa: E402
+from models.games import Games  # noqa: E402
+from models.tokens import Tokens  # noqa: E402
+from models.users import Users  # noqa: E402
+from process.actor import GameActorManager  # noqa: E402
+from process.board import Board  # noqa: E402
+from process.game import GameManager, GameSession, GameStateWriter  # noqa: E402
+from process.websocket import WebsocketManager, WebsocketProcessor  # noqa: E402
+from pydantic import ValidationError  # noqa: E402
+from schemas.game import GameBaseCreate  # noqa: E402
+from schemas.user import UserBaseSession  # noqa: E402
+from schemas.websocket import WebsocketResponseEnum, WebsocketToken  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # noqa: E402
+
+# Idle websockets held open against the pool
+SOCKET_COUNT = 10000
+POOL_SIZE = 10
+
+
+class FakeWebsocket:
+    """Websocket that records the frames sent to it"""
+
+    def __init__(self) -> None:
+        self.frame_list: List[str] = []
+
+    async def send_text(self, frame: str) -> None:
+        self.frame_list.append(frame)
+
+    async def send_bytes(self, frame: bytes) -> None:
+        self.frame_list.append(frame)
+
+    async def close(self, code: int) -> None:
+        pass
+
+
+class TestWebsocketProcessor:
+
+    def test_idle_sockets(self, monkeypatch, tmp_path) -> None:
+        """
+        Ten thousand authorized websockets stay open on a pool of ten connections, none of which is checked out between frames
+        """
+        monkeypatch.setattr(GameActorManager, "ACTORS", {})
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "SESSION_COUNTER", {"created": 0, "finished": 0, "expired": 0, "peak": 0})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(WebsocketManager, "ACTIVE_CONNECTIONS", {})
+        path = tmp_path / "pool.db"
+        engine = create_engine("sqlite:///{}".format(path))
+        Base.metadata.create_all(bind=engine)
+        user_list = [Users(id=user_id, username="user{}".format(user_id)) for user_id in range(1, SOCKET_COUNT + 1)]
+        with sessionmaker(bind=engine)() as session:
+            session.bulk_insert_mappings(Users, [
+                {"id": user.id, "username": user.username, "password": "", "email": "{}@x.com".format(user.username)} for user in user_list
+            ])
+            session.bulk_insert_mappings(Tokens, [{"user_id": user.id, "token": "", "valid": True} for user in user_list])
+            session.bulk_insert_mappings(Games, [
+                {"id": game_id, "name": "game{}".format(game_id), "creator_user_id": 2 * game_id - 1, "second_user_id": 2 * game_id}
+                for game_id in range(1, SOCKET_COUNT // 2 + 1)
+            ])
+            session.commit()
+        engine.dispose()
+
+        async def run() -> List[WebsocketProcessor]:
+            # Pool cannot grow and waits at most 1 second -> A socket holding its session would fail the 11th login
+            async_engine = create_async_engine(
+                "sqlite+aiosqlite:///{}".format(path), poolclass=AsyncAdaptedQueuePool, pool_size=POOL_SIZE, max_overflow=0, pool_timeout=1
+            )
+            session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine, class_=AsyncSession)
+            processor_list = [WebsocketProcessor(FakeWebsocket(), session_factory=session_factory) for _ in user_list]
+            for processor, user in zip(processor_list, user_list):
+                await processor.authorize_user(WebsocketToken(type=WebsocketResponseEnum.TOKEN, token=Security.create_token(user)))
+                assert async_engine.pool.checkedout() == 0
+            # Every socket is open and authorized -> Game events still need no connection
+            await asyncio.gather(*(processor.dispatch(processor.ready) for processor in processor_list))
+            assert len(WebsocketManager.ACTIVE_CONNECTIONS) == SOCKET_COUNT and async_engine.pool.checkedout() == 0
+            for processor in processor_list:
+                await processor.disconnect()
+            await async_engine.dispose()
+            return processor_list
+
+        processor_list = asyncio.run(run())
+        assert all(processor.state.is_started() for processor in processor_list)
+        assert GameManager.stats()["created"] == SOCKET_COUNT // 2
+        # Creator is told about the second user after that user logged in
+        assert '"USER_IN"' in processor_list[0].websocket.frame_list[1]
+
+    def test_salvo_shot_count(self, monkeypatch) -> None:
+        """
+        Fixed salvo never has more shots than unshot cells, bot volleys stop there too and the bot finishes the game
+        """
+        with pytest.raises(ValidationError):
+            GameBaseCreate(salvo=True, salvo_shots=26, board_dim=5)
+        assert GameBaseCreate(salvo=True, salvo_shots=25, board_dim=5).salvo_shots == 25
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "FINISHED_SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "FINISHED_USER_SESSIONS", {})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        processor = WebsocketProcessor(FakeWebsocket())
+        processor.user = UserBaseSession(id=1, username="user1")
+        processor.game = Games(id=1, creator_user_id=1, second_user_id=None, bot=True, salvo=True, salvo_shots=70)
+        board, bot_board = Board(), Board()
+        assert processor.return_shot_count(bot_board, board) == 70
+        empty_board = Board()
+        empty_board.hit_many([divmod(index, Board.BOARD_DIM) for index in range(Board.BOARD_SIZE) if empty_board.get_cell(*divmod(index, Board.BOARD_DIM)) != Board.SHIP])
+        assert processor.return_shot_count(bot_board, empty_board) == Board.SHIP_PART_COUNT
+        game_session = GameSession(1, 1, 2, board, bot_board, GameManager.new_bot(None))
+        GameManager.add_session(game_session)
+        while board.finished is False:
+            unshot_cell_count = board.get_unshot_cell_count()
+            asyncio.run(processor.bot_turn(game_session))
+            assert unshot_cell_count - board.get_unshot_cell_count() <= min(70, unshot_cell_count)
+        assert game_session.state.finished is True
+
+    def test_release_state(self, monkeypatch, tmp_path) -> None:
+        """
+        State and placed fleets of a game that did not start are dropped when its last websocket closes
+        """
+        monkeypatch.setattr(GameActorManager, "ACTORS", {})
+        monkeypatch.setattr(GameManager, "SESSIONS", OrderedDict())
+        monkeypatch.setattr(GameManager, "GAME_STATES", {})
+        monkeypatch.setattr(GameManager, "PLACED_FLEETS", {})
+        monkeypatch.setattr(GameManager, "STATE_WRITER", GameStateWriter(interval=60))
+        monkeypatch.setattr(WebsocketManager, "ACTIVE_CONNECTIONS", {})
+        path = tmp_path / "release.db"
+        engine = create_engine("sqlite:///{}".format(path))
+        Base.metadata.create_all(bind=engine)
+        user_list = [Users(id=user_id, username="user{}".format(user_id)) for user_id in (1, 2)]
+        with sessionmaker(bind=engine)() as session:
+            for user in user_list:
+                session.add(Users(id=user.id, username=user.username, password="", email="{}@x.com".format(user.username)))
+                session.add(Tokens(user_id=user.id, token="", valid=True))
+            session.add(Games(id=1, name="game1", creator_user_id=1, second_user_id=2))
+            session.commit()
+        engine.dispose()
+
+        async def run() -> None:
+            async_engine = create_async_engine("sqlite+aiosqlite:///{}".format(path))
+            session_factory = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine, class_=AsyncSession)
+            processor_list = [WebsocketProcessor(FakeWebsocket(), session_factory=session_factory) for _ in user_list]
+            for processor, user in zip(processor_list, user_list):
+                await processor.authorize_user(WebsocketToken(type=WebsocketResponseEnum.TOKEN, token=Security.create_token(user)))
+            GameManager.add_fleet(1, [])
+            GameManager.add_fleet(2, [])
+            # Creator is still connected -> Game stays in memory
+            await processor_list[1].disconnect()
+            assert 1 in GameManager.GAME_STATES and len(GameManager.PLACED_FLEETS) == 2
+            await processor_list[0].disconnect()
+            assert GameManager.GAME_STATES == {} and GameManager.PLACED_FLEETS == {}
+            # Next login reads the game again
+            processor = WebsocketProcessor(FakeWebsocket(), session_factory=session_factory)
+            await processor.authorize_user(WebsocketToken(type=WebsocketResponseEnum.TOKEN, token=Security.create_token(user_list[0])))
+            assert GameManager.GAME_STATES[1] is processor.state
+            await processor.disconnect()
+            await async_engine.dispose()
+
+        asyncio.run(run())
+
+
+class TestWebsocketManager:
+
+    def test_evicted_count(self, monkeypatch) -> None:
+        """
+        Only consumers evicted at the queue limit are counted, frames for a closed connection just drop it
+        """
+        monkeypatch.setattr(WebsocketManager, "ACTIVE_CONNECTIONS", {})
+        monkeypatch.setattr(WebsocketManager, "QUEUE_LIMIT", 2)
+        monkeypatch.setattr(WebsocketManager, "HIGH_WATER", 1)
+        monkeypatch.setattr(WebsocketManager, "EVICTED_COUNT", 0)
+
+        async def run() -> None:
+            closed_connection = WebsocketManager.add_connection(1, FakeWebsocket())
+            await closed_connection.close()
+            WebsocketManager.queue(1, "frame")
+            assert WebsocketManager.is_connected(1) is False
+            WebsocketManager.add_connection(2, FakeWebsocket())
+            for _ in range(3):
+                WebsocketManager.queue(2, "frame")
+            assert WebsocketManager.is_connected(2) is False
+            await asyncio.sleep(0)
+
+        asyncio.run(run())
+        assert WebsocketManager.stats()["evicted"] == 1